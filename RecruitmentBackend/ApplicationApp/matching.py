@@ -0,0 +1,126 @@
+"""
+Điểm phù hợp (0-100) của hồ sơ ứng tuyển với tin tuyển dụng, dùng để xếp hạng ứng viên.
+
+So vector kỹ năng của tin (JobSkill, JobApp/recommendations.py) với:
+- kỹ năng khai báo trong JobSeekerProfile.skills,
+- kỹ năng nhắc tới trong giới thiệu/kinh nghiệm của hồ sơ và tiêu đề CV đang kích hoạt
+  (nội dung file CV nằm trên Cloudinary, không được đọc),
+- việc ứng viên có CV đang kích hoạt.
+Hai phần kỹ năng là tỉ lệ trọng số kỹ năng của tin mà ứng viên đáp ứng.
+
+Mọi ứng viên của một tin được tính trong một lượt (ma trận ứng viên × kỹ năng của tin, NumPy)
+và lưu vào Application.match_score. Điểm bị xóa (NULL) khi hồ sơ, CV hoặc vector kỹ năng của tin
+thay đổi, rồi được tính lại khi cần sắp xếp theo điểm: ngay trong request nếu chỉ một tin
+thiếu điểm, không thì trong worker nền (RecruitmentBackend/background.py).
+"""
+import threading
+
+import numpy as np
+
+from JobApp.models import JobSkill
+from RecruitmentBackend.background import submit
+from ResumeApp.models import JobSeekerProfile, Resume
+from ResumeApp.skills import count_skills
+
+from .models import Application
+
+# Tỉ trọng các phần của điểm (tổng = 1)
+WEIGHTS = {'skills': 0.6, 'mentioned': 0.3, 'resume': 0.1}
+UPDATE_BATCH_SIZE = 500
+
+
+def _applicant_ids(job_id):
+    return Application.objects.filter(job_posting_id=job_id).values('job_seeker_id')
+
+
+def _coverage(matches, weights):
+    """Tỉ lệ trọng số kỹ năng của tin mà mỗi ứng viên (mỗi dòng) đáp ứng."""
+    total = weights.sum()
+    return matches @ weights / total if total else np.zeros(len(matches))
+
+
+def score_job(job_id):
+    """Tính và lưu điểm cho mọi hồ sơ của tin. Trả về số hồ sơ đã tính."""
+    applications = list(Application.objects.filter(job_posting_id=job_id).values_list('pk', 'job_seeker_id'))
+    if not applications:
+        return 0
+    seekers = {seeker_id: row for row, seeker_id in enumerate(dict.fromkeys(
+        seeker_id for _, seeker_id in applications))}
+    vector = dict(JobSkill.objects.filter(job_id=job_id).values_list('skill_id', 'weight'))
+    columns = {skill_id: column for column, skill_id in enumerate(vector)}
+    weights = np.fromiter(vector.values(), dtype=float, count=len(vector))
+
+    declared = np.zeros((len(seekers), len(columns)))
+    mentioned = np.zeros((len(seekers), len(columns)))
+    has_resume = np.zeros(len(seekers))
+
+    for seeker_id, skill_id in JobSeekerProfile.skills.through.objects.filter(
+            jobseekerprofile__user_id__in=_applicant_ids(job_id), skill_id__in=list(columns)).values_list(
+            'jobseekerprofile__user_id', 'skill_id'):
+        declared[seekers[seeker_id], columns[skill_id]] = 1
+
+    texts = list(JobSeekerProfile.objects.filter(user_id__in=_applicant_ids(job_id)).values_list(
+        'user_id', 'summary', 'experience'))
+    for seeker_id, title in Resume.objects.filter(
+            is_active=True, job_seeker__user_id__in=_applicant_ids(job_id)).values_list(
+            'job_seeker__user_id', 'title'):
+        has_resume[seekers[seeker_id]] = 1
+        texts.append((seeker_id, title))
+    if columns:
+        for seeker_id, *parts in texts:
+            for skill_id in count_skills(' '.join(filter(None, parts))):
+                if skill_id in columns:
+                    mentioned[seekers[seeker_id], columns[skill_id]] = 1
+
+    scores = 100 * (
+        WEIGHTS['skills'] * _coverage(declared, weights)
+        + WEIGHTS['mentioned'] * _coverage(mentioned, weights)
+        + WEIGHTS['resume'] * has_resume
+    )
+
+    Application.objects.bulk_update([
+        Application(pk=pk, match_score=round(float(scores[seekers[seeker_id]]), 2))
+        for pk, seeker_id in applications
+    ], ['match_score'], batch_size=UPDATE_BATCH_SIZE)
+    return len(applications)
+
+
+def ensure_match_scores(queryset, sync_limit=1):
+    """
+    Tính điểm cho các tin có hồ sơ trong queryset chưa có điểm.
+    Tối đa sync_limit tin được tính ngay trong request (hộp thư của một tin); nhiều hơn thì
+    tính nền, trong lúc chờ các hồ sơ chưa có điểm được xếp cuối.
+    """
+    job_ids = queryset.filter(match_score__isnull=True).values_list('job_posting_id', flat=True).distinct()
+    job_ids = list(job_ids.order_by())
+    if len(job_ids) <= sync_limit:
+        for job_id in job_ids:
+            score_job(job_id)
+        return
+    for job_id in job_ids:
+        with _scoring_lock:
+            if job_id in _scoring:
+                continue
+            _scoring.add(job_id)
+        submit(_score_in_background, job_id)
+
+
+# Các tin đang được tính nền, để các request sắp xếp liên tiếp không gửi trùng
+_scoring = set()
+_scoring_lock = threading.Lock()
+
+
+def _score_in_background(job_id):
+    try:
+        score_job(job_id)
+    finally:
+        with _scoring_lock:
+            _scoring.discard(job_id)
+
+
+def invalidate_job_scores(job_id):
+    Application.objects.filter(job_posting_id=job_id, match_score__isnull=False).update(match_score=None)
+
+
+def invalidate_seeker_scores(user_id):
+    Application.objects.filter(job_seeker_id=user_id, match_score__isnull=False).update(match_score=None)
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ApplicationApp', '0002_initial'),
+        ('JobApp', '0005_jobposting_jobposting_status_created_idx'),
+        ('ResumeApp', '0003_jobseekerprofile_preferred_locations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job_seeker', 'created_at', 'id'], name='application_seeker_created_idx'),
+        ),
+    ]
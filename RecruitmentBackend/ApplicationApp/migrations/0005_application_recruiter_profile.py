@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def backfill_recruiter_profile(apps, schema_editor):
+    Application = apps.get_model('ApplicationApp', 'Application')
+    JobPosting = apps.get_model('JobApp', 'JobPosting')
+    recruiter = JobPosting.objects.filter(pk=OuterRef('job_posting_id')).values('recruiter_profile_id')[:1]
+    pending = Application.objects.filter(recruiter_profile__isnull=True,
+                                         job_posting__recruiter_profile__isnull=False)
+    # Cập nhật theo từng lô để không khóa cả bảng trong một câu UPDATE dài
+    while True:
+        ids = list(pending.values_list('pk', flat=True)[:BACKFILL_BATCH_SIZE])
+        if not ids:
+            break
+        Application.objects.filter(pk__in=ids).update(recruiter_profile_id=Subquery(recruiter))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ApplicationApp', '0004_application_application_applied_idx'),
+        ('JobApp', '0006_jobposting_jobposting_created_idx'),
+        ('ResumeApp', '0003_jobseekerprofile_preferred_locations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='recruiter_profile',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='received_applications', to='JobApp.recruiterprofile'),
+        ),
+        migrations.RunPython(backfill_recruiter_profile, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['recruiter_profile', 'status', 'applied_at', 'id'], name='application_rec_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['recruiter_profile', 'applied_at', 'id'], name='application_rec_applied_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ApplicationApp', '0005_application_recruiter_profile'),
+        ('JobApp', '0006_jobposting_jobposting_created_idx'),
+        ('ResumeApp', '0003_jobseekerprofile_preferred_locations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='match_score',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job_posting', 'match_score'], name='application_job_score_idx'),
+        ),
+    ]
@@ -3,8 +3,10 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 
+from RecruitmentBackend.tracking import TrackedFieldsMixin
 
-class BaseModel(models.Model):
+
+class BaseModel(TrackedFieldsMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -25,22 +27,47 @@ class ApplicationStatus(models.TextChoices):
 class Application(BaseModel):
     job_seeker = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='applications')
     job_posting = models.ForeignKey('JobApp.JobPosting', on_delete=models.CASCADE, related_name='applications')
+    # Sao từ job_posting khi tạo để lọc hồ sơ theo nhà tuyển dụng không phải JOIN qua JobPosting
+    # (index riêng không cần: các index ghép bên dưới bắt đầu bằng cột này)
+    recruiter_profile = models.ForeignKey('JobApp.RecruiterProfile', on_delete=models.SET_NULL, null=True,
+                                          blank=True, editable=False, db_index=False,
+                                          related_name='received_applications')
     resume = models.ForeignKey('ResumeApp.Resume', on_delete=models.SET_NULL, null=True, blank=True,
                                related_name='applications')
     status = models.CharField(max_length=30, choices=ApplicationStatus.choices, default=ApplicationStatus.APPLIED)
     applied_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     cover_letter = models.TextField(blank=True, null=True)
+    # Điểm phù hợp với tin (ApplicationApp/matching.py); NULL = chưa tính hoặc đã hết hiệu lực
+    match_score = models.FloatField(null=True, blank=True, editable=False)
+
+    tracked_fields = ('status',)
 
     class Meta:
         unique_together = ('job_seeker', 'job_posting')
         ordering = ['-applied_at']
+        indexes = [
+            # Danh sách hồ sơ của người tìm việc, phân trang keyset theo (created_at, id)
+            models.Index(fields=['job_seeker', 'created_at', 'id'], name='application_seeker_created_idx'),
+            # Báo cáo theo khoảng ngày nộp (ReportApp/timeseries.py, xuất file)
+            models.Index(fields=['applied_at'], name='application_applied_idx'),
+            # Hộp thư hồ sơ của nhà tuyển dụng: lọc theo trạng thái, phân trang keyset theo (applied_at, id)
+            models.Index(fields=['recruiter_profile', 'status', 'applied_at', 'id'], name='application_rec_status_idx'),
+            models.Index(fields=['recruiter_profile', 'applied_at', 'id'], name='application_rec_applied_idx'),
+            # Xếp hạng ứng viên của một tin theo điểm phù hợp
+            models.Index(fields=['job_posting', 'match_score'], name='application_job_score_idx'),
+        ]
         verbose_name = "Ứng tuyển"
         verbose_name_plural = "Các đơn ứng tuyển"
 
     def __str__(self):
         return f"{self.job_seeker.username} ứng tuyển {self.job_posting.title}"
 
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.recruiter_profile_id is None and self.job_posting_id:
+            self.recruiter_profile_id = self.job_posting.recruiter_profile_id
+        super().save(*args, **kwargs)
+
 
 class InterviewStatus(models.TextChoices):
     SCHEDULED = 'Scheduled', 'Đã lên lịch'
@@ -55,6 +82,8 @@ class Interview(BaseModel):
     status = models.CharField(max_length=20, choices=InterviewStatus.choices, default=InterviewStatus.SCHEDULED)
     notes = models.TextField(blank=True, null=True)
 
+    tracked_fields = ('status',)
+
     class Meta:
         ordering = ['scheduled_at']
         verbose_name = "Phỏng vấn"
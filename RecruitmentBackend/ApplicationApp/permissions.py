@@ -1,44 +1,26 @@
 from rest_framework.permissions import BasePermission
+from AuthApp.roles import get_role_context
 
 # Yêu cầu người dùng đã đăng nhập và có vai trò đang hoạt động
 class IsAuthenticatedAndApproved(BasePermission):
     def has_permission(self, request, view):
         user = request.user
-        return (
-            user.is_authenticated and
-            user.active_role and
-            user.user_roles.filter(role=user.active_role, is_approved=True).exists()
-        )
+        return user.is_authenticated and get_role_context(user).active_approved
 
 
 class IsJobSeeker(BasePermission):
     def has_permission(self, request, view):
         user = request.user
-        return (
-            user.is_authenticated and
-            user.active_role and
-            user.active_role.name == 'JobSeeker' and
-            user.user_roles.filter(role=user.active_role, is_approved=True).exists()
-        )
+        return user.is_authenticated and get_role_context(user).is_active('JobSeeker')
 
 
 class IsRecruiter(BasePermission):
     def has_permission(self, request, view):
         user = request.user
-        return (
-            user.is_authenticated and
-            user.active_role and
-            user.active_role.name == 'Recruiter' and
-            user.user_roles.filter(role=user.active_role, is_approved=True).exists()
-        )
+        return user.is_authenticated and get_role_context(user).is_active('Recruiter')
 
 
 class IsAdminUser(BasePermission):
     def has_permission(self, request, view):
         user = request.user
-        return (
-            user.is_authenticated and
-            user.active_role and
-            user.active_role.name == 'Admin' and
-            user.user_roles.filter(role=user.active_role, is_approved=True).exists()
-        )
+        return user.is_authenticated and get_role_context(user).is_active('Admin')
@@ -24,9 +24,10 @@ class ApplicationSerializer(serializers.ModelSerializer):
             'status_display',
             'applied_at',
             'updated_at',
-            'cover_letter'
+            'cover_letter',
+            'match_score',
         ]
-        read_only_fields = ['status', 'applied_at', 'updated_at']
+        read_only_fields = ['status', 'applied_at', 'updated_at', 'match_score']
 
 
 class ApplicationStatusUpdateSerializer(serializers.ModelSerializer):
@@ -1,33 +1,97 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.apps import apps
 from NotificationApp.services import (
     create_notification_for_application_status_change,
     create_notification_for_interview_status_change,
 )
+from ReportApp import activity, rollups
+
+from .matching import invalidate_seeker_scores
 
 Application = apps.get_model('ApplicationApp', 'Application')
 Interview = apps.get_model('ApplicationApp', 'Interview')
+JobSeekerProfile = apps.get_model('ResumeApp', 'JobSeekerProfile')
+Resume = apps.get_model('ResumeApp', 'Resume')
 
-@receiver(pre_save, sender=Application)
-def application_status_change(sender, instance, **kwargs):
-    if not instance.pk:
-        # Ứng dụng mới tạo, chưa cần check trạng thái cũ
-        return
-    try:
-        old_instance = Application.objects.get(pk=instance.pk)
-    except Application.DoesNotExist:
-        return
-    if old_instance.status != instance.status:
-        create_notification_for_application_status_change(instance, old_instance.status, instance.status)
+@receiver(post_save, sender=Application)
+def application_saved(sender, instance, created, **kwargs):
+    # Cập nhật bảng tổng hợp báo cáo và lịch sử hoạt động
+    if created:
+        rollups.application_created(instance)
+        activity.record('Nộp hồ sơ ứng tuyển', instance.job_posting.title, owner_id=instance.job_seeker_id)
+    elif instance.has_changed('status'):
+        # Trạng thái cũ lấy từ lúc nạp bản ghi (RecruitmentBackend/tracking.py), không query lại
+        previous = instance.original_value('status')
+        rollups.application_status_changed(instance, previous, instance.status)
+        # Thông báo đi qua outbox, ghi cùng transaction với thay đổi trạng thái
+        create_notification_for_application_status_change(instance, previous, instance.status)
+        activity.record(f'Cập nhật hồ sơ ứng tuyển: {previous} → {instance.status}',
+                        f'{instance.job_seeker.username} - {instance.job_posting.title}',
+                        owner_id=_recruiter_user_id(instance))
 
-@receiver(pre_save, sender=Interview)
-def interview_status_change(sender, instance, **kwargs):
-    if not instance.pk:
-        return
-    try:
-        old_instance = Interview.objects.get(pk=instance.pk)
-    except Interview.DoesNotExist:
+@receiver(post_delete, sender=Application)
+def application_deleted(sender, instance, **kwargs):
+    rollups.application_deleted(instance)
+
+@receiver(post_save, sender=Interview)
+def interview_saved(sender, instance, created, **kwargs):
+    if created:
+        rollups.interview_created(instance)
+        activity.record('Lên lịch phỏng vấn', _interview_target(instance),
+                        owner_id=_recruiter_user_id(instance.application))
+    elif instance.has_changed('status'):
+        previous = instance.original_value('status')
+        rollups.interview_status_changed(instance, previous, instance.status)
+        create_notification_for_interview_status_change(instance, previous, instance.status)
+        activity.record(f'Cập nhật phỏng vấn: {previous} → {instance.status}', _interview_target(instance),
+                        owner_id=_recruiter_user_id(instance.application))
+
+def _recruiter_user_id(application):
+    recruiter_profile = application.job_posting.recruiter_profile
+    return recruiter_profile.user_id if recruiter_profile else None
+
+def _interview_target(interview):
+    application = interview.application
+    return f'{application.job_seeker.username} - {application.job_posting.title}'
+
+@receiver(post_delete, sender=Interview)
+def interview_deleted(sender, instance, **kwargs):
+    rollups.interview_deleted(instance)
+
+# --- Điểm phù hợp: xóa điểm đã lưu khi dữ liệu của ứng viên thay đổi ---
+
+@receiver(post_save, sender=JobSeekerProfile)
+def job_seeker_profile_saved(sender, instance, created, **kwargs):
+    if not created and (instance.has_changed('summary') or instance.has_changed('experience')):
+        invalidate_seeker_scores(instance.user_id)
+
+@receiver(m2m_changed, sender=JobSeekerProfile.skills.through)
+def job_seeker_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
         return
-    if old_instance.status != instance.status:
-        create_notification_for_interview_status_change(instance, old_instance.status, instance.status)
+    if not reverse:
+        invalidate_seeker_scores(instance.user_id)
+    elif pk_set:
+        for user_id in JobSeekerProfile.objects.filter(pk__in=pk_set).values_list('user_id', flat=True):
+            invalidate_seeker_scores(user_id)
+
+@receiver(post_save, sender=Resume)
+def resume_saved(sender, instance, created, **kwargs):
+    # CV được kích hoạt/hủy kích hoạt, hoặc CV đang dùng đổi tiêu đề
+    if created:
+        changed = instance.is_active
+    else:
+        changed = instance.has_changed('is_active') or (instance.is_active and instance.has_changed('title'))
+    if changed:
+        _invalidate_resume_owner(instance)
+
+@receiver(post_delete, sender=Resume)
+def resume_deleted(sender, instance, **kwargs):
+    if instance.is_active:
+        _invalidate_resume_owner(instance)
+
+def _invalidate_resume_owner(resume):
+    user_id = JobSeekerProfile.objects.filter(pk=resume.job_seeker_id).values_list('user_id', flat=True).first()
+    if user_id:
+        invalidate_seeker_scores(user_id)
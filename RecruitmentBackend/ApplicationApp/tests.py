@@ -1,3 +1,87 @@
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from AuthApp.models import Role
+from JobApp.models import JobPosting, JobStatus
+from JobApp.tests import create_job, create_user
+from .models import Application, ApplicationStatus
+
+
+class TrackedFieldsSaveTests(TestCase):
+    """Lưu hồ sơ không đọc lại bản ghi để biết trạng thái cũ (RecruitmentBackend/tracking.py)."""
+
+    def setUp(self):
+        job = create_job()
+        seeker = create_user('seeker', Role.JOB_SEEKER)
+        Application.objects.create(job_seeker=seeker, job_posting=job)
+        self.application = Application.objects.get()
+        self.table = Application._meta.db_table
+
+    def test_save_without_status_change_is_one_update(self):
+        self.application.cover_letter = 'Xin chào'
+        with self.assertNumQueries(1):
+            self.application.save()
+
+    def test_status_change_does_not_reread_row(self):
+        self.application.status = ApplicationStatus.REJECTED
+        with CaptureQueriesContext(connection) as queries:
+            self.application.save()
+        rereads = [query['sql'] for query in queries
+                   if query['sql'].startswith('SELECT') and f'FROM "{self.table}"' in query['sql']]
+        self.assertEqual(rereads, [])
+        self.assertEqual(self.application.original_value('status'), ApplicationStatus.REJECTED)
+
+    def test_save_changed_writes_only_changed_fields(self):
+        self.application.status = ApplicationStatus.OFFERED
+        self.application.cover_letter = 'Không được ghi'
+        with CaptureQueriesContext(connection) as queries:
+            self.application.save_changed()
+        update, = [query['sql'] for query in queries if query['sql'].startswith(f'UPDATE "{self.table}"')]
+        self.assertNotIn('cover_letter', update)
+        with self.assertNumQueries(0):
+            self.application.save_changed()
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.status, ApplicationStatus.OFFERED)
+        self.assertIsNone(self.application.cover_letter)
+
+
+class MatchScoreOrderingTests(TestCase):
+    def setUp(self):
+        first = create_job()
+        second = JobPosting.objects.create(recruiter_profile=first.recruiter_profile, title='Tester',
+                                           description='QA', location='Hà Nội', status=JobStatus.APPROVED)
+        self.jobs = [first, second]
+        for i in range(3):
+            seeker = create_user(f'seeker{i}', Role.JOB_SEEKER)
+            for job in self.jobs:
+                Application.objects.create(job_seeker=seeker, job_posting=job)
+        self.client = APIClient()
+        self.client.force_authenticate(first.recruiter_profile.user)
+
+    def inbox(self, **params):
+        return self.client.get('/applications/recruiter_applications/', {'ordering': '-match_score', **params})
+
+    def test_one_posting_is_scored_in_request(self):
+        with mock.patch('ApplicationApp.matching.submit') as submit:
+            response = self.inbox(job_posting=str(self.jobs[0].pk))
+        submit.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(row['match_score'] is not None for row in response.json()['results']))
+        self.assertFalse(Application.objects.filter(job_posting=self.jobs[1], match_score__isnull=False).exists())
 
-# Create your tests here.
+    def test_many_postings_are_scored_in_background_nulls_last(self):
+        third = JobPosting.objects.create(recruiter_profile=self.jobs[0].recruiter_profile, title='Designer',
+                                          description='UI', location='Hà Nội', status=JobStatus.APPROVED)
+        Application.objects.create(job_seeker=create_user('seeker9', Role.JOB_SEEKER), job_posting=third)
+        Application.objects.filter(job_posting=self.jobs[0]).update(match_score=50)
+        with mock.patch('ApplicationApp.matching.submit') as submit, mock.patch('ApplicationApp.matching._scoring', set()):
+            rows = self.inbox().json()['results']
+        self.assertEqual(submit.call_count, 2)
+        self.assertEqual([row['match_score'] for row in rows], [50, 50, 50, None, None, None, None])
+        # Trùng điểm: thứ tự ổn định theo -pk
+        tied = [row['id'] for row in rows if row['match_score'] is None]
+        self.assertEqual(tied, sorted(tied, reverse=True))
@@ -0,0 +1,159 @@
+"""
+Máy trạng thái của hồ sơ ứng tuyển.
+
+Mỗi chuyển trạng thái khai báo trạng thái đích, các trạng thái được phép chuyển từ đó và vai trò
+được thực hiện. Trạng thái được đổi bằng UPDATE có điều kiện (WHERE status IN allowed_from)
+nên hai thao tác đồng thời không ghi đè nhau; nhiều hồ sơ được đổi trong một lần gọi.
+
+UPDATE không chạy signals, nên bảng tổng hợp, lịch sử hoạt động và thông báo (qua outbox,
+một bulk_create cho cả lô) được cập nhật ngay tại đây.
+"""
+import uuid
+from collections import namedtuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from JobApp.models import JobPosting
+from NotificationApp.services import create_notifications_for_application_status_changes
+from ReportApp import activity, rollups
+
+from .models import Application, ApplicationStatus
+
+MAX_BULK_IDS = 1000
+
+# Kết quả cho từng id
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'  # đã ở trạng thái đích
+INVALID_TRANSITION = 'invalid_transition'
+CONFLICT = 'conflict'  # trạng thái vừa bị thao tác khác đổi
+NOT_FOUND = 'not_found'
+INVALID_ID = 'invalid_id'
+
+Transition = namedtuple('Transition', 'target allowed_from role error')
+
+TRANSITIONS = {
+    'offer': Transition(
+        ApplicationStatus.OFFERED,
+        {ApplicationStatus.APPLIED, ApplicationStatus.INTERVIEW_SCHEDULED},
+        'Recruiter',
+        'Chỉ có thể mời nhận việc hồ sơ đang chờ xét hoặc đã lên lịch phỏng vấn.',
+    ),
+    'reject': Transition(
+        ApplicationStatus.REJECTED,
+        {ApplicationStatus.APPLIED, ApplicationStatus.INTERVIEW_SCHEDULED, ApplicationStatus.OFFERED},
+        'Recruiter',
+        'Không thể từ chối hồ sơ đã kết thúc.',
+    ),
+    'withdraw': Transition(
+        ApplicationStatus.WITHDRAWN,
+        {ApplicationStatus.APPLIED},
+        'JobSeeker',
+        'Không thể rút hồ sơ khi đã chuyển bước.',
+    ),
+    'accept_offer': Transition(
+        ApplicationStatus.HIRED,
+        {ApplicationStatus.OFFERED},
+        'JobSeeker',
+        'Chỉ có thể chấp nhận nếu đã được mời.',
+    ),
+}
+
+
+class TransitionError(ValueError):
+    pass
+
+
+def scope_for(user, role):
+    """Các hồ sơ người dùng được chuyển trạng thái với vai trò role."""
+    if role == 'Recruiter':
+        return Application.objects.filter(recruiter_profile__user=user)
+    return Application.objects.filter(job_seeker=user)
+
+
+def _parse_id(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _after_update(rows, old_statuses, target):
+    """Bảng tổng hợp, lịch sử hoạt động và thông báo cho các hồ sơ vừa đổi trạng thái."""
+    changes = []
+    for row in rows:
+        application = Application(id=row['pk'], job_seeker_id=row['job_seeker_id'],
+                                  job_posting_id=row['job_posting_id'], status=target)
+        # Gắn sẵn tin tuyển dụng để rollups không phải query lại recruiter_profile_id
+        application.job_posting = JobPosting(id=row['job_posting_id'],
+                                             recruiter_profile_id=row['job_posting__recruiter_profile_id'])
+        old_status = old_statuses[row['pk']]
+        rollups.application_status_changed(application, old_status, target)
+        activity.record(f'Cập nhật hồ sơ ứng tuyển: {old_status} → {target}',
+                        f'{row["job_seeker__username"]} - {row["job_posting__title"]}',
+                        owner_id=row['job_posting__recruiter_profile__user_id'])
+        changes.append((application, old_status, target))
+    create_notifications_for_application_status_changes(changes)
+
+
+@transaction.atomic
+def apply_transition(name, ids, queryset):
+    """
+    Áp dụng chuyển trạng thái name cho các hồ sơ ids trong queryset (phạm vi người dùng được phép).
+    Trả về {'updated': số hồ sơ đã đổi, 'results': [{'id', 'outcome', 'status'}] theo thứ tự ids}.
+    """
+    transition = TRANSITIONS.get(name)
+    if transition is None:
+        raise TransitionError(f'Chuyển trạng thái không hợp lệ: {name}. Hỗ trợ: {", ".join(TRANSITIONS)}.')
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_BULK_IDS:
+        raise TransitionError(f'Tối đa {MAX_BULK_IDS} hồ sơ mỗi lần.')
+    parsed = {pk for pk in map(_parse_id, ids) if pk is not None}
+
+    # Khóa các dòng hồ sơ tới hết transaction để UPDATE bên dưới đổi đúng các hồ sơ đã phân loại
+    of = ('self',) if connection.features.has_select_for_update_of else ()
+    rows = {row['pk']: row for row in queryset.filter(pk__in=parsed).select_for_update(of=of).values(
+        'pk', 'status', 'job_seeker_id', 'job_seeker__username', 'job_posting_id', 'job_posting__title',
+        'job_posting__recruiter_profile_id', 'job_posting__recruiter_profile__user_id').order_by()}
+    eligible = {pk for pk, row in rows.items() if row['status'] in transition.allowed_from}
+    updated = Application.objects.filter(pk__in=eligible, status__in=transition.allowed_from).update(
+        status=transition.target, updated_at=timezone.now())
+
+    statuses = {pk: row['status'] for pk, row in rows.items()}
+    changed = eligible
+    if updated != len(eligible):
+        # DB không khóa được dòng (SQLite): xem lại hồ sơ nào thực sự đã sang trạng thái đích
+        changed = set(Application.objects.filter(pk__in=eligible, status=transition.target).values_list(
+            'pk', flat=True))
+    _after_update([rows[pk] for pk in eligible if pk in changed], statuses, transition.target)
+
+    results = []
+    for value in ids:
+        pk = _parse_id(value)
+        if pk is None:
+            results.append({'id': value, 'outcome': INVALID_ID, 'status': None})
+            continue
+        if pk not in rows:
+            outcome, current = NOT_FOUND, None
+        elif pk in changed:
+            outcome, current = UPDATED, transition.target
+        elif pk in eligible:
+            outcome, current = CONFLICT, None
+        elif rows[pk]['status'] == transition.target:
+            outcome, current = UNCHANGED, transition.target
+        else:
+            outcome, current = INVALID_TRANSITION, rows[pk]['status']
+        results.append({'id': str(pk), 'outcome': outcome, 'status': current})
+    return {'updated': len(changed), 'results': results}
+
+
+def transition_application(application, name):
+    """
+    Chuyển trạng thái một hồ sơ (đã được kiểm tra quyền). Trả về kết quả như apply_transition;
+    instance được cập nhật trạng thái mới khi thành công.
+    """
+    result = apply_transition(name, [application.pk], Application.objects.all())['results'][0]
+    if result['outcome'] in (UPDATED, UNCHANGED):
+        application.status = result['status']
+        application._remember_tracked({'status'})
+    return result
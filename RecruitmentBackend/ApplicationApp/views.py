@@ -1,4 +1,11 @@
-from rest_framework import viewsets, status
+import uuid
+from datetime import datetime, time, timedelta
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -8,64 +15,153 @@ from .serializers import (
     ApplicationAcceptOfferSerializer, InterviewSerializer
 )
 from .permissions import IsJobSeeker, IsRecruiter, IsAuthenticatedAndApproved
+from .matching import ensure_match_scores
+from .transitions import (
+    TRANSITIONS, UNCHANGED, UPDATED, TransitionError, apply_transition, scope_for, transition_application,
+)
+from RecruitmentBackend.pagination import KeysetPagination
+from AuthApp.roles import active_role_name, get_role_context
+
+
+class ApplicationInboxPagination(KeysetPagination):
+    # Khớp index (recruiter_profile, status, applied_at, id)
+    ordering_field = 'applied_at'
+
+
+class ApplicationOrderingFilter(filters.OrderingFilter):
+    """Hồ sơ chưa có điểm phù hợp xếp cuối; thêm -pk để thứ tự ổn định giữa các trang khi trùng giá trị."""
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        terms = {
+            'match_score': F('match_score').asc(nulls_last=True),
+            '-match_score': F('match_score').desc(nulls_last=True),
+        }
+        return [*(terms.get(term, term) for term in ordering), '-pk']
+
+
+def _parse_day(value):
+    try:
+        return parse_date(value) if value else None
+    except ValueError:
+        return None
 
 
 class ApplicationViewSet(viewsets.ModelViewSet):
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticatedAndApproved]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, ApplicationOrderingFilter]
+    ordering_fields = ['applied_at', 'updated_at', 'status', 'match_score']
 
     def get_queryset(self):
         user = self.request.user
-        if user.active_role.name == 'JobSeeker':
+        if active_role_name(user) == 'JobSeeker':
             return Application.objects.filter(job_seeker=user)
-        if user.active_role.name == 'Recruiter':
-            return Application.objects.filter(job_posting__recruiter=user)
+        if active_role_name(user) == 'Recruiter':
+            return Application.objects.filter(recruiter_profile__user=user)
         return Application.objects.all()
 
+    def filter_queryset(self, queryset):
+        if 'match_score' in self.request.query_params.get('ordering', '') \
+                and active_role_name(self.request.user) == 'Recruiter':
+            # Tính điểm còn thiếu trước khi sắp xếp theo điểm phù hợp: ngay nếu chỉ một tin (?job_posting=),
+            # nhiều tin thì tính nền (ApplicationApp/matching.py)
+            ensure_match_scores(queryset)
+        return super().filter_queryset(queryset)
+
     def perform_create(self, serializer):
         serializer.save(job_seeker=self.request.user)
 
+    def _transition(self, name):
+        # Đổi trạng thái bằng UPDATE có điều kiện (ApplicationApp/transitions.py)
+        result = transition_application(self.get_object(), name)
+        if result['outcome'] not in (UPDATED, UNCHANGED):
+            return Response({'detail': TRANSITIONS[name].error}, status=400)
+        return Response({'status': result['status']})
+
     @action(detail=True, methods=['post'], permission_classes=[IsJobSeeker])
     def withdraw(self, request, pk=None):
-        application = self.get_object()
-        if application.status != ApplicationStatus.APPLIED:
-            return Response({'detail': 'Không thể rút hồ sơ khi đã chuyển bước.'}, status=400)
-        application.status = ApplicationStatus.WITHDRAWN
-        application.save()
-        return Response({'status': 'Withdrawn'})
+        return self._transition('withdraw')
 
     @action(detail=True, methods=['post'], permission_classes=[IsRecruiter])
     def offer(self, request, pk=None):
-        application = self.get_object()
-        application.status = ApplicationStatus.OFFERED
-        application.save()
-        return Response({'status': 'Offered'})
+        return self._transition('offer')
 
     @action(detail=True, methods=['post'], permission_classes=[IsRecruiter])
     def reject(self, request, pk=None):
-        application = self.get_object()
-        application.status = ApplicationStatus.REJECTED
-        application.save()
-        return Response({'status': 'Rejected'})
+        return self._transition('reject')
 
     @action(detail=True, methods=['post'], permission_classes=[IsJobSeeker])
     def accept_offer(self, request, pk=None):
-        application = self.get_object()
         serializer = ApplicationAcceptOfferSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        if application.status != ApplicationStatus.OFFERED:
-            return Response({'detail': 'Chỉ có thể chấp nhận nếu đã được mời.'}, status=400)
-        application.status = ApplicationStatus.HIRED
-        application.save()
-        return Response({'status': 'Hired'})
+        return self._transition('accept_offer')
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticatedAndApproved])
+    def bulk_transition(self, request):
+        """
+        Đổi trạng thái nhiều hồ sơ một lần: {"transition": "offer", "ids": [...]}.
+        Trả về kết quả cho từng id (updated, unchanged, invalid_transition, conflict, not_found, invalid_id).
+        """
+        name = request.data.get('transition')
+        ids = request.data.get('ids')
+        transition = TRANSITIONS.get(name)
+        if transition is None:
+            return Response({'detail': f'transition phải là một trong: {", ".join(TRANSITIONS)}.'}, status=400)
+        if not isinstance(ids, list) or not ids or not all(isinstance(value, str) for value in ids):
+            return Response({'detail': 'Cần danh sách ids.'}, status=400)
+        if not get_role_context(request.user).is_active(transition.role):
+            return Response({'detail': 'Bạn không có quyền thực hiện thao tác này.'}, status=403)
+        if name == 'accept_offer':
+            ApplicationAcceptOfferSerializer(data=request.data).is_valid(raise_exception=True)
+        try:
+            result = apply_transition(name, ids, scope_for(request.user, transition.role))
+        except TransitionError as e:
+            return Response({'detail': str(e)}, status=400)
+        return Response({'transition': name, 'status': transition.target, **result})
 
     @action(detail=False, methods=['get'], permission_classes=[IsRecruiter])
     def recruiter_applications(self, request):
-        job_posting_id = request.query_params.get('job_posting')
-        apps = Application.objects.filter(job_posting__recruiter=request.user, job_posting_id=job_posting_id)
-        serializer = self.get_serializer(apps, many=True)
-        return Response(serializer.data)
+        """
+        Hộp thư hồ sơ của nhà tuyển dụng, mới nộp trước, phân trang keyset.
+        Lọc: job_posting, status (nhiều giá trị cách nhau bởi dấu phẩy), from/to (ngày nộp, YYYY-MM-DD).
+        Sắp xếp: ?ordering=-match_score để xếp ứng viên theo điểm phù hợp với tin.
+        """
+        params = request.query_params
+        apps = Application.objects.filter(recruiter_profile__user=request.user)
+
+        job_posting_id = params.get('job_posting')
+        if job_posting_id:
+            try:
+                apps = apps.filter(job_posting_id=uuid.UUID(job_posting_id))
+            except ValueError:
+                return Response({'detail': 'job_posting phải là UUID.'}, status=400)
+        statuses = [value.strip() for value in params.get('status', '').split(',') if value.strip()]
+        invalid = [value for value in statuses if value not in ApplicationStatus.values]
+        if invalid:
+            return Response({'detail': f'status không hợp lệ: {", ".join(invalid)}.'}, status=400)
+        if statuses:
+            apps = apps.filter(status__in=statuses)
+        for key, lookup in (('from', 'gte'), ('to', 'lt')):
+            value = params.get(key)
+            day = _parse_day(value)
+            if value and day is None:
+                return Response({'detail': f'{key} phải có dạng YYYY-MM-DD.'}, status=400)
+            if day:
+                if key == 'to':
+                    day += timedelta(days=1)
+                apps = apps.filter(**{f'applied_at__{lookup}': timezone.make_aware(datetime.combine(day, time.min))})
+
+        # ?ordering=-match_score: xếp hạng theo điểm phù hợp (phân trang theo số trang)
+        apps = self.filter_queryset(apps)
+        paginator = ApplicationInboxPagination()
+        page = paginator.paginate_queryset(apps.select_related('job_posting'), request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class InterviewViewSet(viewsets.ModelViewSet):
@@ -75,9 +171,9 @@ class InterviewViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        if user.active_role.name == 'Recruiter':
-            return Interview.objects.filter(application__job_posting__recruiter_profile__user=user)
-        elif user.active_role.name == 'JobSeeker':
+        if active_role_name(user) == 'Recruiter':
+            return Interview.objects.filter(application__recruiter_profile__user=user)
+        elif active_role_name(user) == 'JobSeeker':
             return Interview.objects.filter(application__job_seeker=user)
         return Interview.objects.all()
 
@@ -0,0 +1,71 @@
+"""
+Xác thực JWT không cần nạp user và vai trò từ DB.
+
+Token do AuthApp/tokens.py cấp đã chứa vai trò; request chỉ cần so role_version
+trong token với phiên bản hiện tại (lấy từ cache). request.user là ClaimsUser:
+id, is_authenticated và vai trò đọc từ claim, các thuộc tính khác nạp MyUser khi cần.
+Token cũ không có claim role_version vẫn được xác thực như trước.
+"""
+from django.contrib.auth import get_user_model
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .roles import RoleContext, get_role_version
+from .tokens import ACTIVE_ROLE_CLAIM, ROLE_VERSION_CLAIM, ROLES_CLAIM
+
+
+class ClaimsUser(SimpleLazyObject):
+    """User dựng từ claim của JWT, chỉ truy vấn MyUser khi dùng tới thuộc tính khác."""
+
+    def __init__(self, user_id, role_context):
+        self.__dict__['_user_id'] = get_user_model()._meta.pk.to_python(user_id)
+        self.__dict__['_claims_role_context'] = role_context
+        super().__init__(self._load_user)
+
+    def _load_user(self):
+        user = get_user_model().objects.get(**{api_settings.USER_ID_FIELD: self.__dict__['_user_id']})
+        user._role_context = self.__dict__['_claims_role_context']
+        return user
+
+    def __bool__(self):
+        return True
+
+    @property
+    def pk(self):
+        return self.__dict__['_user_id']
+
+    id = pk
+
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
+    @property
+    def _role_context(self):
+        return self.__dict__['_claims_role_context']
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        version = validated_token.get(ROLE_VERSION_CLAIM)
+        if version is None:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken('Token không chứa thông tin người dùng.') from e
+
+        current = get_role_version(user_id)
+        if current is None:
+            raise AuthenticationFailed('Không tìm thấy người dùng.', code='user_not_found')
+        if current != version:
+            raise InvalidToken('Vai trò đã thay đổi, vui lòng làm mới token.')
+
+        context = RoleContext(validated_token.get(ACTIVE_ROLE_CLAIM), validated_token.get(ROLES_CLAIM, ()))
+        return ClaimsUser(user_id, context)
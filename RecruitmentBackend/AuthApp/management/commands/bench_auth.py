@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from AuthApp.authentication import RoleClaimsJWTAuthentication
+from AuthApp.models import Role, UserRole
+from AuthApp.roles import active_role_name
+from AuthApp.tokens import token_pair
+from RecruitmentBackend.benchmarks import BenchmarkCommand, create_users
+
+
+class Command(BenchmarkCommand):
+    help = ('Đo chi phí xác thực + kiểm tra vai trò mỗi request: JWT mang vai trò (RoleClaimsJWTAuthentication) '
+            'so với JWT chuẩn nạp MyUser và UserRole từ DB.')
+    default_repeat = 200
+
+    def run(self, **options):
+        user_id, = create_users(self.label, 1, Role.RECRUITER)
+        # Người dùng có nhiều vai trò, như nhà tuyển dụng kiêm người tìm việc
+        UserRole.objects.create(user_id=user_id, role=Role.objects.get_or_create(name=Role.JOB_SEEKER)[0],
+                                is_approved=True)
+        user = UserRole.objects.select_related('user').filter(user_id=user_id).first().user
+        access = token_pair(user)['access']
+        self.stdout.write(f'Độ dài access token: {len(access)} ký tự')
+        factory = APIRequestFactory()
+
+        def check(authentication):
+            # Như một request: xác thực rồi permission class đọc vai trò đang dùng
+            request = Request(factory.get('/', HTTP_AUTHORIZATION=f'Bearer {access}'))
+            authenticated, _ = authentication.authenticate(request)
+            assert active_role_name(authenticated) == Role.RECRUITER
+            return authenticated
+
+        for description, role_cache in [
+            ('cache vai trò bật (mặc định)', None),
+            ('không cache vai trò', {'TTL': 0, 'VERSION_TTL': 0}),
+        ]:
+            self.stdout.write(f'-- {description}')
+            with override_settings(**({'ROLE_CACHE': role_cache} if role_cache else {})):
+                for name, authentication in [('JWT chuẩn + vai trò từ DB', JWTAuthentication()),
+                                             ('JWT mang vai trò', RoleClaimsJWTAuthentication())]:
+                    cache.clear()
+                    check(authentication)  # request trước của cùng người dùng đã nạp cache
+                    self.measure(name, lambda: check(authentication))
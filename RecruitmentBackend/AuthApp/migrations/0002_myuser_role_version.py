@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AuthApp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='myuser',
+            name='role_version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Tăng khi vai trò thay đổi, làm mất hiệu lực JWT cũ'),
+        ),
+    ]
@@ -4,8 +4,10 @@ from django.contrib.auth.models import AbstractUser
 from django.conf import settings
 from cloudinary.models import CloudinaryField
 
+from RecruitmentBackend.tracking import TrackedFieldsMixin
 
-class BaseModel(models.Model):
+
+class BaseModel(TrackedFieldsMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -37,7 +39,7 @@ class Role(BaseModel):
         ordering = ['name']
 
 
-class MyUser(AbstractUser):
+class MyUser(TrackedFieldsMixin, AbstractUser):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     email = models.EmailField(unique=True)
     avatar = CloudinaryField(null=True, blank=True, folder='avatars')
@@ -46,10 +48,25 @@ class MyUser(AbstractUser):
     is_verified = models.BooleanField(default=False, help_text="Email đã xác thực")
     is_active = models.BooleanField(default=True, help_text="Tài khoản hoạt động")
     last_password_change = models.DateTimeField(null=True, blank=True)
+    role_version = models.PositiveIntegerField(default=0, editable=False,
+                                               help_text="Tăng khi vai trò thay đổi, làm mất hiệu lực JWT cũ")
+
+    tracked_fields = ('active_role',)
 
     def __str__(self):
         return self.username or "User has no username"
 
+    def save(self, *args, **kwargs):
+        # role_version chỉ tăng qua AuthApp.roles.bump_role_version (UPDATE ... + 1),
+        # không ghi đè bằng giá trị cũ của đối tượng đã nạp trước đó
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'role_version' and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def avatar_url(self):
         if self.avatar:
@@ -70,6 +87,8 @@ class UserRole(BaseModel):
     approved_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
                                     related_name='approved_roles')
 
+    tracked_fields = ('is_approved',)
+
     class Meta:
         unique_together = ('user', 'role')
         verbose_name = "Vai trò người dùng"
@@ -1,9 +1,10 @@
 from rest_framework import permissions
+from .roles import has_approved_role
 
 class IsAdminUser(permissions.BasePermission):
     def has_permission(self, request, view):
-        return request.user and request.user.user_roles.filter(role__name='Admin', is_approved=True).exists()
+        return bool(request.user) and has_approved_role(request.user, 'Admin')
 
 class IsRecruiterApproved(permissions.BasePermission):
     def has_permission(self, request, view):
-        return request.user and request.user.user_roles.filter(role__name='Recruiter', is_approved=True).exists()
+        return bool(request.user) and has_approved_role(request.user, 'Recruiter')
@@ -0,0 +1,126 @@
+"""
+Tra cứu vai trò của người dùng một lần cho mỗi request.
+
+Các permission class dùng chung RoleContext thay vì tự query user_roles/active_role.
+Kết quả được ghi nhớ trên đối tượng user của request và cache ngắn hạn theo user id;
+cache bị xóa khi UserRole hoặc active_role của user thay đổi (AuthApp/signals.py).
+
+JWT do AuthApp/tokens.py cấp mang sẵn vai trò kèm MyUser.role_version; khi vai trò
+đổi (duyệt role, chuyển role, khóa tài khoản) bump_role_version tăng phiên bản và token cũ
+bị AuthApp/authentication.py từ chối.
+
+Cấu hình qua settings.ROLE_CACHE:
+- TTL: số giây giữ RoleContext trong cache (0 = không cache, chỉ ghi nhớ trong request).
+- VERSION_TTL: số giây giữ role_version trong cache. Với cache riêng từng tiến trình
+  (LocMem), token cũ có thể còn dùng được ở tiến trình khác tối đa chừng ấy giây.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import MyUser, Role, UserRole
+
+
+class RoleContext:
+    __slots__ = ('active_role', 'approved_roles')
+
+    def __init__(self, active_role=None, approved_roles=()):
+        self.active_role = active_role
+        self.approved_roles = frozenset(approved_roles)
+
+    def has_role(self, role_name):
+        """Có vai trò role_name đã được duyệt (không cần đang active)."""
+        return role_name in self.approved_roles
+
+    def is_active(self, role_name):
+        """Đang dùng vai trò role_name và vai trò đó đã được duyệt."""
+        return self.active_role == role_name and role_name in self.approved_roles
+
+    @property
+    def active_approved(self):
+        return self.active_role is not None and self.active_role in self.approved_roles
+
+
+ANONYMOUS = RoleContext()
+
+
+def _cache_key(user_id):
+    return f'roles:user:{user_id}'
+
+
+def _version_cache_key(user_id):
+    return f'roles:version:{user_id}'
+
+
+def _ttl():
+    return getattr(settings, 'ROLE_CACHE', {}).get('TTL', 60)
+
+
+def _version_ttl():
+    return getattr(settings, 'ROLE_CACHE', {}).get('VERSION_TTL', 30)
+
+
+def load_role_context(user):
+    approved = dict(
+        UserRole.objects.filter(user_id=user.pk, is_approved=True).values_list('role_id', 'role__name')
+    )
+    active_role = approved.get(user.active_role_id)
+    if active_role is None and user.active_role_id:
+        # Vai trò active chưa được duyệt (hiếm gặp)
+        active_role = Role.objects.filter(pk=user.active_role_id).values_list('name', flat=True).first()
+    return RoleContext(active_role, approved.values())
+
+
+def get_role_context(user):
+    if not user or not user.is_authenticated:
+        return ANONYMOUS
+    context = getattr(user, '_role_context', None)
+    if context is not None:
+        return context
+
+    ttl = _ttl()
+    key = _cache_key(user.pk)
+    cached = cache.get(key) if ttl else None
+    if cached is not None:
+        context = RoleContext(*cached)
+    else:
+        context = load_role_context(user)
+        if ttl:
+            cache.set(key, (context.active_role, tuple(context.approved_roles)), ttl)
+    user._role_context = context
+    return context
+
+
+def invalidate_role_context(user_id):
+    cache.delete(_cache_key(user_id))
+
+
+def get_role_version(user_id):
+    """role_version hiện tại của user, None nếu user không còn tồn tại."""
+    ttl = _version_ttl()
+    key = _version_cache_key(user_id)
+    version = cache.get(key) if ttl else None
+    if version is None:
+        version = MyUser.objects.filter(pk=user_id).values_list('role_version', flat=True).first()
+        if version is not None and ttl:
+            cache.set(key, version, ttl)
+    return version
+
+
+def bump_role_version(user_id):
+    """Vai trò của user đã đổi: làm mất hiệu lực các JWT đã cấp và RoleContext đang cache."""
+    MyUser.objects.filter(pk=user_id).update(role_version=F('role_version') + 1)
+    cache.delete(_version_cache_key(user_id))
+    invalidate_role_context(user_id)
+
+
+def active_role_name(user):
+    return get_role_context(user).active_role
+
+
+def has_active_role(user, role_name):
+    return get_role_context(user).is_active(role_name)
+
+
+def has_approved_role(user, role_name):
+    return get_role_context(user).has_role(role_name)
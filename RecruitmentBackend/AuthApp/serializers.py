@@ -2,7 +2,11 @@ from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from django.utils import timezone
 from django.contrib.auth import authenticate
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from .models import MyUser, Role, UserRole
+from .tokens import RoleRefreshToken, stamp_role_claims
 
 # Đăng ký user
 class RegisterSerializer(serializers.ModelSerializer):
@@ -106,3 +110,15 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
 # Upload avatar
 class AvatarUploadSerializer(serializers.Serializer):
     avatar = serializers.ImageField()
+
+# Làm mới token: ghi lại vai trò hiện tại vào token trước khi sinh access token mới
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RoleRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user = MyUser.objects.filter(pk=refresh.payload.get(api_settings.USER_ID_CLAIM)).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        attrs['refresh'] = str(stamp_role_claims(refresh, user))
+        return super().validate(attrs)
@@ -1,4 +1,4 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.apps import apps
 from NotificationApp.services import (
@@ -6,6 +6,8 @@ from NotificationApp.services import (
     create_notification_for_role_approved,
 )
 from django.utils import timezone
+from ReportApp import activity
+from .roles import bump_role_version, invalidate_role_context
 
 User = apps.get_model('AuthApp', 'MyUser')
 UserRole = apps.get_model('AuthApp', 'UserRole')
@@ -14,14 +16,28 @@ UserRole = apps.get_model('AuthApp', 'UserRole')
 def user_registered(sender, instance, created, **kwargs):
     if created:
         create_notification_for_user_registration(instance)
+    elif not instance.is_active:
+        # Tài khoản bị khóa: JWT đã cấp hết hiệu lực
+        bump_role_version(instance.pk)
+    else:
+        # active_role có thể đã đổi
+        invalidate_role_context(instance.pk)
 
-@receiver(pre_save, sender=UserRole)
-def userrole_approval_status_change(sender, instance, **kwargs):
-    if not instance.pk:
-        return
-    try:
-        old_instance = UserRole.objects.get(pk=instance.pk)
-    except UserRole.DoesNotExist:
-        return
-    if not old_instance.is_approved and instance.is_approved:
+@receiver(post_save, sender=UserRole)
+def userrole_saved(sender, instance, created, **kwargs):
+    if created:
+        activity.record('Đăng ký vai trò', instance.role.name, owner_id=instance.user_id)
+    elif instance.is_approved and instance.has_changed('is_approved'):
+        # Thông báo đi qua outbox, ghi cùng transaction với việc duyệt
         create_notification_for_role_approved(instance)
+        activity.record('Duyệt vai trò', f'{instance.role.name} - {instance.user.username}',
+                        owner_id=instance.approved_by_id)
+    if created and not instance.is_approved:
+        # Yêu cầu role mới chưa duyệt không đổi quyền hiện tại
+        invalidate_role_context(instance.user_id)
+    else:
+        bump_role_version(instance.user_id)
+
+@receiver(post_delete, sender=UserRole)
+def userrole_deleted(sender, instance, **kwargs):
+    bump_role_version(instance.user_id)
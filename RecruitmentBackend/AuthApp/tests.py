@@ -1,3 +1,49 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import MyUser, Role, UserRole
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class RoleSwitchTokenTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = MyUser.objects.create_user(username='both', email='both@example.com', password='Passw0rd!x')
+        self.seeker, _ = Role.objects.get_or_create(name=Role.JOB_SEEKER)
+        self.recruiter, _ = Role.objects.get_or_create(name=Role.RECRUITER)
+        for role in (self.seeker, self.recruiter):
+            UserRole.objects.create(user=self.user, role=role, is_approved=True)
+        self.user.active_role = self.seeker
+        self.user.save()
+        self.client = APIClient()
+        response = self.client.post('/auth/login/', {'username': 'both', 'password': 'Passw0rd!x'})
+        self.access = response.json()['access']
+
+    def get_info(self, access):
+        return self.client.get('/auth/user_info/', HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_activate_returns_new_tokens(self):
+        response = self.client.patch('/user-roles/activate/', {'role_name': Role.RECRUITER},
+                                     HTTP_AUTHORIZATION=f'Bearer {self.access}')
+        self.assertEqual(response.status_code, 200)
+        # Token cũ mang vai trò cũ bị từ chối, token mới dùng được ngay
+        self.assertEqual(self.get_info(self.access).status_code, 401)
+        info = self.get_info(response.json()['access'])
+        self.assertEqual(info.status_code, 200)
+        self.assertEqual(info.json()['active_role'], str(self.recruiter.pk))
+        refreshed = self.client.post('/auth/token/refresh/', {'refresh': response.json()['refresh']})
+        self.assertEqual(refreshed.status_code, 200)
+
+    def test_update_user_role_returns_new_tokens(self):
+        response = self.client.patch('/auth/update_user/', {'active_role': str(self.recruiter.pk)},
+                                     HTTP_AUTHORIZATION=f'Bearer {self.access}', format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_info(response.json()['access']).status_code, 200)
+
+    def test_update_user_without_role_change_keeps_token(self):
+        response = self.client.patch('/auth/update_user/', {'first_name': 'An'},
+                                     HTTP_AUTHORIZATION=f'Bearer {self.access}', format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('access', response.json())
+        self.assertEqual(self.get_info(self.access).status_code, 200)
@@ -0,0 +1,36 @@
+"""
+JWT mang sẵn vai trò của người dùng.
+
+Refresh token (và access token sinh ra từ nó) chứa các claim:
+- roles: danh sách vai trò đã được duyệt
+- active_role: vai trò đang dùng
+- role_version: MyUser.role_version tại thời điểm cấp token
+"""
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .roles import load_role_context
+
+ROLES_CLAIM = 'roles'
+ACTIVE_ROLE_CLAIM = 'active_role'
+ROLE_VERSION_CLAIM = 'role_version'
+
+
+def stamp_role_claims(token, user):
+    """Ghi vai trò hiện tại của user (đọc từ DB) vào token."""
+    context = load_role_context(user)
+    token[ROLES_CLAIM] = sorted(context.approved_roles)
+    token[ACTIVE_ROLE_CLAIM] = context.active_role
+    token[ROLE_VERSION_CLAIM] = user.role_version
+    return token
+
+
+class RoleRefreshToken(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        return stamp_role_claims(super().for_user(user), user)
+
+
+def token_pair(user):
+    """Cặp refresh/access mới cho user, mang vai trò và role_version hiện tại."""
+    refresh = RoleRefreshToken.for_user(user)
+    return {'refresh': str(refresh), 'access': str(refresh.access_token)}
@@ -2,7 +2,6 @@ from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.utils import timezone
 from django.core.mail import send_mail
 from django.conf import settings
@@ -15,6 +14,8 @@ from .serializers import (
     AvatarUploadSerializer
 )
 from .permissions import IsAdminUser
+from .roles import bump_role_version
+from .tokens import token_pair
 
 class AuthViewSet(viewsets.GenericViewSet):
     """
@@ -54,10 +55,8 @@ class AuthViewSet(viewsets.GenericViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        refresh = RefreshToken.for_user(user)
         return Response({
-            'refresh': str(refresh),
-            'access': str(refresh.access_token),
+            **token_pair(user),
             'user': UserSerializer(user).data,
         })
 
@@ -66,10 +65,8 @@ class AuthViewSet(viewsets.GenericViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
-        refresh = RefreshToken.for_user(user)
         return Response({
-            'refresh': str(refresh),
-            'access': str(refresh.access_token),
+            **token_pair(user),
             'user': UserSerializer(user).data,
         })
 
@@ -83,7 +80,11 @@ class AuthViewSet(viewsets.GenericViewSet):
         serializer = UserSerializer(request.user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return Response(serializer.data)
+        if 'active_role' not in serializer.validated_data:
+            return Response(serializer.data)
+        # Token đang dùng mất hiệu lực khi đổi vai trò: trả về cặp token mới
+        bump_role_version(request.user.pk)
+        return Response({**serializer.data, **token_pair(MyUser.objects.get(pk=request.user.pk))})
 
     @action(detail=False, methods=['post'])
     def change_password(self, request):
@@ -180,7 +181,12 @@ class UserRoleViewSet(viewsets.GenericViewSet, mixins.ListModelMixin):
         user = request.user
         user.active_role = role
         user.save()
-        return Response({"detail": f"Đã chuyển sang role {role_name}."})
+        # Token đang dùng mất hiệu lực khi đổi vai trò: trả về cặp token mới
+        bump_role_version(user.pk)
+        return Response({
+            "detail": f"Đã chuyển sang role {role_name}.",
+            **token_pair(MyUser.objects.get(pk=user.pk)),
+        })
 
 class AdminUserRoleViewSet(viewsets.GenericViewSet):
     permission_classes = [IsAuthenticated, IsAdminUser]
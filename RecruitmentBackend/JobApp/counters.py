@@ -0,0 +1,118 @@
+"""
+Bộ đếm lượt xem tin tuyển dụng ghi trễ (write-behind).
+
+Lượt xem được cộng dồn trong bộ nhớ và ghi xuống DB định kỳ bằng một câu
+UPDATE views_count = views_count + n cho cả lô, thay vì lưu cả bản ghi mỗi lượt xem.
+
+Cấu hình qua settings.JOB_VIEW_COUNTER:
+- FLUSH_INTERVAL: số giây tối đa một lượt xem nằm trong bộ đệm (0 = ghi ngay).
+- FLUSH_THRESHOLD: ghi ngay khi bộ đệm đạt số lượt xem này.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+
+from .models import JobPosting
+
+logger = logging.getLogger(__name__)
+
+UPDATE_CHUNK_SIZE = 500
+
+
+class ViewCounter:
+    def __init__(self):
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+
+    @property
+    def _config(self):
+        return getattr(settings, 'JOB_VIEW_COUNTER', {})
+
+    def increment(self, job_id, count=1):
+        """
+        Cộng lượt xem vào bộ đệm. Trả về số lượt của tin đang đệm tính cả lượt vừa cộng
+        (trước khi ghi, nếu lần cộng này làm bộ đệm được ghi ngay), để cộng với views_count
+        đã đọc từ DB trước đó.
+        """
+        with self._lock:
+            self._pending[job_id] += count
+            pending = self._pending[job_id]
+            total = sum(self._pending.values())
+        interval = self._config.get('FLUSH_INTERVAL', 5)
+        if not interval or total >= self._config.get('FLUSH_THRESHOLD', 1000):
+            try:
+                self.flush()
+            except Exception:
+                # flush đã log lỗi và giữ lại lượt xem trong bộ đệm; không làm hỏng request đọc tin
+                if interval:
+                    self._schedule(interval)
+        else:
+            self._schedule(interval)
+        return pending
+
+    def pending(self, job_id):
+        with self._lock:
+            return self._pending.get(job_id, 0)
+
+    def _schedule(self, interval):
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(interval, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        finally:
+            close_old_connections()
+
+    def flush(self):
+        """Ghi toàn bộ bộ đệm xuống DB. Trả về số tin đã cập nhật."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, Counter()
+            if not batch:
+                return 0
+            items = list(batch.items())
+            try:
+                for start in range(0, len(items), UPDATE_CHUNK_SIZE):
+                    chunk = items[start:start + UPDATE_CHUNK_SIZE]
+                    JobPosting.objects.filter(pk__in=[job_id for job_id, _ in chunk]).update(
+                        views_count=F('views_count') + Case(
+                            *[When(pk=job_id, then=Value(count)) for job_id, count in chunk],
+                            default=Value(0),
+                            output_field=PositiveIntegerField(),
+                        )
+                    )
+                    # Phần đã ghi thành công không được cộng lại nếu lô sau lỗi
+                    for job_id, count in chunk:
+                        batch[job_id] -= count
+            except Exception:
+                logger.exception('Không ghi được lượt xem, giữ lại trong bộ đệm')
+                with self._lock:
+                    self._pending.update(+batch)
+                raise
+            return len(items)
+
+
+view_counter = ViewCounter()
+
+
+@atexit.register
+def _flush_at_exit():
+    # Ghi nốt phần còn trong bộ đệm khi tiến trình dừng (lỗi đã được log trong flush)
+    try:
+        view_counter.flush()
+    except Exception:
+        pass
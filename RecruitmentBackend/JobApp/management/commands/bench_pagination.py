@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.test import Client
+from django.utils import timezone
+
+from JobApp.models import JobPosting, JobStatus
+from RecruitmentBackend.benchmarks import BenchmarkCommand, create_jobs, create_recruiter, explicit_timestamps
+from RecruitmentBackend.pagination import KeysetPagination
+
+
+class Command(BenchmarkCommand):
+    help = 'So sánh phân trang theo số trang (?page=) với keyset (?cursor=) của /jobs/ ở các trang sâu dần.'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--jobs', type=int, default=100_000)
+        parser.add_argument('--page', type=int, action='append', dest='pages',
+                            help='Trang cần đo (lặp lại để đo nhiều trang). Mặc định: 1, 100, 1000, 10000.')
+
+    def run(self, jobs, pages, **options):
+        recruiter = self.seed('nhà tuyển dụng', create_recruiter, self.label)
+        # Mỗi tin một mốc created_at riêng, cách nhau một giây như khi được đăng dần
+        start = timezone.now()
+        with explicit_timestamps(JobPosting):
+            self.seed(f'{jobs} tin tuyển dụng', create_jobs, recruiter, jobs, self.label, lambda i: {
+                'title': f'{self.label} job {i}', 'description': 'Mô tả', 'location': 'Hà Nội',
+                'created_at': start - timedelta(seconds=i), 'updated_at': start - timedelta(seconds=i),
+            })
+
+        paginator = KeysetPagination()
+        public = JobPosting.objects.filter(status=JobStatus.APPROVED).order_by('-created_at', '-pk')
+        total = public.count()
+        client = Client()
+        for page in sorted(set(pages or [1, 100, 1000, 10_000])):
+            offset = (page - 1) * paginator.page_size
+            if offset >= total:
+                self.stdout.write(f'-- Bỏ qua trang {page}: chỉ có {total} tin')
+                continue
+            self.stdout.write(f'-- Trang {page} (bỏ qua {offset} tin)')
+            self.measure('?page=', lambda: client.get('/jobs/', {'page': page}))
+            # Cursor của trang này là cursor "next" của trang trước: dòng cuối trang trước
+            params = {'cursor': paginator.encode_cursor(public[offset - 1], False)} if offset else {}
+            self.measure('?cursor=', lambda: client.get('/jobs/', params))
+            same = (client.get('/jobs/', {'page': page}).json()['results']
+                    == client.get('/jobs/', params).json()['results'])
+            self.stdout.write(f'  Hai cách trả về cùng trang: {"có" if same else "KHÔNG"}')
@@ -0,0 +1,53 @@
+import random
+
+from django.test import Client
+
+from JobApp.models import JobPosting
+from JobApp.search import FIELD_WEIGHTS, index_new_jobs
+from RecruitmentBackend.benchmarks import BenchmarkCommand, create_jobs, create_recruiter
+
+ROLES = ['Backend Developer', 'Frontend Developer', 'Kế toán', 'Nhân viên kinh doanh', 'Data Engineer',
+         'Kỹ sư kiểm thử', 'Thiết kế đồ họa', 'Chăm sóc khách hàng', 'Quản lý dự án', 'Kỹ sư DevOps']
+SKILLS = ['Python', 'Django', 'Java', 'Spring', 'React', 'SQL', 'Excel', 'Photoshop', 'Docker', 'AWS',
+          'Node.js', 'C#', 'Figma', 'Kubernetes', 'Tiếng Anh']
+LOCATIONS = ['Hà Nội', 'TP. Hồ Chí Minh', 'Đà Nẵng', 'Cần Thơ', 'Hải Phòng', 'Bình Dương']
+FILLER = ('công ty môi trường làm việc năng động lương thưởng hấp dẫn phát triển sản phẩm khách hàng '
+          'đội ngũ kinh nghiệm tối thiểu năm chế độ bảo hiểm đào tạo cơ hội thăng tiến').split()
+
+
+class Command(BenchmarkCommand):
+    help = ('So sánh tìm kiếm bằng chỉ mục BM25 (/jobs/search/) với SearchFilter (/jobs/?search=) '
+            'trên N tin tuyển dụng giả.')
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--jobs', type=int, default=1_000_000)
+        parser.add_argument('--query', action='append', dest='queries',
+                            help='Truy vấn cần đo (lặp lại để đo nhiều truy vấn).')
+
+    def run(self, jobs, queries, **options):
+        rnd = random.Random(1)
+
+        def fields(i):
+            role, location = rnd.choice(ROLES), rnd.choice(LOCATIONS)
+            skills = rnd.sample(SKILLS, 3)
+            return {
+                'title': f'{role} {skills[0]}',
+                'description': ' '.join(rnd.choices(FILLER, k=40) + skills),
+                # Từ hiếm (0,1% số tin): SearchFilter vẫn phải quét cả bảng
+                'requirements': f'Thành thạo {", ".join(skills)}' + (' Elixir' if i % 1000 == 0 else ''),
+                'location': location,
+            }
+
+        recruiter = self.seed('nhà tuyển dụng', create_recruiter, self.label)
+        self.seed(f'{jobs} tin tuyển dụng', create_jobs, recruiter, jobs, self.label, fields)
+        jobs = JobPosting.objects.filter(recruiter_profile=recruiter).only(*FIELD_WEIGHTS)
+        self.seed('chỉ mục tìm kiếm', index_new_jobs, jobs.iterator(chunk_size=2000))
+
+        client = Client()
+        # "haskell" không có trong tin nào: trường hợp xấu nhất của SearchFilter (quét hết bảng)
+        for query in queries or ['python developer', 'kế toán hà nội', 'java spring', 'elixir', 'haskell']:
+            before = self.measure(f'SearchFilter "{query}"', lambda: client.get('/jobs/', {'search': query}))
+            after = self.measure(f'BM25 "{query}"', lambda: client.get('/jobs/search/', {'q': query}))
+            hits = client.get('/jobs/search/', {'q': query}).json()['count']
+            self.stdout.write(f'  {hits} kết quả, thời gian SearchFilter / BM25 = {before / after:.2f}')
@@ -0,0 +1,49 @@
+from django.utils.text import slugify
+
+from JobApp.models import JobPosting
+from RecruitmentBackend.benchmarks import BenchmarkCommand, create_jobs, create_recruiter
+
+
+def legacy_slug(title):
+    """Cách cấp slug cũ: thử lần lượt -1, -2, ... với một EXISTS cho mỗi ứng viên."""
+    base_slug = slugify(title)
+    slug, num = base_slug, 1
+    while JobPosting.objects.filter(slug=slug).exists():
+        slug = f"{base_slug}-{num}"
+        num += 1
+    return slug
+
+
+class Command(BenchmarkCommand):
+    help = 'Đo chi phí cấp slug khi đã có N tin trùng tiêu đề, so với cách thử từng hậu tố.'
+    default_repeat = 3
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--jobs', type=int, default=10_000)
+        parser.add_argument('--title', help='Mặc định: "Backend Developer <nhãn lần chạy>" để không trùng tin có sẵn.')
+
+    def run(self, jobs, title, **options):
+        title = title or f'Backend Developer {self.label}'
+        base_slug = slugify(title)
+        recruiter = self.seed('nhà tuyển dụng', create_recruiter, self.label)
+        existing = 0
+        for checkpoint in sorted({max(jobs // 10, 1), max(jobs // 2, 1), jobs}):
+            # Các tin trùng tiêu đề đã có slug "<base>", "<base>-1", ..., như khi được tạo lần lượt
+            offset = existing
+            self.seed(f'{checkpoint - existing} tin "{title}"', create_jobs, recruiter, checkpoint - existing,
+                      self.label, lambda i: {'title': title, 'description': 'Mô tả', 'location': 'Hà Nội',
+                                             'slug': f'{base_slug}-{offset + i}' if offset + i else base_slug})
+            existing = checkpoint
+
+            self.stdout.write(f'-- Đã có {existing} tin trùng tiêu đề')
+            for description, allocate in [
+                ('thử từng hậu tố', lambda: legacy_slug(title)),
+                ('một query', lambda: JobPosting(title=title)._next_free_slug()),
+            ]:
+                self.measure(f'Cấp slug ({description}) -> {allocate()}', allocate)
+
+            self.measure('Tạo tin (JobPosting.save, gồm signals)', lambda: JobPosting.objects.create(
+                recruiter_profile=recruiter, title=title, description='Mô tả', location='Hà Nội'))
+            # Các tin vừa tạo khi đo giữ hậu tố tiếp theo, lần seed sau bắt đầu sau chúng
+            existing += self.repeat + 1
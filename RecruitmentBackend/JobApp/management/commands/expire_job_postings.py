@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from JobApp.services import expire_overdue_postings
+
+
+class Command(BaseCommand):
+    help = 'Chuyển các tin tuyển dụng quá hạn sang trạng thái Expired (chạy định kỳ, ví dụ cron mỗi phút).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        stats = expire_overdue_postings(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Đã cập nhật {stats['expired']} tin trong {stats['batches']} lô ({stats['seconds']:.3f}s)."
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from JobApp.recommendations import rebuild_vectors
+
+
+class Command(BaseCommand):
+    help = 'Trích lại vector kỹ năng cho mọi tin tuyển dụng (dùng sau khi thêm kỹ năng mới).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        count = rebuild_vectors(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Đã xử lý {count} tin tuyển dụng.'))
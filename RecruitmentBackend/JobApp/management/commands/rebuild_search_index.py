@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from JobApp.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Dựng lại chỉ mục tìm kiếm tin tuyển dụng.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        count = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Đã đánh chỉ mục {count} tin tuyển dụng.'))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchDocument',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='JobApp.jobposting')),
+                ('length', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Tài liệu tìm kiếm',
+                'verbose_name_plural': 'Các tài liệu tìm kiếm',
+            },
+        ),
+        migrations.CreateModel(
+            name='JobSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('frequency', models.PositiveIntegerField(default=0)),
+                ('document_length', models.PositiveIntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='JobApp.jobposting')),
+            ],
+            options={
+                'verbose_name': 'Từ khóa tìm kiếm',
+                'verbose_name_plural': 'Các từ khóa tìm kiếm',
+                'unique_together': {('term', 'job')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApp', '0002_jobsearchdocument_jobsearchterm'),
+        ('ResumeApp', '0003_jobseekerprofile_preferred_locations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weight', models.FloatField(default=1.0)),
+                ('norm', models.FloatField(default=1.0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_vector', to='JobApp.jobposting')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_vectors', to='ResumeApp.skill')),
+            ],
+            options={
+                'verbose_name': 'Kỹ năng của tin tuyển dụng',
+                'verbose_name_plural': 'Kỹ năng của các tin tuyển dụng',
+                'unique_together': {('skill', 'job')},
+            },
+        ),
+    ]
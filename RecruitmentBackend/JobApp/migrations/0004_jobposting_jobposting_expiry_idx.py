@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApp', '0003_jobskill'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['expiration_date', 'status'], name='jobposting_expiry_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApp', '0005_jobposting_jobposting_status_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['created_at'], name='jobposting_created_idx'),
+        ),
+    ]
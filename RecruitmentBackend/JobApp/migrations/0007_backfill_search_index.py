@@ -0,0 +1,44 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:10
+
+from django.db import migrations
+
+from JobApp.search import document_terms
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def backfill_search_index(apps, schema_editor):
+    """Đánh chỉ mục các tin đang hiển thị đã có trước khi có chỉ mục (như search.index_job)."""
+    JobPosting = apps.get_model('JobApp', 'JobPosting')
+    JobSearchDocument = apps.get_model('JobApp', 'JobSearchDocument')
+    JobSearchTerm = apps.get_model('JobApp', 'JobSearchTerm')
+
+    jobs = (
+        JobPosting.objects.filter(status='Approved', is_active=True, search_document__isnull=True)
+        .only('title', 'location', 'requirements', 'description')
+    )
+    documents, terms = [], []
+    for job in jobs.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        counts, length = document_terms(job)
+        documents.append(JobSearchDocument(job_id=job.pk, length=length))
+        terms.extend(
+            JobSearchTerm(term=term, job_id=job.pk, frequency=frequency, document_length=length)
+            for term, frequency in counts.items()
+        )
+        if len(documents) >= BACKFILL_BATCH_SIZE:
+            JobSearchDocument.objects.bulk_create(documents)
+            JobSearchTerm.objects.bulk_create(terms, batch_size=BACKFILL_BATCH_SIZE, ignore_conflicts=True)
+            documents, terms = [], []
+    JobSearchDocument.objects.bulk_create(documents)
+    JobSearchTerm.objects.bulk_create(terms, batch_size=BACKFILL_BATCH_SIZE, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApp', '0006_jobposting_jobposting_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
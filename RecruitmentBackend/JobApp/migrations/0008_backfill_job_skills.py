@@ -0,0 +1,43 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:25
+
+import math
+
+from django.db import migrations
+
+from JobApp.recommendations import bump_vectors_version, skill_weights
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def backfill_job_skills(apps, schema_editor):
+    """Trích vector kỹ năng cho các tin đã có trước khi có JobSkill (như recommendations.update_job_vector)."""
+    JobPosting = apps.get_model('JobApp', 'JobPosting')
+    JobSkill = apps.get_model('JobApp', 'JobSkill')
+
+    jobs = JobPosting.objects.filter(skill_vector__isnull=True).only('title', 'requirements', 'description')
+    vectors = []
+    for job in jobs.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        weights = skill_weights(job)
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        vectors.extend(
+            JobSkill(job_id=job.pk, skill_id=skill_id, weight=weight, norm=norm)
+            for skill_id, weight in weights.items()
+        )
+        if len(vectors) >= BACKFILL_BATCH_SIZE:
+            JobSkill.objects.bulk_create(vectors)
+            vectors = []
+    JobSkill.objects.bulk_create(vectors)
+    # Danh sách gợi ý đã cache được tính khi chưa có vector
+    bump_vectors_version()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApp', '0007_backfill_search_index'),
+        ('ResumeApp', '0003_jobseekerprofile_preferred_locations'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_job_skills, migrations.RunPython.noop),
+    ]
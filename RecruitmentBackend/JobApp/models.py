@@ -1,11 +1,16 @@
+import re
 import uuid
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
+from django.db.models.functions import Length
 from django.utils.text import slugify
 from django.utils import timezone
 from cloudinary.models import CloudinaryField
 from django.conf import settings
 
-class BaseModel(models.Model):
+from RecruitmentBackend.tracking import TrackedFieldsMixin
+
+class BaseModel(TrackedFieldsMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -49,6 +54,11 @@ class JobStatus(models.TextChoices):
     EXPIRED = 'Expired', 'Hết hạn'
 
 
+# Slug dài tối đa 255 ký tự, chừa chỗ cho hậu tố "-<n>"
+SLUG_BASE_MAX_LENGTH = 240
+SLUG_MAX_ATTEMPTS = 3
+
+
 class JobPosting(BaseModel):
     recruiter_profile = models.ForeignKey(
         RecruiterProfile,
@@ -70,8 +80,19 @@ class JobPosting(BaseModel):
     views_count = models.PositiveIntegerField(default=0)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
 
+    # Tiêu đề đổi thì tạo lại slug; trạng thái, nhà tuyển dụng đổi thì xử lý trong JobApp/signals.py
+    tracked_fields = ('title', 'status', 'recruiter_profile')
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Phục vụ việc quét tin hết hạn (expire_job_postings)
+            models.Index(fields=['expiration_date', 'status'], name='jobposting_expiry_idx'),
+            # Danh sách công khai: lọc theo trạng thái, phân trang keyset theo (created_at, id)
+            models.Index(fields=['status', 'created_at', 'id'], name='jobposting_status_created_idx'),
+            # Báo cáo theo khoảng ngày đăng (ReportApp/timeseries.py)
+            models.Index(fields=['created_at'], name='jobposting_created_idx'),
+        ]
         verbose_name = "Tin tuyển dụng"
         verbose_name_plural = "Các tin tuyển dụng"
 
@@ -79,25 +100,106 @@ class JobPosting(BaseModel):
         return f"{self.title} tại {self.recruiter_profile.company_name}"
 
     def save(self, *args, **kwargs):
-        # Tạo hoặc cập nhật slug khi tạo/sửa
-        if not self.slug or self._title_changed():
-            base_slug = slugify(self.title)
-            slug = base_slug
-            num = 1
-            while JobPosting.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{num}"
-                num += 1
-            self.slug = slug
+        update_fields = kwargs.get('update_fields')
+        # Tạo hoặc cập nhật slug khi tạo/sửa (bỏ qua nếu chỉ lưu các trường khác)
+        regenerate_slug = (update_fields is None or 'title' in update_fields) and (
+            not self.slug or self.has_changed('title')
+        )
+        if regenerate_slug:
+            self.slug = self._next_free_slug()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'slug'}
 
         # Tự động cập nhật trạng thái khi hết hạn
         if self.expiration_date and self.expiration_date < timezone.now().date():
             self.is_active = False
             self.status = JobStatus.EXPIRED
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'is_active', 'status'}
+
+        for attempt in range(SLUG_MAX_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                break
+            except IntegrityError:
+                # Tin khác vừa lấy cùng slug (tạo đồng thời): cấp slug mới và thử lại
+                if not regenerate_slug or attempt == SLUG_MAX_ATTEMPTS - 1:
+                    raise
+                self.slug = self._next_free_slug(random_suffix=attempt > 0)
+
+    def _next_free_slug(self, random_suffix=False):
+        """
+        Slug chưa dùng cho tiêu đề hiện tại, chỉ với một query:
+        lấy slug có hậu tố số lớn nhất trong họ "<base>", "<base>-<n>" rồi cộng thêm 1.
+        """
+        base_slug = slugify(self.title)[:SLUG_BASE_MAX_LENGTH] or 'job'
+        if random_suffix:
+            return f"{base_slug}-{uuid.uuid4().hex[:6]}"
+        last_slug = (
+            JobPosting.objects.filter(
+                Q(slug=base_slug) | Q(slug__startswith=f"{base_slug}-", slug__regex=rf"^{re.escape(base_slug)}-[0-9]+$")
+            )
+            .exclude(pk=self.pk)
+            .annotate(slug_length=Length('slug'))
+            .order_by('-slug_length', '-slug')
+            .values_list('slug', flat=True)
+            .first()
+        )
+        if last_slug is None:
+            return base_slug
+        if last_slug == base_slug:
+            return f"{base_slug}-1"
+        return f"{base_slug}-{int(last_slug.rsplit('-', 1)[1]) + 1}"
+
+
+class JobSearchDocument(models.Model):
+    """
+    Tài liệu trong chỉ mục tìm kiếm: một tin tuyển dụng đang hiển thị công khai.
+    """
+    job = models.OneToOneField(JobPosting, on_delete=models.CASCADE, primary_key=True,
+                               related_name='search_document')
+    length = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Tài liệu tìm kiếm"
+        verbose_name_plural = "Các tài liệu tìm kiếm"
+
+
+class JobSearchTerm(models.Model):
+    """
+    Chỉ mục ngược: từ (đã bỏ dấu) -> tin tuyển dụng chứa từ đó.
+    frequency là số lần xuất hiện đã nhân trọng số theo trường (tiêu đề nặng hơn mô tả).
+    """
+    term = models.CharField(max_length=64)
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='search_terms')
+    frequency = models.PositiveIntegerField(default=0)
+    # Lặp lại độ dài tài liệu để tính BM25 không cần join
+    document_length = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('term', 'job')
+        verbose_name = "Từ khóa tìm kiếm"
+        verbose_name_plural = "Các từ khóa tìm kiếm"
+
+    def __str__(self):
+        return f"{self.term} -> {self.job_id}"
 
-        super().save(*args, **kwargs)
 
-    def _title_changed(self):
-        if not self.pk:
-            return True
-        old_title = JobPosting.objects.filter(pk=self.pk).values_list('title', flat=True).first()
-        return old_title != self.title
+class JobSkill(models.Model):
+    """
+    Vector kỹ năng (thưa) của tin tuyển dụng, trích từ nội dung tin khi lưu.
+    norm là độ dài vector của cả tin, lặp lại trên mỗi dòng để tính cosine không cần join.
+    """
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='skill_vector')
+    skill = models.ForeignKey('ResumeApp.Skill', on_delete=models.CASCADE, related_name='job_vectors')
+    weight = models.FloatField(default=1.0)
+    norm = models.FloatField(default=1.0)
+
+    class Meta:
+        unique_together = ('skill', 'job')
+        verbose_name = "Kỹ năng của tin tuyển dụng"
+        verbose_name_plural = "Kỹ năng của các tin tuyển dụng"
+
+    def __str__(self):
+        return f"{self.job_id} - {self.skill_id} ({self.weight:.2f})"
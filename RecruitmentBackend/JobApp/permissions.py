@@ -1,4 +1,5 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
+from AuthApp.roles import get_role_context
 
 class IsAuthenticatedAndApproved(BasePermission):
     """
@@ -9,7 +10,7 @@ class IsAuthenticatedAndApproved(BasePermission):
         if not user or not user.is_authenticated:
             return False
         # Kiểm tra có ít nhất 1 role được phê duyệt
-        return user.user_roles.filter(is_approved=True).exists()
+        return bool(get_role_context(user).approved_roles)
 
 class HasActiveRole(BasePermission):
     """
@@ -21,12 +22,8 @@ class HasActiveRole(BasePermission):
         user = request.user
         if not user or not user.is_authenticated:
             return False
-        if not user.active_role:
-            return False
-        if user.active_role.name != self.required_role:
-            return False
-        # Kiểm tra role được phê duyệt
-        return user.user_roles.filter(role__name=self.required_role, is_approved=True).exists()
+        # Role đang active phải trùng role yêu cầu và đã được phê duyệt
+        return get_role_context(user).is_active(self.required_role)
 
 class IsAdmin(HasActiveRole):
     required_role = 'Admin'
@@ -49,7 +46,7 @@ class IsOwnerOrAdmin(BasePermission):
         if not user or not user.is_authenticated:
             return False
         # Admin đã phê duyệt
-        if user.active_role and user.active_role.name == 'Admin' and user.user_roles.filter(role__name='Admin', is_approved=True).exists():
+        if get_role_context(user).is_active('Admin'):
             return True
         obj_user = getattr(obj, self.user_field, None)
         return obj_user == user
@@ -63,6 +60,6 @@ class IsRecruiterOwnerOrAdmin(BasePermission):
         if not user or not user.is_authenticated:
             return False
         # Admin đã phê duyệt
-        if user.active_role and user.active_role.name == 'Admin' and user.user_roles.filter(role__name='Admin', is_approved=True).exists():
+        if get_role_context(user).is_active('Admin'):
             return True
-        return obj.recruiter_profile.user == user
+        return obj.recruiter_profile.user_id == user.pk
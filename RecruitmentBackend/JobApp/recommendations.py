@@ -0,0 +1,142 @@
+"""
+Gợi ý việc làm theo độ tương đồng cosine giữa kỹ năng của người tìm việc
+và vector kỹ năng của tin tuyển dụng (JobSkill).
+
+Danh sách gợi ý top-N của mỗi người được tính sẵn và cache:
+- hết hạn theo TTL,
+- bị xóa khi kỹ năng của người đó thay đổi,
+- tự tính lại khi phiên bản vector việc làm (tăng mỗi khi có tin thay đổi) khác với lúc cache.
+"""
+import math
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import ExpressionWrapper, F, FloatField, Max, Sum, Value
+
+from ApplicationApp.matching import invalidate_job_scores
+from ResumeApp.skills import count_skills
+from .models import JobPosting, JobSkill, JobStatus
+
+# Kỹ năng nhắc trong tiêu đề được tính nặng hơn
+TITLE_WEIGHT = 2
+
+VECTORS_VERSION_KEY = 'jobrec:version'
+
+
+def _config():
+    return getattr(settings, 'JOB_RECOMMENDATIONS', {})
+
+
+def skill_weights(job):
+    """{skill_id: trọng số} với trọng số = 1 + ln(số lần xuất hiện có trọng số)."""
+    counts = Counter()
+    for skill_id, count in count_skills(job.title).items():
+        counts[skill_id] += count * TITLE_WEIGHT
+    counts.update(count_skills(' '.join(filter(None, [job.requirements, job.description]))))
+    return {skill_id: 1 + math.log(count) for skill_id, count in counts.items()}
+
+
+def vectors_version():
+    return cache.get_or_set(VECTORS_VERSION_KEY, 1, None)
+
+
+def bump_vectors_version():
+    try:
+        cache.incr(VECTORS_VERSION_KEY)
+    except ValueError:
+        cache.set(VECTORS_VERSION_KEY, 2, None)
+
+
+@transaction.atomic
+def update_job_vector(job):
+    """Trích kỹ năng từ tin và lưu vector; không ghi gì nếu vector không đổi."""
+    weights = skill_weights(job)
+    current = dict(JobSkill.objects.filter(job_id=job.pk).values_list('skill_id', 'weight'))
+    if current.keys() == weights.keys() and all(
+        math.isclose(current[skill_id], weight) for skill_id, weight in weights.items()
+    ):
+        return False
+    norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+    JobSkill.objects.filter(job_id=job.pk).delete()
+    JobSkill.objects.bulk_create([
+        JobSkill(job_id=job.pk, skill_id=skill_id, weight=weight, norm=norm)
+        for skill_id, weight in weights.items()
+    ])
+    bump_vectors_version()
+    # Điểm phù hợp của ứng viên được tính theo vector này
+    invalidate_job_scores(job.pk)
+    return True
+
+
+def job_skill_ids(job):
+    return set(JobSkill.objects.filter(job_id=job.pk).values_list('skill_id', flat=True))
+
+
+def score_jobs(skill_ids, limit):
+    """
+    Top `limit` tin (đã duyệt, đang active) theo cosine với tập kỹ năng của người tìm việc.
+    Trả về list (job_id, score).
+    """
+    skill_ids = list(skill_ids)
+    if not skill_ids:
+        return []
+    seeker_norm = math.sqrt(len(skill_ids))
+    rows = (
+        JobSkill.objects.filter(
+            skill_id__in=skill_ids,
+            job__status=JobStatus.APPROVED,
+            job__is_active=True,
+        )
+        .values('job_id')
+        .annotate(score=ExpressionWrapper(
+            Sum('weight') / (Max('norm') * Value(seeker_norm)),
+            output_field=FloatField(),
+        ))
+        .order_by('-score', '-job__created_at')[:limit]
+    )
+    return [(row['job_id'], row['score']) for row in rows]
+
+
+def _latest_jobs(limit):
+    ids = (
+        JobPosting.objects.filter(status=JobStatus.APPROVED, is_active=True)
+        .order_by('-created_at')
+        .values_list('id', flat=True)[:limit]
+    )
+    return [(job_id, 0.0) for job_id in ids]
+
+
+def _cache_key(user_id):
+    return f'jobrec:user:{user_id}'
+
+
+def get_recommendations(profile):
+    """
+    Danh sách (job_id, score) đã xếp hạng cho hồ sơ, đọc từ cache nếu còn hiệu lực.
+    Hồ sơ chưa có kỹ năng thì trả về các tin mới nhất.
+    """
+    version = vectors_version()
+    key = _cache_key(profile.user_id)
+    cached = cache.get(key)
+    if cached and cached['version'] == version:
+        return cached['items']
+
+    limit = _config().get('TOP_N', 100)
+    skill_ids = list(profile.skills.values_list('id', flat=True))
+    items = score_jobs(skill_ids, limit) if skill_ids else _latest_jobs(limit)
+    cache.set(key, {'version': version, 'items': items}, _config().get('TTL', 600))
+    return items
+
+
+def invalidate_recommendations(user_id):
+    cache.delete(_cache_key(user_id))
+
+
+def rebuild_vectors(batch_size=500):
+    count = 0
+    for job in JobPosting.objects.iterator(chunk_size=batch_size):
+        update_job_vector(job)
+        count += 1
+    return count
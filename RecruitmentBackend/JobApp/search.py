@@ -0,0 +1,159 @@
+"""
+Tìm kiếm tin tuyển dụng bằng chỉ mục ngược và xếp hạng BM25.
+
+Chỉ mục chỉ chứa tin đã duyệt và đang active; được cập nhật khi lưu tin
+(JobApp/signals.py) và tự xóa theo khi xóa tin (CASCADE).
+"""
+import math
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Case, Count, ExpressionWrapper, F, FloatField, Sum, Value, When
+
+from .models import JobPosting, JobSearchDocument, JobSearchTerm, JobStatus
+from .text import tokenize
+
+# Trọng số theo trường: từ trong tiêu đề quan trọng hơn mô tả
+FIELD_WEIGHTS = {
+    'title': 3,
+    'location': 2,
+    'requirements': 1,
+    'description': 1,
+}
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 10
+
+# Tham số BM25
+K1 = 1.2
+B = 0.75
+
+STATS_CACHE_KEY = 'jobsearch:stats'
+STATS_TTL = 300
+
+
+def is_indexable(job):
+    return job.status == JobStatus.APPROVED and job.is_active
+
+
+def document_terms(job):
+    """Counter {từ: tần suất có trọng số} và độ dài tài liệu."""
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(getattr(job, field)):
+            terms[token[:MAX_TERM_LENGTH]] += weight
+    return terms, sum(terms.values())
+
+
+@transaction.atomic
+def index_job(job):
+    """Cập nhật chỉ mục cho một tin; tin không còn hiển thị sẽ bị gỡ khỏi chỉ mục."""
+    JobSearchTerm.objects.filter(job_id=job.pk).delete()
+    if not is_indexable(job):
+        JobSearchDocument.objects.filter(job_id=job.pk).delete()
+        return
+    terms, length = document_terms(job)
+    JobSearchDocument.objects.update_or_create(job_id=job.pk, defaults={'length': length})
+    JobSearchTerm.objects.bulk_create([
+        JobSearchTerm(term=term, job_id=job.pk, frequency=frequency, document_length=length)
+        for term, frequency in terms.items()
+    ])
+
+
+def remove_jobs(job_ids):
+    """Gỡ nhiều tin khỏi chỉ mục (dùng khi cập nhật hàng loạt bằng update())."""
+    JobSearchTerm.objects.filter(job_id__in=job_ids).delete()
+    JobSearchDocument.objects.filter(job_id__in=job_ids).delete()
+
+
+def index_new_jobs(jobs, batch_size=500):
+    """
+    Đánh chỉ mục hàng loạt các tin chưa có trong chỉ mục (bulk_create theo lô, không xóa trước).
+    Trả về số tin đã được đánh chỉ mục.
+    """
+    count, documents, terms = 0, [], []
+    for job in jobs:
+        counts, length = document_terms(job)
+        documents.append(JobSearchDocument(job_id=job.pk, length=length))
+        terms.extend(
+            JobSearchTerm(term=term, job_id=job.pk, frequency=frequency, document_length=length)
+            for term, frequency in counts.items()
+        )
+        if len(documents) >= batch_size:
+            count += _insert_documents(documents, terms, batch_size)
+            documents, terms = [], []
+    count += _insert_documents(documents, terms, batch_size)
+    cache.delete(STATS_CACHE_KEY)
+    return count
+
+
+@transaction.atomic
+def _insert_documents(documents, terms, batch_size):
+    JobSearchDocument.objects.bulk_create(documents)
+    JobSearchTerm.objects.bulk_create(terms, batch_size=batch_size)
+    return len(documents)
+
+
+def rebuild_index(batch_size=500):
+    """Dựng lại toàn bộ chỉ mục. Trả về số tin đã được đánh chỉ mục."""
+    JobSearchTerm.objects.all().delete()
+    JobSearchDocument.objects.all().delete()
+    jobs = JobPosting.objects.filter(status=JobStatus.APPROVED, is_active=True).only(*FIELD_WEIGHTS)
+    return index_new_jobs(jobs.iterator(chunk_size=batch_size), batch_size=batch_size)
+
+
+def _collection_stats():
+    stats = JobSearchDocument.objects.aggregate(total=Count('job'), avg_length=Avg('length'))
+    return {'total': stats['total'] or 0, 'avg_length': stats['avg_length'] or 1.0}
+
+
+def collection_stats():
+    """Số tài liệu và độ dài trung bình; cho phép lệch vài phút nên được cache."""
+    return cache.get_or_set(STATS_CACHE_KEY, _collection_stats, STATS_TTL)
+
+
+def query_terms(query):
+    terms = []
+    for token in tokenize(query):
+        token = token[:MAX_TERM_LENGTH]
+        if token not in terms:
+            terms.append(token)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def search(query):
+    """
+    Queryset các dict {'job_id', 'score'} sắp theo điểm BM25 giảm dần.
+    Việc tính điểm chạy trong DB, chỉ đọc các dòng chỉ mục của từ trong truy vấn.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return JobSearchTerm.objects.none().values('job_id')
+
+    stats = collection_stats()
+    total = max(stats['total'], 1)
+    document_frequencies = dict(
+        JobSearchTerm.objects.filter(term__in=terms)
+        .values_list('term')
+        .annotate(df=Count('id'))
+    )
+    idf = Case(
+        *[
+            When(term=term, then=Value(math.log(1 + (total - df + 0.5) / (df + 0.5))))
+            for term, df in document_frequencies.items()
+        ],
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    term_score = ExpressionWrapper(
+        idf * F('frequency') * Value(K1 + 1) / (
+            F('frequency') + Value(K1 * (1 - B)) + Value(K1 * B / stats['avg_length']) * F('document_length')
+        ),
+        output_field=FloatField(),
+    )
+    return (
+        JobSearchTerm.objects.filter(term__in=terms)
+        .values('job_id')
+        .annotate(score=Sum(term_score))
+        .order_by('-score', 'job_id')
+    )
@@ -1,10 +1,14 @@
 from rest_framework import serializers
+from RecruitmentBackend.query_plan import QueryPlan
+from .counters import view_counter
 from .models import RecruiterProfile, JobPosting, JobType, JobStatus
 
 class RecruiterProfileSerializer(serializers.ModelSerializer):
     # Hiển thị username của user gán recruiter (read-only)
     user = serializers.StringRelatedField(read_only=True)
 
+    query_plan = QueryPlan(select_related=['user'])
+
     class Meta:
         model = RecruiterProfile
         fields = [
@@ -44,6 +48,12 @@ class JobPostingSerializer(serializers.ModelSerializer):
             'views_count', 'slug', 'created_at', 'updated_at'
         ]
 
+    def to_representation(self, instance):
+        rep = super().to_representation(instance)
+        # Cộng các lượt xem còn trong bộ đệm chưa ghi xuống DB
+        rep['views_count'] += view_counter.pending(instance.pk)
+        return rep
+
     def create(self, validated_data):
         recruiter_profile_id = validated_data.pop('recruiter_profile_id', None)
         if recruiter_profile_id:
@@ -66,8 +76,13 @@ class JobStatusSerializer(serializers.Serializer):
 
 
 class JobPostingRecommendSerializer(serializers.ModelSerializer):
+    # Độ phù hợp (cosine) với kỹ năng của người tìm việc, gán sẵn trên instance
+    score = serializers.FloatField(read_only=True, default=0.0)
+
+    query_plan = QueryPlan(only=['id', 'title', 'location', 'salary_min', 'salary_max', 'job_type', 'slug'])
+
     class Meta:
         model = JobPosting
         fields = [
-            'id', 'title', 'location', 'salary_min', 'salary_max', 'job_type', 'slug'
+            'id', 'title', 'location', 'salary_min', 'salary_max', 'job_type', 'slug', 'score'
         ]
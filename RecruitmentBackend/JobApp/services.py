@@ -0,0 +1,56 @@
+import logging
+import time
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from NotificationApp.services import create_notifications_for_expired_jobs
+from .models import JobPosting, JobStatus
+from .recommendations import bump_vectors_version
+from .search import remove_jobs
+
+logger = logging.getLogger(__name__)
+
+
+def expire_overdue_postings(batch_size=1000):
+    """
+    Chuyển các tin quá hạn (expiration_date < hôm nay) sang Expired theo từng lô.
+    Mỗi lô: khóa các dòng (bỏ qua dòng đang bị tiến trình khác khóa), một câu UPDATE,
+    một lần gửi thông báo hàng loạt cho nhà tuyển dụng.
+    Trả về dict: số tin đã cập nhật, số lô, thời gian chạy.
+    """
+    started = time.monotonic()
+    today = timezone.now().date()
+    expired = 0
+    batches = 0
+
+    while True:
+        with transaction.atomic():
+            rows = list(
+                JobPosting.objects.select_for_update(skip_locked=True, of=('self',))
+                .filter(expiration_date__lt=today)
+                .exclude(status=JobStatus.EXPIRED)
+                .order_by()
+                .values('id', 'title', 'slug', recruiter_user_id=F('recruiter_profile__user_id'))[:batch_size]
+            )
+            if not rows:
+                break
+            job_ids = [row['id'] for row in rows]
+            updated = JobPosting.objects.filter(pk__in=job_ids).update(
+                status=JobStatus.EXPIRED,
+                is_active=False,
+                updated_at=timezone.now(),
+            )
+            remove_jobs(job_ids)
+            create_notifications_for_expired_jobs(rows)
+        expired += updated
+        batches += 1
+        if len(rows) < batch_size:
+            break
+
+    if expired:
+        bump_vectors_version()
+    seconds = time.monotonic() - started
+    logger.info('Đã chuyển %d tin sang hết hạn trong %d lô, %.3fs', expired, batches, seconds)
+    return {'expired': expired, 'batches': batches, 'seconds': seconds}
@@ -1,27 +1,61 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.apps import apps
 from NotificationApp.services import (
     create_notification_for_new_job,
     create_notification_for_job_status_change,
 )
+from ReportApp import activity, rollups
+
+from .recommendations import bump_vectors_version, invalidate_recommendations, update_job_vector
+from .search import index_job
 
 JobPosting = apps.get_model('JobApp', 'JobPosting')
+Application = apps.get_model('ApplicationApp', 'Application')
+JobSeekerProfile = apps.get_model('ResumeApp', 'JobSeekerProfile')
 
 @receiver(post_save, sender=JobPosting)
 def job_posting_created(sender, instance, created, **kwargs):
+    # Cập nhật chỉ mục tìm kiếm (tin không còn hiển thị sẽ bị gỡ khỏi chỉ mục)
+    index_job(instance)
+    # Trích vector kỹ năng trước khi gửi thông báo tin mới (fan-out dùng vector này)
+    update_job_vector(instance)
+    if not created and instance.has_changed('recruiter_profile'):
+        # Giữ cột sao chép Application.recruiter_profile khớp với tin
+        Application.objects.filter(job_posting=instance).update(recruiter_profile_id=instance.recruiter_profile_id)
     if created:
+        rollups.job_created(instance)
+        activity.record('Đăng tin tuyển dụng', instance.title, owner_id=_recruiter_user_id(instance))
         # Việc làm mới được tạo
         create_notification_for_new_job(instance)
+    elif instance.has_changed('status'):
+        previous = instance.original_value('status')
+        # Tin được duyệt/hết hạn làm thay đổi tập tin được gợi ý
+        bump_vectors_version()
+        # Thông báo đi qua outbox, ghi cùng transaction với thay đổi trạng thái
+        create_notification_for_job_status_change(instance, previous, instance.status)
+        activity.record(f'Đổi trạng thái tin: {previous} → {instance.status}', instance.title)
+
+@receiver(pre_delete, sender=JobPosting)
+def job_posting_deleting(sender, instance, **kwargs):
+    rollups.job_deleting(instance)
+
+@receiver(post_delete, sender=JobPosting)
+def job_posting_deleted(sender, instance, **kwargs):
+    rollups.job_deleted(instance)
+    activity.record('Xóa tin tuyển dụng', instance.title)
+
+def _recruiter_user_id(job):
+    if job.recruiter_profile_id is None:
+        return None
+    return job.recruiter_profile.user_id
 
-@receiver(pre_save, sender=JobPosting)
-def job_posting_status_changed(sender, instance, **kwargs):
-    if not instance.pk:
-        return  # Bản ghi mới, chưa có pk
-    try:
-        old_instance = JobPosting.objects.get(pk=instance.pk)
-    except JobPosting.DoesNotExist:
+@receiver(m2m_changed, sender=JobSeekerProfile.skills.through)
+def job_seeker_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
         return
-    if old_instance.status != instance.status:
-        # Trạng thái đã thay đổi
-        create_notification_for_job_status_change(instance, old_instance.status, instance.status)
+    if not reverse:
+        invalidate_recommendations(instance.user_id)
+    elif pk_set:
+        for user_id in JobSeekerProfile.objects.filter(pk__in=pk_set).values_list('user_id', flat=True):
+            invalidate_recommendations(user_id)
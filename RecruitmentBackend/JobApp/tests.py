@@ -1,3 +1,176 @@
-from django.test import TestCase
+import base64
+import json
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from AuthApp.models import Role, UserRole
+from .counters import ViewCounter
+from .models import JobPosting, JobStatus, RecruiterProfile
+
+
+def create_user(username, role_name=None):
+    user = get_user_model().objects.create_user(username=username, email=f'{username}@example.com')
+    if role_name:
+        role, _ = Role.objects.get_or_create(name=role_name)
+        UserRole.objects.create(user=user, role=role, is_approved=True)
+        user.active_role = role
+        user.save()
+    return user
+
+
+def create_job(username='recruiter', **fields):
+    user = create_user(username, Role.RECRUITER)
+    recruiter = RecruiterProfile.objects.create(user=user, company_name='Công ty A')
+    fields.setdefault('status', JobStatus.APPROVED)
+    return JobPosting.objects.create(recruiter_profile=recruiter, title='Backend Developer',
+                                     description='Python, Django', location='Hà Nội', **fields)
+
+
+class ViewCounterConcurrencyTests(TransactionTestCase):
+    THREADS = 8
+    VIEWS_PER_THREAD = 250
+
+    @override_settings(JOB_VIEW_COUNTER={'FLUSH_INTERVAL': 60, 'FLUSH_THRESHOLD': 50})
+    def test_concurrent_increments_are_not_lost(self):
+        job = create_job()
+        counter = ViewCounter()
+        returned = []
+
+        def view():
+            try:
+                for _ in range(self.VIEWS_PER_THREAD):
+                    returned.append(counter.increment(job.pk))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=view) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.flush()
+
+        job.refresh_from_db()
+        self.assertEqual(job.views_count, self.THREADS * self.VIEWS_PER_THREAD)
+        self.assertEqual(counter.pending(job.pk), 0)
+        # Lượt xem vừa cộng luôn nằm trong số được trả về, kể cả khi bộ đệm được ghi ngay
+        self.assertTrue(all(value >= 1 for value in returned))
+
+
+class ViewCounterTests(TestCase):
+    def setUp(self):
+        self.job = create_job()
+        self.counter = ViewCounter()
+
+    @override_settings(JOB_VIEW_COUNTER={'FLUSH_INTERVAL': 0})
+    def test_inline_flush_returns_views_just_added(self):
+        self.assertEqual(self.counter.increment(self.job.pk), 1)
+        self.assertEqual(self.counter.increment(self.job.pk, 3), 3)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.views_count, 4)
+
+    @override_settings(JOB_VIEW_COUNTER={'FLUSH_INTERVAL': 0})
+    def test_failed_inline_flush_keeps_views_buffered(self):
+        with mock.patch('JobApp.counters.JobPosting.objects.filter', side_effect=DatabaseError), \
+                self.assertLogs('JobApp.counters', 'ERROR'):
+            self.assertEqual(self.counter.increment(self.job.pk), 1)
+        self.assertEqual(self.counter.pending(self.job.pk), 1)
+
+        self.assertEqual(self.counter.increment(self.job.pk), 2)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.views_count, 2)
+
+    @override_settings(JOB_VIEW_COUNTER={'FLUSH_INTERVAL': 0})
+    def test_increment_view_response_includes_new_view(self):
+        with mock.patch('JobApp.views.view_counter', self.counter):
+            response = self.client.post(f'/jobs/{self.job.slug}/increment_view/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'views_count': 1})
+
+
+class QueryPlanTests(TestCase):
+    """Số query của các endpoint dùng QueryPlanMixin không tăng theo số tin (không N+1)."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.jobs = [create_job(f'recruiter{i}') for i in range(3)]
+
+    def add_jobs(self, count=5, **fields):
+        # Mỗi tin của một nhà tuyển dụng khác nhau: serializer lồng recruiter_profile và user
+        return [create_job(f'more{i}', **fields) for i in range(count)]
+
+    def assertConstantQueries(self, num, url, **params):
+        self.client.get(url, params)  # nạp sẵn cache vai trò
+        with self.assertNumQueries(num):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.add_jobs()
+        with self.assertNumQueries(num):
+            self.client.get(url, params)
+        return response
+
+    def test_job_list(self):
+        self.assertConstantQueries(1, '/jobs/')
+
+    def test_job_list_page_number(self):
+        self.assertConstantQueries(2, '/jobs/', ordering='-views_count')
+
+    def test_job_retrieve(self):
+        self.client.get(f'/jobs/{self.jobs[0].slug}/')
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/jobs/{self.jobs[0].slug}/')
+        self.assertEqual(response.json()['recruiter_profile']['user'], 'recruiter0')
+
+    def test_job_search(self):
+        self.assertConstantQueries(4, '/jobs/search/', q='backend developer')
+
+    def test_recruiter_list(self):
+        self.client.force_authenticate(create_user('admin', Role.ADMIN))
+        self.assertConstantQueries(2, '/recruiters/')
+
+    def test_recruiter_jobs(self):
+        recruiter = self.jobs[0].recruiter_profile
+        self.client.force_authenticate(recruiter.user)
+        for i in range(3):
+            JobPosting.objects.create(recruiter_profile=recruiter, title=f'Tester {i}', description='QA',
+                                      location='Hà Nội', status=JobStatus.APPROVED)
+        self.client.get(f'/recruiters/{recruiter.pk}/jobs/')
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/recruiters/{recruiter.pk}/jobs/')
+        self.assertEqual(response.json()['count'], 4)
+
+    def test_admin_pending_jobs(self):
+        self.client.force_authenticate(create_user('admin', Role.ADMIN))
+        self.add_jobs(2, status=JobStatus.PENDING)
+        self.client.get('/api/admin/jobs/pending/')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/admin/jobs/pending/')
+        self.assertEqual(len(response.json()), 2)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.jobs = [create_job(f'recruiter{i}') for i in range(12)]
+
+    def cursor(self, payload):
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def test_next_page_follows_cursor(self):
+        first = self.client.get('/jobs/').json()
+        second = self.client.get(first['next']).json()
+        self.assertEqual(len(first['results']) + len(second['results']), 12)
+        self.assertIsNone(second['next'])
+
+    def test_forged_cursor_returns_not_found(self):
+        created_at = self.jobs[0].created_at.isoformat()
+        for cursor in ['not-base64!', self.cursor({'v': created_at, 'pk': 'x'}),
+                       self.cursor({'v': created_at, 'pk': [1]}), self.cursor({'v': 'yesterday', 'pk': 'x'})]:
+            response = self.client.get('/jobs/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 404, cursor)
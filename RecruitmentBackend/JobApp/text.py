@@ -0,0 +1,33 @@
+"""
+Chuẩn hóa văn bản tiếng Việt: bỏ dấu, tách từ, ghép cụm từ.
+"""
+import re
+import unicodedata
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*')
+
+
+def fold_text(text):
+    """Chuyển về chữ thường và bỏ dấu tiếng Việt ("Hồ Chí Minh" -> "ho chi minh")."""
+    if not text:
+        return ''
+    text = text.lower().replace('đ', 'd')
+    decomposed = unicodedata.normalize('NFD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text):
+    """Tách văn bản đã bỏ dấu thành danh sách từ, giữ các từ như c++, c#, node.js."""
+    return TOKEN_RE.findall(fold_text(text))
+
+
+def normalize_phrase(text):
+    """Khóa so khớp của một cụm từ: các từ đã bỏ dấu nối bằng dấu cách."""
+    return ' '.join(tokenize(text))
+
+
+def phrases(tokens, max_length):
+    """Sinh mọi cụm từ liên tiếp dài tối đa max_length từ (n-gram)."""
+    for size in range(1, max_length + 1):
+        for start in range(len(tokens) - size + 1):
+            yield ' '.join(tokens[start:start + size])
@@ -2,9 +2,14 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
+from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
+from RecruitmentBackend.pagination import KeysetPagination
+from RecruitmentBackend.query_plan import QueryPlanMixin, optimize_queryset
+from .counters import view_counter
 from .models import RecruiterProfile, JobPosting
+from .search import search as search_jobs
 from .serializers import (
     RecruiterProfileSerializer,
     JobPostingSerializer,
@@ -22,7 +27,7 @@ from .permissions import (
 )
 
 
-class RecruiterProfileViewSet(viewsets.ModelViewSet):
+class RecruiterProfileViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     queryset = RecruiterProfile.objects.all()
     serializer_class = RecruiterProfileSerializer
 
@@ -41,7 +46,7 @@ class RecruiterProfileViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class JobPostingViewSet(viewsets.ModelViewSet):
+class JobPostingViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     queryset = JobPosting.objects.all()
     serializer_class = JobPostingSerializer
     lookup_field = 'slug'  # Sử dụng slug thay cho id
@@ -50,9 +55,10 @@ class JobPostingViewSet(viewsets.ModelViewSet):
     search_fields = ['title', 'description', 'requirements', 'location']
     ordering_fields = ['created_at', 'salary_min', 'views_count']
     ordering = ['-created_at']
+    pagination_class = KeysetPagination
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve", "increment_view"]:
+        if self.action in ["list", "retrieve", "increment_view", "search"]:
             permission_classes = [AllowAny]
         elif self.action == "recommend":
             permission_classes = [IsJobSeeker]
@@ -97,10 +103,37 @@ class JobPostingViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'], permission_classes=[AllowAny])
     def increment_view(self, request, slug=None):
-        job = self.get_object()
-        job.views_count += 1
-        job.save()
-        return Response({"views_count": job.views_count})
+        # Chỉ đọc pk và số lượt xem, lượt xem mới được ghi trễ theo lô (JobApp/counters.py)
+        row = self.get_queryset().filter(slug=slug).values_list('pk', 'views_count').first()
+        if row is None:
+            return Response({"detail": "Tin tuyển dụng không tồn tại."}, status=status.HTTP_404_NOT_FOUND)
+        job_id, views_count = row
+        pending = view_counter.increment(job_id)
+        return Response({"views_count": views_count + pending})
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Tìm kiếm toàn văn trên tin đã duyệt: /jobs/search/?q=...
+        Kết quả xếp theo điểm BM25 từ chỉ mục ngược (JobApp/search.py).
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"detail": "Cần cung cấp tham số q."}, status=status.HTTP_400_BAD_REQUEST)
+        ranked = search_jobs(query)
+        # Kết quả xếp theo điểm nên phân trang theo số trang, không dùng keyset
+        paginator = PageNumberPagination()
+        rows = paginator.paginate_queryset(ranked, request, view=self)
+        jobs = optimize_queryset(JobPosting.objects.all(), JobPostingSerializer).in_bulk([row['job_id'] for row in rows])
+        results = []
+        for row in rows:
+            job = jobs.get(row['job_id'])
+            if job is None:
+                continue
+            data = self.get_serializer(job).data
+            data['score'] = row['score']
+            results.append(data)
+        return paginator.get_paginated_response(results)
 
     @action(detail=True, methods=['post'])
     def submit_for_approval(self, request, slug=None):
@@ -110,7 +143,7 @@ class JobPostingViewSet(viewsets.ModelViewSet):
         if job.status != "Draft":
             return Response({"detail": "Chỉ có thể gửi duyệt từ trạng thái bản nháp."}, status=status.HTTP_400_BAD_REQUEST)
         job.status = "Pending"
-        job.save()
+        job.save_changed()
         return Response({"detail": "Đã gửi yêu cầu duyệt tin tuyển dụng."})
 
 
@@ -118,7 +151,7 @@ class AdminJobApprovalViewSet(viewsets.ViewSet):
     permission_classes = [IsAdmin]
 
     def list(self, request):
-        jobs = JobPosting.objects.filter(status="Pending")
+        jobs = optimize_queryset(JobPosting.objects.filter(status="Pending"), JobPostingSerializer)
         serializer = JobPostingSerializer(jobs, many=True)
         return Response(serializer.data)
 
@@ -130,7 +163,7 @@ class AdminJobApprovalViewSet(viewsets.ViewSet):
             return Response({"detail": "Tin tuyển dụng không tồn tại hoặc không ở trạng thái chờ duyệt."},
                             status=status.HTTP_404_NOT_FOUND)
         job.status = "Approved"
-        job.save()
+        job.save_changed()
         return Response({"detail": "Tin tuyển dụng đã được duyệt."})
 
     @action(detail=True, methods=['post'], url_path='reject')
@@ -141,11 +174,11 @@ class AdminJobApprovalViewSet(viewsets.ViewSet):
             return Response({"detail": "Tin tuyển dụng không tồn tại hoặc không ở trạng thái chờ duyệt."},
                             status=status.HTTP_404_NOT_FOUND)
         job.status = "Rejected"
-        job.save()
+        job.save_changed()
         return Response({"detail": "Tin tuyển dụng đã bị từ chối."})
 
 
-class RecruiterJobsViewSet(viewsets.ReadOnlyModelViewSet):
+class RecruiterJobsViewSet(QueryPlanMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = JobPostingSerializer
     permission_classes = [IsOwnerOrAdmin]
 
@@ -154,9 +187,11 @@ class RecruiterJobsViewSet(viewsets.ReadOnlyModelViewSet):
         return JobPosting.objects.filter(recruiter_profile__id=recruiter_id)
 
 
+from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from .models import JobType, JobStatus
+from .recommendations import get_recommendations
 from .serializers import JobTypeSerializer, JobStatusSerializer, JobPostingRecommendSerializer
 from django.db.models import Q
 
@@ -188,14 +223,17 @@ class JobRecommendAPIView(APIView):
         if not jobseeker_profile:
             return Response({"detail": "Bạn chưa có hồ sơ người tìm việc."}, status=status.HTTP_400_BAD_REQUEST)
 
-        skills = [skill.name.lower() for skill in jobseeker_profile.skills.all()]
-        filters = Q(is_active=True, status="Approved")
-        if skills:
-            skill_filters = Q()
-            for skill in skills:
-                skill_filters |= Q(description__icontains=skill) | Q(requirements__icontains=skill)
-            filters &= skill_filters
-
-        recommended_jobs = JobPosting.objects.filter(filters).order_by('-created_at')[:10]
+        # Danh sách đã xếp hạng được tính sẵn và cache theo từng người (JobApp/recommendations.py)
+        # Trả về danh sách (không phân trang) như trước, chỉ gồm các tin đầu bảng xếp hạng
+        ranked = get_recommendations(jobseeker_profile)[:settings.JOB_RECOMMENDATIONS.get('RESPONSE_SIZE', 10)]
+        jobs = optimize_queryset(JobPosting.objects.all(), JobPostingRecommendSerializer).in_bulk(
+            [job_id for job_id, _ in ranked]
+        )
+        recommended_jobs = []
+        for job_id, score in ranked:
+            job = jobs.get(job_id)
+            if job is not None:
+                job.score = score
+                recommended_jobs.append(job)
         serializer = JobPostingRecommendSerializer(recommended_jobs, many=True)
         return Response(serializer.data)
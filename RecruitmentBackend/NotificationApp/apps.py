@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class NotificationappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'NotificationApp'
+
+    def ready(self):
+        import NotificationApp.signals
+        # Đăng ký handler của outbox
+        import NotificationApp.services
@@ -0,0 +1,84 @@
+"""
+Gửi thông báo hàng loạt (fan-out) bằng bulk_create theo từng lô.
+
+Cấu hình qua settings.NOTIFICATION_FANOUT:
+- BATCH_SIZE: số thông báo ghi trong mỗi lô.
+"""
+import logging
+import time
+from itertools import islice
+
+from django.conf import settings
+
+from ReportApp.cache import bump_table_version
+
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _batch_size():
+    return getattr(settings, 'NOTIFICATION_FANOUT', {}).get('BATCH_SIZE', DEFAULT_BATCH_SIZE)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def fan_out(recipient_ids, build_notification, label='fan-out', batch_size=None, on_batch=None):
+    """
+    Tạo thông báo cho từng recipient_id, ghi theo lô.
+
+    recipient_ids: iterable các user id (nên là queryset .values_list(...).iterator()).
+    build_notification: hàm nhận user id, trả về Notification chưa lưu.
+    on_batch: callback nhận dict tiến độ sau mỗi lô.
+    Trả về dict thống kê tổng: số lô, số thông báo, thời gian, thông lượng.
+    """
+    batch_size = batch_size or _batch_size()
+    started = time.monotonic()
+    created = 0
+    batches = 0
+
+    for chunk in _chunks(recipient_ids, batch_size):
+        batch_started = time.monotonic()
+        Notification.objects.bulk_create(
+            [build_notification(user_id) for user_id in chunk],
+            batch_size=batch_size,
+        )
+        batches += 1
+        created += len(chunk)
+        batch_seconds = time.monotonic() - batch_started
+        progress = {
+            'label': label,
+            'batch': batches,
+            'batch_size': len(chunk),
+            'created': created,
+            'batch_seconds': batch_seconds,
+            'rows_per_second': len(chunk) / batch_seconds if batch_seconds else None,
+        }
+        logger.info(
+            '[%s] lô %d: %d thông báo trong %.3fs (tổng %d)',
+            label, batches, len(chunk), batch_seconds, created,
+        )
+        if on_batch:
+            on_batch(progress)
+
+    if created:
+        bump_table_version(Notification)
+    seconds = time.monotonic() - started
+    stats = {
+        'label': label,
+        'batches': batches,
+        'created': created,
+        'seconds': seconds,
+        'rows_per_second': created / seconds if seconds else None,
+    }
+    logger.info('[%s] hoàn tất: %d thông báo, %d lô, %.3fs', label, created, batches, seconds)
+    return stats
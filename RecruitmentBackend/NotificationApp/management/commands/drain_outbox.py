@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from NotificationApp.outbox import drain_outbox, purge_outbox
+
+
+class Command(BaseCommand):
+    help = 'Gửi các thông báo đang chờ trong outbox (chạy định kỳ hoặc liên tục với --interval).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Số sự kiện mỗi lô.')
+        parser.add_argument('--interval', type=float, default=0,
+                            help='Chạy liên tục, nghỉ số giây này giữa các lượt (0 = chạy một lượt).')
+        parser.add_argument('--purge', action='store_true',
+                            help='Xóa sự kiện đã xử lý cũ hơn NOTIFICATION_OUTBOX["RETENTION_DAYS"].')
+
+    def handle(self, *args, **options):
+        while True:
+            stats = drain_outbox(options['batch_size'])
+            if stats['events'] or stats['failed'] or not options['interval']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Đã xử lý {stats['events']} sự kiện, tạo {stats['notifications']} thông báo, "
+                    f"{stats['failed']} sự kiện lỗi."
+                ))
+            if options['purge']:
+                self.stdout.write(f'Đã xóa {purge_outbox()} sự kiện cũ.')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from ResumeApp.models import JobSeekerProfile
+from NotificationApp.models import JobSubscription
+from NotificationApp.subscriptions import rebuild_profile_subscriptions
+
+
+class Command(BaseCommand):
+    help = 'Dựng lại chỉ mục đăng ký nhận tin (kỹ năng, địa điểm) từ hồ sơ người tìm việc.'
+
+    def handle(self, *args, **options):
+        JobSubscription.objects.all().delete()
+        count = 0
+        for profile in JobSeekerProfile.objects.iterator(chunk_size=1000):
+            rebuild_profile_subscriptions(profile)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Đã dựng lại chỉ mục cho {count} hồ sơ.'))
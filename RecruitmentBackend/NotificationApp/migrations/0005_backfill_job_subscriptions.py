@@ -0,0 +1,46 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:02
+
+from django.db import migrations
+
+from JobApp.text import normalize_phrase
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_job_subscriptions(apps, schema_editor):
+    """Dựng chỉ mục đăng ký nhận tin từ kỹ năng và địa điểm mong muốn của các hồ sơ đã có."""
+    JobSeekerProfile = apps.get_model('ResumeApp', 'JobSeekerProfile')
+    JobSubscription = apps.get_model('NotificationApp', 'JobSubscription')
+    ProfileSkill = JobSeekerProfile.skills.through
+
+    rows = ProfileSkill.objects.values_list('jobseekerprofile__user_id', 'skill_id').order_by()
+    batch = []
+    for user_id, skill_id in rows.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        batch.append(JobSubscription(user_id=user_id, skill_id=skill_id))
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            JobSubscription.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+
+    profiles = JobSeekerProfile.objects.exclude(preferred_locations__isnull=True).exclude(preferred_locations='')
+    for user_id, preferred_locations in profiles.values_list('user_id', 'preferred_locations').iterator(
+            chunk_size=BACKFILL_BATCH_SIZE):
+        # Cùng cách tách như JobSeekerProfile.get_preferred_locations
+        locations = {normalize_phrase(loc) for loc in preferred_locations.split(',')}
+        locations.discard('')
+        batch.extend(JobSubscription(user_id=user_id, location=loc) for loc in locations)
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            JobSubscription.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    JobSubscription.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('NotificationApp', '0004_outboxevent'),
+        ('ResumeApp', '0003_jobseekerprofile_preferred_locations'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_job_subscriptions, migrations.RunPython.noop),
+    ]
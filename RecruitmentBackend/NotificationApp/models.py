@@ -1,6 +1,7 @@
 import uuid
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 
 class Notification(models.Model):
@@ -29,5 +30,56 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Hộp thư: lọc theo người nhận, phân trang keyset theo (created_at, id)
+            models.Index(fields=['recipient', 'created_at', 'id'], name='notification_inbox_idx'),
+        ]
         verbose_name = "Thông báo"
         verbose_name_plural = "Các thông báo"
+
+
+class JobSubscription(models.Model):
+    """
+    Chỉ mục đăng ký nhận tin việc làm mới của người tìm việc.
+    Mỗi dòng là một kỹ năng (skill) hoặc một địa điểm mong muốn (location, đã bỏ dấu).
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='job_subscriptions')
+    skill = models.ForeignKey('ResumeApp.Skill', on_delete=models.CASCADE, null=True, blank=True,
+                              related_name='subscriptions')
+    location = models.CharField(max_length=100, null=True, blank=True)
+
+    class Meta:
+        unique_together = [('skill', 'user'), ('location', 'user')]
+        verbose_name = "Đăng ký nhận tin"
+        verbose_name_plural = "Các đăng ký nhận tin"
+
+    def __str__(self):
+        return f"{self.user_id} - {self.skill_id or self.location}"
+
+
+class OutboxEvent(models.Model):
+    """
+    Sự kiện chờ gửi thông báo (transactional outbox), ghi cùng transaction với thay đổi gốc.
+    NotificationApp/outbox.py đọc theo lô, gộp sự kiện trùng và tạo Notification hàng loạt.
+    """
+    id = models.BigAutoField(primary_key=True)
+    event_type = models.CharField(max_length=50)
+    # Khóa đối tượng phát sinh sự kiện (dùng để gộp sự kiện trùng)
+    aggregate_id = models.CharField(max_length=64)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            # Lấy sự kiện chưa xử lý theo thứ tự ghi; dọn sự kiện đã xử lý
+            models.Index(fields=['processed_at', 'id'], name='outbox_pending_idx'),
+        ]
+        verbose_name = "Sự kiện chờ gửi"
+        verbose_name_plural = "Các sự kiện chờ gửi"
+
+    def __str__(self):
+        return f"{self.event_type} {self.aggregate_id}"
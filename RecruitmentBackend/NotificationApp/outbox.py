@@ -0,0 +1,155 @@
+"""
+Transactional outbox cho thông báo.
+
+Signals chỉ ghi một dòng OutboxEvent (publish) trong cùng transaction với thay đổi trạng thái,
+nên thay đổi bị rollback thì không có thông báo. Sau khi commit, worker nền
+(RecruitmentBackend/background.py) rút outbox theo lô; lệnh drain_outbox làm việc tương tự
+khi chạy định kỳ (phòng trường hợp tiến trình dừng trước khi worker chạy).
+
+Mỗi lô: sự kiện cùng loại và cùng đối tượng được gộp (giữ trạng thái cũ của sự kiện đầu,
+trạng thái mới của sự kiện cuối; đổi qua rồi đổi lại thì bỏ), các handler dựng Notification
+từ payload (không query thêm) rồi ghi bằng một bulk_create.
+
+Cấu hình qua settings.NOTIFICATION_OUTBOX:
+- BATCH_SIZE: số sự kiện mỗi lô.
+- MAX_ATTEMPTS: handler lỗi quá số lần này thì sự kiện được đánh dấu đã xử lý (kèm lỗi).
+- RETENTION_DAYS: số ngày giữ sự kiện đã xử lý (lệnh drain_outbox --purge).
+"""
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from RecruitmentBackend.background import submit
+from ReportApp.cache import bump_table_version
+
+from .models import Notification, OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+# event_type -> hàm nhận (aggregate_id, payload), trả về list Notification chưa lưu
+HANDLERS = {}
+
+_drain_lock = threading.Lock()
+_drain_pending = False
+
+
+def _config():
+    return getattr(settings, 'NOTIFICATION_OUTBOX', {})
+
+
+def handler(event_type):
+    def register(func):
+        HANDLERS[event_type] = func
+        return func
+    return register
+
+
+def publish(event_type, aggregate_id, payload):
+    """Ghi sự kiện trong transaction hiện tại; outbox được rút sau khi commit."""
+    OutboxEvent.objects.create(event_type=event_type, aggregate_id=str(aggregate_id), payload=payload)
+    transaction.on_commit(request_drain)
+
+
+def publish_many(event_type, events):
+    """Như publish cho nhiều sự kiện cùng loại, ghi bằng một bulk_create. events: list (aggregate_id, payload)."""
+    if not events:
+        return
+    OutboxEvent.objects.bulk_create([
+        OutboxEvent(event_type=event_type, aggregate_id=str(aggregate_id), payload=payload)
+        for aggregate_id, payload in events
+    ])
+    transaction.on_commit(request_drain)
+
+
+def request_drain():
+    # Mỗi lúc chỉ giữ một lượt rút đang chờ; sự kiện đến sau được lượt đó xử lý
+    global _drain_pending
+    with _drain_lock:
+        if _drain_pending:
+            return
+        _drain_pending = True
+    submit(_drain_from_worker)
+
+
+def _drain_from_worker():
+    global _drain_pending
+    with _drain_lock:
+        _drain_pending = False
+    drain_outbox()
+
+
+def _coalesce(events):
+    """Gộp sự kiện theo (event_type, aggregate_id). Trả về list (các sự kiện, payload đã gộp)."""
+    groups = {}
+    for event in events:
+        groups.setdefault((event.event_type, event.aggregate_id), []).append(event)
+    merged = []
+    for group in groups.values():
+        payload = dict(group[-1].payload)
+        if 'old' in group[0].payload:
+            payload['old'] = group[0].payload['old']
+        merged.append((group, payload))
+    return merged
+
+
+def _process_batch(events):
+    """Dựng thông báo cho một lô. Trả về (notifications, id đã xong, {id lỗi: thông báo lỗi})."""
+    notifications, done, failed = [], [], {}
+    for group, payload in _coalesce(events):
+        ids = [event.pk for event in group]
+        event_type, aggregate_id = group[0].event_type, group[0].aggregate_id
+        if 'old' in payload and payload['old'] == payload.get('new'):
+            done.extend(ids)
+            continue
+        build = HANDLERS.get(event_type)
+        try:
+            if build is None:
+                raise LookupError(f'Không có handler cho {event_type}')
+            notifications.extend(build(aggregate_id, payload))
+            done.extend(ids)
+        except Exception as exc:
+            logger.exception('Không xử lý được sự kiện outbox %s %s', event_type, aggregate_id)
+            failed.update({pk: str(exc) or exc.__class__.__name__ for pk in ids})
+    return notifications, done, failed
+
+
+def drain_outbox(batch_size=None):
+    """Xử lý toàn bộ sự kiện đang chờ theo lô. Trả về số sự kiện và số thông báo đã tạo."""
+    batch_size = batch_size or _config().get('BATCH_SIZE', 500)
+    max_attempts = _config().get('MAX_ATTEMPTS', 5)
+    stats = {'events': 0, 'notifications': 0, 'failed': 0}
+    while True:
+        with transaction.atomic():
+            # Nhiều worker cùng rút thì mỗi worker lấy một phần khác nhau
+            events = list(OutboxEvent.objects.select_for_update(skip_locked=True).filter(
+                processed_at__isnull=True).order_by('id')[:batch_size])
+            if not events:
+                break
+            notifications, done, failed = _process_batch(events)
+            Notification.objects.bulk_create(notifications, batch_size=batch_size)
+            now = timezone.now()
+            OutboxEvent.objects.filter(pk__in=done).update(processed_at=now)
+            for pk, error in failed.items():
+                OutboxEvent.objects.filter(pk=pk).update(attempts=F('attempts') + 1, error=error)
+            # Hết lượt thử: đánh dấu đã xử lý để không chặn hàng đợi
+            OutboxEvent.objects.filter(pk__in=list(failed), attempts__gte=max_attempts).update(processed_at=now)
+        stats['events'] += len(done)
+        stats['notifications'] += len(notifications)
+        stats['failed'] += len(failed)
+        if len(events) < batch_size:
+            break
+    if stats['notifications']:
+        bump_table_version(Notification)
+    return stats
+
+
+def purge_outbox(days=None):
+    """Xóa sự kiện đã xử lý cũ hơn days ngày. Trả về số dòng đã xóa."""
+    days = days if days is not None else _config().get('RETENTION_DAYS', 7)
+    cutoff = timezone.now() - timedelta(days=days)
+    return OutboxEvent.objects.filter(processed_at__lt=cutoff).delete()[0]
@@ -0,0 +1,9 @@
+from rest_framework import serializers
+from .models import Notification
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Notification
+        fields = ['id', 'title', 'message', 'is_read', 'notification_type', 'related_url', 'created_at']
+        read_only_fields = ['id', 'title', 'message', 'notification_type', 'related_url', 'created_at']
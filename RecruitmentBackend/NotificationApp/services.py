@@ -1,6 +1,14 @@
 from django.contrib.auth import get_user_model
 
+from ApplicationApp.models import ApplicationStatus, InterviewStatus
+from JobApp.models import JobPosting, JobStatus
+from JobApp.recommendations import job_skill_ids
+from RecruitmentBackend.background import submit_on_commit
+from ReportApp.cache import bump_table_version
+from . import outbox
+from .fanout import fan_out
 from .models import Notification
+from .subscriptions import matching_job_seeker_ids
 
 def create_notification_for_user_registration(user):
     Notification.objects.create(
@@ -11,45 +19,84 @@ def create_notification_for_user_registration(user):
     )
 
 def create_notification_for_role_approved(user_role):
-    Notification.objects.create(
-        recipient=user_role.user,
+    outbox.publish('role.approved', user_role.pk, {'recipient': user_role.user_id, 'role': user_role.role.name})
+
+@outbox.handler('role.approved')
+def build_role_approved_notifications(aggregate_id, payload):
+    return [Notification(
+        recipient_id=payload['recipient'],
         title='Vai trò được duyệt',
-        message=f'Vai trò {user_role.role.name} của bạn đã được quản trị viên duyệt.',
+        message=f'Vai trò {payload["role"]} của bạn đã được quản trị viên duyệt.',
         notification_type='general',
-    )
+    )]
 
 User = get_user_model()
 
 def create_notification_for_new_job(job_post):
-    # Gửi cho tất cả người tìm việc đang active
-    job_seekers = User.objects.filter(roles__name='JobSeeker', is_active=True).distinct()
-    for user in job_seekers:
-        Notification.objects.create(
-            recipient=user,
+    # Gửi cho người tìm việc ở worker nền sau khi tin được commit, không chặn request tạo tin
+    submit_on_commit(send_new_job_notifications, job_post.pk)
+
+def send_new_job_notifications(job_post_id):
+    job_post = JobPosting.objects.filter(pk=job_post_id).first()
+    if not job_post:
+        return None
+    # Chỉ gửi cho người tìm việc đang active có kỹ năng (và địa điểm) khớp với tin
+    job_seeker_ids = matching_job_seeker_ids(job_post, job_skill_ids(job_post)).iterator(chunk_size=2000)
+
+    def build(user_id):
+        return Notification(
+            recipient_id=user_id,
             title='Có việc làm mới',
             message=f'Việc làm "{job_post.title}" đã được đăng tải.',
             notification_type='job',
             related_url=f'/jobs/{job_post.slug}'
         )
 
+    return fan_out(job_seeker_ids, build, label=f'new-job {job_post.slug}')
+
+JOB_STATUS_MESSAGES = {
+    JobStatus.PENDING: 'Yêu cầu duyệt tin tuyển dụng đã được gửi.',
+    JobStatus.APPROVED: 'Tin tuyển dụng đã được duyệt.',
+    JobStatus.REJECTED: 'Tin tuyển dụng đã bị từ chối.',
+}
+
 def create_notification_for_job_status_change(job_post, old_status, new_status):
-    user = job_post.recruiter_profile.user
-    if new_status == 'Pending':
-        message = 'Yêu cầu duyệt tin tuyển dụng đã được gửi.'
-    elif new_status == 'Approved':
-        message = 'Tin tuyển dụng đã được duyệt.'
-    elif new_status == 'Rejected':
-        message = 'Tin tuyển dụng đã bị từ chối.'
-    else:
+    if new_status not in JOB_STATUS_MESSAGES or job_post.recruiter_profile_id is None:
         return
+    outbox.publish('job.status_changed', job_post.pk, {
+        'recipient': job_post.recruiter_profile.user_id,
+        'slug': job_post.slug,
+        'old': old_status,
+        'new': new_status,
+    })
 
-    Notification.objects.create(
-        recipient=user,
+@outbox.handler('job.status_changed')
+def build_job_status_notifications(aggregate_id, payload):
+    message = JOB_STATUS_MESSAGES.get(payload['new'])
+    if message is None:
+        return []
+    return [Notification(
+        recipient_id=payload['recipient'],
         title='Cập nhật trạng thái tin tuyển dụng',
         message=message,
         notification_type='job',
-        related_url=f'/jobs/{job_post.slug}'
-    )
+        related_url=f'/jobs/{payload["slug"]}',
+    )]
+
+def create_notifications_for_expired_jobs(job_posts):
+    # job_posts: các dict có recruiter_user_id, title, slug; ghi một lần cho cả lô
+    Notification.objects.bulk_create([
+        Notification(
+            recipient_id=job_post['recruiter_user_id'],
+            title='Tin tuyển dụng đã hết hạn',
+            message=f'Tin tuyển dụng "{job_post["title"]}" đã hết hạn và không còn hiển thị.',
+            notification_type='job',
+            related_url=f'/jobs/{job_post["slug"]}',
+        )
+        for job_post in job_posts
+        if job_post['recruiter_user_id']
+    ])
+    bump_table_version(Notification)
 
 def create_notification_for_resume_created(resume):
     Notification.objects.create(
@@ -69,38 +116,61 @@ def create_notification_for_resume_activated(resume):
         related_url=f'/resumes/{resume.id}',
     )
 
+APPLICATION_STATUS_MESSAGES = {
+    ApplicationStatus.APPLIED: 'Bạn đã nộp hồ sơ thành công.',
+    ApplicationStatus.WITHDRAWN: 'Bạn đã rút hồ sơ.',
+    ApplicationStatus.OFFERED: 'Bạn đã nhận được lời mời làm việc.',
+    ApplicationStatus.REJECTED: 'Hồ sơ của bạn đã bị từ chối.',
+    ApplicationStatus.HIRED: 'Bạn đã được tuyển dụng.',
+}
+
 def create_notification_for_application_status_change(application, old_status, new_status):
-    user = application.job_seeker.user
-    message_map = {
-        'APPLIED': 'Bạn đã nộp hồ sơ thành công.',
-        'WITHDRAWN': 'Bạn đã rút hồ sơ.',
-        'OFFERED': 'Bạn đã nhận được lời mời làm việc.',
-        'REJECTED': 'Hồ sơ của bạn đã bị từ chối.',
-        'HIRED': 'Bạn đã được tuyển dụng.',
-    }
-    message = message_map.get(new_status, f"Trạng thái hồ sơ của bạn đã được cập nhật: {new_status}")
+    outbox.publish('application.status_changed', application.pk, {
+        'recipient': application.job_seeker_id,
+        'old': old_status,
+        'new': new_status,
+    })
 
-    Notification.objects.create(
-        recipient=user,
+def create_notifications_for_application_status_changes(changes):
+    """Thông báo cho nhiều hồ sơ đổi trạng thái cùng lúc. changes: list (application, old_status, new_status)."""
+    outbox.publish_many('application.status_changed', [
+        (application.pk, {'recipient': application.job_seeker_id, 'old': old_status, 'new': new_status})
+        for application, old_status, new_status in changes
+    ])
+
+@outbox.handler('application.status_changed')
+def build_application_status_notifications(aggregate_id, payload):
+    new_status = payload['new']
+    message = APPLICATION_STATUS_MESSAGES.get(new_status, f"Trạng thái hồ sơ của bạn đã được cập nhật: {new_status}")
+    return [Notification(
+        recipient_id=payload['recipient'],
         title='Cập nhật trạng thái ứng tuyển',
         message=message,
         notification_type='application',
-        related_url=f'/applications/{application.id}',
-    )
+        related_url=f'/applications/{aggregate_id}',
+    )]
+
+INTERVIEW_STATUS_MESSAGES = {
+    InterviewStatus.SCHEDULED: 'Bạn có lịch phỏng vấn mới.',
+    InterviewStatus.CANCELED: 'Lịch phỏng vấn đã bị huỷ.',
+    InterviewStatus.COMPLETED: 'Phỏng vấn đã hoàn thành.',
+}
 
 def create_notification_for_interview_status_change(interview, old_status, new_status):
-    user = interview.application.job_seeker.user
-    message_map = {
-        'SCHEDULED': 'Bạn có lịch phỏng vấn mới.',
-        'CANCELED': 'Lịch phỏng vấn đã bị huỷ.',
-        'COMPLETED': 'Phỏng vấn đã hoàn thành.',
-    }
-    message = message_map.get(new_status, f"Trạng thái phỏng vấn đã được cập nhật: {new_status}")
+    outbox.publish('interview.status_changed', interview.pk, {
+        'recipient': interview.application.job_seeker_id,
+        'old': old_status,
+        'new': new_status,
+    })
 
-    Notification.objects.create(
-        recipient=user,
+@outbox.handler('interview.status_changed')
+def build_interview_status_notifications(aggregate_id, payload):
+    new_status = payload['new']
+    message = INTERVIEW_STATUS_MESSAGES.get(new_status, f"Trạng thái phỏng vấn đã được cập nhật: {new_status}")
+    return [Notification(
+        recipient_id=payload['recipient'],
         title='Cập nhật lịch phỏng vấn',
         message=message,
         notification_type='interview',
-        related_url=f'/interviews/{interview.id}',
-    )
\ No newline at end of file
+        related_url=f'/interviews/{aggregate_id}',
+    )]
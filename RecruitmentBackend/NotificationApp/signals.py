@@ -0,0 +1,39 @@
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+from django.apps import apps
+from .subscriptions import (
+    add_skill_subscriptions,
+    remove_skill_subscriptions,
+    add_skill_subscribers,
+    remove_skill_subscribers,
+    sync_location_subscriptions,
+)
+
+JobSeekerProfile = apps.get_model('ResumeApp', 'JobSeekerProfile')
+
+@receiver(m2m_changed, sender=JobSeekerProfile.skills.through)
+def job_seeker_skills_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    # Cập nhật chỉ mục theo đúng phần kỹ năng được thêm/bớt
+    if not reverse:
+        # instance là JobSeekerProfile, pk_set là id kỹ năng
+        if action == 'post_add':
+            add_skill_subscriptions(instance.user_id, pk_set)
+        elif action == 'post_remove':
+            remove_skill_subscriptions(instance.user_id, pk_set)
+        elif action == 'post_clear':
+            remove_skill_subscriptions(instance.user_id)
+        return
+
+    # instance là Skill, pk_set là id hồ sơ
+    if action in ('post_add', 'post_remove'):
+        user_ids = list(JobSeekerProfile.objects.filter(pk__in=pk_set).values_list('user_id', flat=True))
+        if action == 'post_add':
+            add_skill_subscribers(instance.pk, user_ids)
+        else:
+            remove_skill_subscribers(instance.pk, user_ids)
+    elif action == 'post_clear':
+        remove_skill_subscribers(instance.pk)
+
+@receiver(post_save, sender=JobSeekerProfile)
+def job_seeker_profile_saved(sender, instance, **kwargs):
+    sync_location_subscriptions(instance)
@@ -0,0 +1,104 @@
+"""
+Chỉ mục kỹ năng/địa điểm -> người tìm việc để chỉ gửi tin mới cho người phù hợp.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from JobApp.text import normalize_phrase
+from ResumeApp.skills import extract_skill_ids
+from .models import JobSubscription
+
+User = get_user_model()
+
+
+# --- Cập nhật chỉ mục ---
+
+def add_skill_subscriptions(user_id, skill_ids):
+    JobSubscription.objects.bulk_create(
+        [JobSubscription(user_id=user_id, skill_id=skill_id) for skill_id in skill_ids],
+        ignore_conflicts=True,
+    )
+
+
+def remove_skill_subscriptions(user_id, skill_ids=None):
+    qs = JobSubscription.objects.filter(user_id=user_id, skill__isnull=False)
+    if skill_ids is not None:
+        qs = qs.filter(skill_id__in=skill_ids)
+    qs.delete()
+
+
+def add_skill_subscribers(skill_id, user_ids):
+    JobSubscription.objects.bulk_create(
+        [JobSubscription(user_id=user_id, skill_id=skill_id) for user_id in user_ids],
+        ignore_conflicts=True,
+    )
+
+
+def remove_skill_subscribers(skill_id, user_ids=None):
+    qs = JobSubscription.objects.filter(skill_id=skill_id)
+    if user_ids is not None:
+        qs = qs.filter(user_id__in=user_ids)
+    qs.delete()
+
+
+def sync_location_subscriptions(profile):
+    """Đồng bộ địa điểm mong muốn của hồ sơ, chỉ thêm/xóa phần thay đổi."""
+    wanted = {normalize_phrase(loc) for loc in profile.get_preferred_locations()}
+    wanted.discard('')
+    current = set(
+        JobSubscription.objects.filter(user_id=profile.user_id, location__isnull=False)
+        .values_list('location', flat=True)
+    )
+    if current - wanted:
+        JobSubscription.objects.filter(user_id=profile.user_id, location__in=current - wanted).delete()
+    if wanted - current:
+        JobSubscription.objects.bulk_create(
+            [JobSubscription(user_id=profile.user_id, location=loc) for loc in wanted - current],
+            ignore_conflicts=True,
+        )
+
+
+def rebuild_profile_subscriptions(profile):
+    """Dựng lại toàn bộ chỉ mục của một hồ sơ (dùng khi backfill)."""
+    remove_skill_subscriptions(profile.user_id)
+    add_skill_subscriptions(profile.user_id, profile.skills.values_list('id', flat=True))
+    sync_location_subscriptions(profile)
+
+
+# --- Tra cứu người nhận ---
+
+def matching_location_keys(location):
+    """Các địa điểm đã đăng ký nằm trong địa điểm của tin (so khớp trên chuỗi đã bỏ dấu)."""
+    job_location = f" {normalize_phrase(location)} "
+    keys = (
+        JobSubscription.objects.filter(location__isnull=False)
+        .values_list('location', flat=True)
+        .distinct()
+    )
+    return [key for key in keys if f" {key} " in job_location]
+
+
+def matching_job_seeker_ids(job_post, skill_ids=None):
+    """
+    Id người tìm việc đang active có kỹ năng khớp với tin tuyển dụng.
+    Người có khai báo địa điểm mong muốn chỉ nhận tin ở các địa điểm đó.
+    """
+    if skill_ids is None:
+        skill_ids = extract_skill_ids(
+            ' '.join(filter(None, [job_post.title, job_post.requirements, job_post.description]))
+        )
+    if not skill_ids:
+        return User.objects.none().values_list('id', flat=True)
+
+    skill_users = JobSubscription.objects.filter(skill_id__in=skill_ids).values('user_id')
+    restricted_users = JobSubscription.objects.filter(location__isnull=False).values('user_id')
+    located_users = JobSubscription.objects.filter(
+        location__in=matching_location_keys(job_post.location)
+    ).values('user_id')
+
+    return (
+        User.objects.filter(id__in=skill_users, roles__name='JobSeeker', is_active=True)
+        .filter(~Q(id__in=restricted_users) | Q(id__in=located_users))
+        .distinct()
+        .values_list('id', flat=True)
+    )
@@ -1,3 +1,35 @@
-from django.shortcuts import render
+from rest_framework import viewsets, mixins
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from RecruitmentBackend.pagination import KeysetPagination
+from ReportApp.cache import bump_table_version
+from .models import Notification
+from .serializers import NotificationSerializer
 
-# Create your views here.
+
+class NotificationViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Hộp thư thông báo của người dùng hiện tại.
+    """
+    serializer_class = NotificationSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    filterset_fields = ['is_read', 'notification_type']
+
+    def get_queryset(self):
+        return Notification.objects.filter(recipient_id=self.request.user.pk)
+
+    @action(detail=True, methods=['post'])
+    def mark_read(self, request, pk=None):
+        updated = self.get_queryset().filter(pk=pk, is_read=False).update(is_read=True)
+        if updated:
+            bump_table_version(Notification)
+        return Response({'updated': updated})
+
+    @action(detail=False, methods=['post'])
+    def mark_all_read(self, request):
+        updated = self.get_queryset().filter(is_read=False).update(is_read=True)
+        if updated:
+            bump_table_version(Notification)
+        return Response({'updated': updated})
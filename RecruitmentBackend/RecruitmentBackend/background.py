@@ -0,0 +1,63 @@
+"""
+Worker chạy tác vụ nền trong tiến trình (thread pool).
+
+Cấu hình qua settings.BACKGROUND_TASKS:
+- ASYNC: False thì chạy tác vụ ngay trong luồng gọi (dùng khi test với SQLite).
+- WORKERS: số thread của pool.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _config():
+    return getattr(settings, 'BACKGROUND_TASKS', {})
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_config().get('WORKERS', 4),
+                thread_name_prefix='background',
+            )
+        return _executor
+
+
+def _run(func, args, kwargs):
+    # Mỗi thread dùng kết nối DB riêng, đóng lại khi xong để không rò rỉ kết nối
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception('Tác vụ nền %s thất bại', getattr(func, '__name__', func))
+        raise
+    finally:
+        close_old_connections()
+
+
+def submit(func, *args, **kwargs):
+    """
+    Đưa tác vụ vào worker ngay lập tức.
+    Trả về Future, hoặc kết quả của func nếu đang ở chế độ đồng bộ.
+    """
+    if not _config().get('ASYNC', True):
+        return func(*args, **kwargs)
+    return _get_executor().submit(_run, func, args, kwargs)
+
+
+def submit_on_commit(func, *args, **kwargs):
+    """
+    Đưa tác vụ vào worker sau khi transaction hiện tại commit,
+    để worker không đọc dữ liệu chưa commit hoặc đã bị rollback.
+    """
+    transaction.on_commit(lambda: submit(func, *args, **kwargs))
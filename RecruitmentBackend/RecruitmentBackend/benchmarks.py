@@ -0,0 +1,181 @@
+"""
+Khung chung cho các lệnh benchmark (manage.py bench_*).
+
+Dữ liệu giả được tạo bằng bulk_create trong một transaction và bị rollback khi lệnh kết thúc
+(trừ khi truyền --keep), nên có thể chạy trên DB dev/staging mà không để lại dữ liệu.
+bulk_create không chạy signals: lệnh nào cần chỉ mục, vector... phải tự dựng.
+Mỗi phép đo chạy --repeat lần sau một lần làm nóng, báo thời gian trung vị và số query
+của lần làm nóng.
+"""
+import statistics
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from ApplicationApp.models import Application
+from AuthApp.models import Role, UserRole
+from JobApp.models import JobPosting, JobStatus, RecruiterProfile
+
+SEED_BATCH_SIZE = 5000
+
+
+class _Rollback(Exception):
+    pass
+
+
+def count_queries(func):
+    """(số câu SQL func thực thi, kết quả của func); không phụ thuộc DEBUG hay giới hạn log query."""
+    count = 0
+
+    def counter(execute, sql, params, many, context):
+        nonlocal count
+        count += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(counter):
+        result = func()
+    return count, result
+
+
+def median_seconds(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bulk_insert(model, objects, batch_size=SEED_BATCH_SIZE):
+    """bulk_create theo lô từ một iterator (không giữ cả danh sách trong bộ nhớ). Trả về số dòng."""
+    count, batch = 0, []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            model.objects.bulk_create(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+        count += len(batch)
+    return count
+
+
+@contextmanager
+def explicit_timestamps(model):
+    """Tạm tắt auto_now/auto_now_add để bulk_create giữ các mốc thời gian được gán sẵn."""
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def create_users(label, count, role_name):
+    """Tạo count người dùng có vai trò role_name đã duyệt và đang dùng. Trả về danh sách id."""
+    User = get_user_model()
+    role, _ = Role.objects.get_or_create(name=role_name)
+    ids = [uuid.uuid4() for _ in range(count)]
+    bulk_insert(User, (
+        User(id=pk, username=f'{label}-{role_name.lower()}-{i}', email=f'{label}-{role_name.lower()}-{i}@example.com',
+             password='!', active_role=role)
+        for i, pk in enumerate(ids)
+    ))
+    bulk_insert(UserRole, (UserRole(user_id=pk, role=role, is_approved=True) for pk in ids))
+    return ids
+
+
+def create_recruiter(label):
+    user_id, = create_users(label, 1, Role.RECRUITER)
+    return RecruiterProfile.objects.create(user_id=user_id, company_name=f'{label} company')
+
+
+def create_jobs(recruiter, count, label, fields=None):
+    """
+    Tạo count tin đã duyệt của recruiter; fields(i) trả về các trường riêng của tin thứ i
+    (mặc định: tiêu đề, mô tả, địa điểm đơn giản; có thể ghi đè slug, status). Trả về danh sách id.
+    """
+    fields = fields or (lambda i: {'title': f'{label} job {i}', 'description': 'Mô tả', 'location': 'Hà Nội'})
+    ids = [uuid.uuid4() for _ in range(count)]
+    bulk_insert(JobPosting, (
+        JobPosting(id=pk, recruiter_profile=recruiter, **{'slug': f'{label}-{i}', 'status': JobStatus.APPROVED, **fields(i)})
+        for i, pk in enumerate(ids)
+    ))
+    return ids
+
+
+def create_applications(recruiter, job_ids, seeker_ids, count, fields=None):
+    """
+    Tạo count hồ sơ ứng tuyển: hồ sơ thứ i của ứng viên i % len(seeker_ids) vào tin i // len(seeker_ids)
+    (không trùng cặp ứng viên - tin). fields(i) trả về các trường riêng (status, applied_at...).
+    """
+    if count > len(job_ids) * len(seeker_ids):
+        raise ValueError('Không đủ cặp ứng viên - tin cho số hồ sơ yêu cầu.')
+    fields = fields or (lambda i: {})
+    return bulk_insert(Application, (
+        Application(job_seeker_id=seeker_ids[i % len(seeker_ids)], job_posting_id=job_ids[i // len(seeker_ids)],
+                    recruiter_profile_id=recruiter.pk, **fields(i))
+        for i in range(count)
+    ))
+
+
+def peak_memory(func):
+    """Bộ nhớ Python cấp phát tối đa (byte) trong lúc chạy func, đo bằng tracemalloc."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class BenchmarkCommand(BaseCommand):
+    default_repeat = 5
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=self.default_repeat,
+                            help='Số lần đo mỗi phép (lấy trung vị).')
+        parser.add_argument('--keep', action='store_true', help='Giữ lại dữ liệu giả sau khi chạy.')
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        self.label = f'bench-{uuid.uuid4().hex[:8]}'
+        self.stdout.write(f'DB: {connection.vendor} {connection.settings_dict["NAME"]}')
+        try:
+            with transaction.atomic():
+                self.run(**options)
+                if not options['keep']:
+                    raise _Rollback
+        except _Rollback:
+            self.stdout.write('Đã rollback dữ liệu giả.')
+
+    def run(self, **options):
+        raise NotImplementedError
+
+    def seed(self, description, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.stdout.write(f'Tạo dữ liệu: {description} ({time.perf_counter() - start:.1f} s)')
+        return result
+
+    def measure(self, description, func, repeat=None):
+        queries, _ = count_queries(func)  # làm nóng cache của DB và của tiến trình
+        seconds = median_seconds(func, repeat or self.repeat)
+        self.stdout.write(f'{description}: {seconds * 1000:.2f} ms, {queries} query')
+        return seconds
+
+    def measure_memory(self, description, func):
+        """Chạy func thêm một lần dưới tracemalloc (chậm hơn nhiều, chỉ dùng số bộ nhớ)."""
+        peak = peak_memory(func)
+        self.stdout.write(f'{description}: bộ nhớ tối đa {peak / 2 ** 20:.1f} MB')
+        return peak
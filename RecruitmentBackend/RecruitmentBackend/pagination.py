@@ -0,0 +1,115 @@
+"""
+Phân trang keyset (cursor) theo (created_at, id).
+
+Trang sau được lọc bằng WHERE (created_at, id) < (cursor) thay vì OFFSET,
+nên trang thứ N tốn cùng chi phí như trang đầu và không cần COUNT(*).
+Cursor là chuỗi base64 mờ (opaque) trả về trong next/previous.
+"""
+import base64
+import json
+import uuid
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    page_size = api_settings.PAGE_SIZE
+    ordering_field = 'created_at'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Cursor không hợp lệ.'
+    # Client chọn sắp xếp khác (?ordering=) hoặc dùng ?page= thì quay về phân trang theo số trang
+    fallback_query_params = ('ordering', 'page')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.fallback = None
+        if any(param in request.query_params for param in self.fallback_query_params):
+            self.fallback = PageNumberPagination()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        cursor = self.decode_cursor(request)
+        field = self.ordering_field
+        reverse = bool(cursor and cursor['reverse'])
+
+        if reverse:
+            queryset = queryset.order_by(field, 'pk')
+        else:
+            queryset = queryset.order_by(f'-{field}', '-pk')
+        if cursor:
+            lookup = 'gt' if reverse else 'lt'
+            # Cận gte/lte thừa về logic nhưng cho DB tìm thẳng vào index theo khoảng;
+            # chỉ có điều kiện OR thì DB quét index từ đầu tới vị trí cursor
+            queryset = queryset.filter(**{f'{field}__{lookup}e': cursor['value']})
+            queryset = queryset.filter(
+                Q(**{f'{field}__{lookup}': cursor['value']})
+                | Q(**{field: cursor['value'], f'pk__{lookup}': cursor['pk']})
+            )
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        self.next_cursor = self.encode_cursor(rows[-1], False) if rows and has_next else None
+        self.previous_cursor = self.encode_cursor(rows[0], True) if rows and has_previous else None
+        return rows
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_link(self.next_cursor)),
+            ('previous', self.get_link(self.previous_cursor)),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def encode_cursor(self, instance, reverse):
+        payload = {
+            'v': getattr(instance, self.ordering_field).isoformat(),
+            'pk': str(instance.pk),
+            'r': reverse,
+        }
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            value = parse_datetime(payload['v'])
+            if value is None:
+                raise ValueError
+            # Các model được phân trang đều dùng khóa chính UUID
+            pk = uuid.UUID(str(payload['pk']))
+            return {'value': value, 'pk': pk, 'reverse': bool(payload.get('r'))}
+        except (ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
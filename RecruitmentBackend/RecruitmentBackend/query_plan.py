@@ -0,0 +1,81 @@
+"""
+Khai báo các quan hệ mà serializer cần đọc để tự áp dụng
+select_related/prefetch_related/only lên queryset, tránh N+1 query.
+
+Serializer khai báo:
+    query_plan = QueryPlan(select_related=['user'])
+Serializer lồng nhau (kể cả many=True) được gộp tự động theo source của field.
+"""
+from functools import lru_cache
+
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+
+class QueryPlan:
+    def __init__(self, select_related=(), prefetch_related=(), only=()):
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+        self.only = tuple(only)
+
+    def prefixed(self, prefix):
+        return QueryPlan(
+            select_related=[f'{prefix}__{path}' for path in self.select_related],
+            prefetch_related=[f'{prefix}__{path}' for path in self.prefetch_related],
+            only=[f'{prefix}__{path}' for path in self.only],
+        )
+
+    def merge(self, other):
+        return QueryPlan(
+            select_related=dict.fromkeys(self.select_related + other.select_related),
+            prefetch_related=dict.fromkeys(self.prefetch_related + other.prefetch_related),
+            only=dict.fromkeys(self.only + other.only),
+        )
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only:
+            queryset = queryset.only(*self.only)
+        return queryset
+
+
+@lru_cache(maxsize=None)
+def get_query_plan(serializer_class):
+    """QueryPlan của serializer, đã gộp với các serializer lồng nhau."""
+    plan = getattr(serializer_class, 'query_plan', None) or QueryPlan()
+    for field in serializer_class().fields.values():
+        many = isinstance(field, ListSerializer)
+        nested = field.child if many else field
+        if not isinstance(nested, BaseSerializer) or field.source == '*':
+            continue
+        source = field.source.replace('.', '__')
+        nested_plan = get_query_plan(type(nested))
+        if many:
+            # Quan hệ nhiều: prefetch, các quan hệ con cũng đi theo prefetch
+            plan = plan.merge(QueryPlan(
+                prefetch_related=[source, *nested_plan.prefixed(source).select_related,
+                                  *nested_plan.prefixed(source).prefetch_related],
+            ))
+        else:
+            plan = plan.merge(QueryPlan(select_related=[source]).merge(
+                QueryPlan(select_related=nested_plan.prefixed(source).select_related,
+                          prefetch_related=nested_plan.prefixed(source).prefetch_related)
+            ))
+    return plan
+
+
+def optimize_queryset(queryset, serializer_class):
+    return get_query_plan(serializer_class).apply(queryset)
+
+
+class QueryPlanMixin:
+    """
+    Mixin cho GenericAPIView/ViewSet: áp dụng QueryPlan của serializer đang dùng
+    lên queryset sau khi lọc (list, retrieve, update...).
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return optimize_queryset(queryset, self.get_serializer_class())
@@ -65,6 +65,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'ReportApp.middleware.CurrentRequestMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -159,7 +160,7 @@ cloudinary.config(
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'AuthApp.authentication.RoleClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',  # mặc định
@@ -188,12 +189,85 @@ SIMPLE_JWT = {
 
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+    'TOKEN_REFRESH_SERIALIZER': 'AuthApp.serializers.RoleTokenRefreshSerializer',
 
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=30),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
 
+# Worker chạy tác vụ nền trong tiến trình (RecruitmentBackend/background.py)
+# ASYNC = False để chạy đồng bộ trong luồng gọi (test với SQLite)
+BACKGROUND_TASKS = {
+    'ASYNC': os.getenv('BACKGROUND_TASKS_ASYNC', 'True') == 'True',
+    'WORKERS': int(os.getenv('BACKGROUND_TASKS_WORKERS', '4')),
+}
+
+# Gửi thông báo hàng loạt theo lô (NotificationApp/fanout.py)
+NOTIFICATION_FANOUT = {
+    'BATCH_SIZE': 1000,
+}
+
+# Gợi ý việc làm theo kỹ năng (JobApp/recommendations.py)
+JOB_RECOMMENDATIONS = {
+    'TOP_N': 100,   # số tin tính sẵn cho mỗi người tìm việc
+    'RESPONSE_SIZE': 10,  # số tin trả về cho mỗi lần gọi /recommend/
+    'TTL': 600,     # giây
+}
+
+# Bộ đếm lượt xem tin tuyển dụng ghi trễ (JobApp/counters.py)
+JOB_VIEW_COUNTER = {
+    'FLUSH_INTERVAL': 5,       # giây, 0 = ghi ngay mỗi lượt xem
+    'FLUSH_THRESHOLD': 1000,   # ghi ngay khi bộ đệm đạt số lượt này
+}
+
+# Cache vai trò người dùng cho permission class (AuthApp/roles.py)
+ROLE_CACHE = {
+    'TTL': 60,          # giây, 0 = chỉ ghi nhớ trong một request
+    'VERSION_TTL': 30,  # giây giữ role_version để kiểm tra JWT (AuthApp/authentication.py)
+}
+
+# Báo cáo chạy nền và kho file kết quả (ReportApp/jobs.py)
+REPORT_JOBS = {
+    'ARTIFACT_ROOT': os.getenv('REPORT_ARTIFACT_ROOT', str(BASE_DIR / 'report_artifacts')),
+    'TTL': 24 * 3600,          # giây giữ file kết quả
+    'RUNNING_TIMEOUT': 30 * 60,  # giây, quá hạn thì coi job đã chết
+}
+
+# Cache cho báo cáo hệ thống (ReportApp/cache.py). Mặc định LocMem riêng từng tiến trình;
+# đặt REPORT_CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache và
+# REPORT_CACHE_LOCATION=<thư mục> để các tiến trình trên cùng máy dùng chung.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'reports': {
+        'BACKEND': os.getenv('REPORT_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('REPORT_CACHE_LOCATION', 'reports'),
+    },
+}
+
+REPORT_CACHE = {
+    'ALIAS': 'reports',
+    'FRESH_FOR': 60,    # giây trả kết quả không cần tính lại (khi bảng nguồn không đổi)
+    'MAX_STALE': 300,   # giây, kết quả cũ hơn không được trả nữa
+}
+
+# Lịch sử hoạt động ghi theo lô (ReportApp/activity.py)
+ACTIVITY_LOG = {
+    'FLUSH_INTERVAL': 2,        # giây (có thể lẻ, vd 0.5), 0 = ghi ngay
+    'FLUSH_THRESHOLD': 200,     # ghi ngay khi bộ đệm đạt số bản ghi này
+    'MAX_PENDING': 10000,       # số bản ghi tối đa giữ lại khi DB lỗi
+    'RETENTION_DAYS': 180,      # lệnh prune_activity_logs
+}
+
+# Outbox thông báo (NotificationApp/outbox.py)
+NOTIFICATION_OUTBOX = {
+    'BATCH_SIZE': 500,      # số sự kiện mỗi lô
+    'MAX_ATTEMPTS': 5,      # số lần thử handler trước khi bỏ sự kiện
+    'RETENTION_DAYS': 7,    # giữ sự kiện đã xử lý (drain_outbox --purge)
+}
+
 # Thiết lập logging (có thể thêm để debug)
 LOGGING = {
     'version': 1,
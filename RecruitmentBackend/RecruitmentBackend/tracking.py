@@ -0,0 +1,73 @@
+"""
+Theo dõi thay đổi của một số trường mà không phải đọc lại bản ghi từ DB.
+
+Model khai báo tracked_fields; giá trị lúc nạp từ DB (from_db) được lưu lại và cập nhật sau
+mỗi lần save, nên signals (kể cả post_save) biết trường nào vừa đổi và giá trị trước đó.
+Trường bị defer (only/defer) không có giá trị gốc: được đọc bằng một query khi cần lần đầu.
+"""
+
+
+class TrackedFieldsMixin:
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_tracked()
+        return instance
+
+    def _tracked_attnames(self):
+        return {name: self._meta.get_field(name).attname for name in self.tracked_fields}
+
+    def _remember_tracked(self, fields=None):
+        originals = self.__dict__.setdefault('_tracked_originals', {})
+        for name, attname in self._tracked_attnames().items():
+            if (fields is None or name in fields or attname in fields) and attname in self.__dict__:
+                originals[name] = self.__dict__[attname]
+
+    def _load_originals(self):
+        originals = self.__dict__.setdefault('_tracked_originals', {})
+        missing = {name: attname for name, attname in self._tracked_attnames().items() if name not in originals}
+        if not missing:
+            return originals
+        row = type(self)._base_manager.using(self._state.db).filter(pk=self.pk).values(*missing.values()).first()
+        for name, attname in missing.items():
+            # Bản ghi đã bị xóa: coi như giá trị hiện tại là giá trị gốc
+            originals[name] = row[attname] if row is not None else getattr(self, attname)
+        return originals
+
+    def original_value(self, field):
+        """Giá trị của trường lúc nạp từ DB hoặc lần save gần nhất (None nếu chưa lưu)."""
+        if field not in self.tracked_fields:
+            raise ValueError(f'{type(self).__name__}.{field} không nằm trong tracked_fields.')
+        if self._state.adding:
+            return None
+        return self._load_originals()[field]
+
+    def has_changed(self, field):
+        if self._state.adding:
+            return True
+        return self.original_value(field) != getattr(self, self._meta.get_field(field).attname)
+
+    @property
+    def changed_fields(self):
+        return [name for name in self.tracked_fields if self.has_changed(name)]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Chỉ các trường vừa ghi xuống DB mới có giá trị gốc mới
+        update_fields = kwargs.get('update_fields')
+        self._remember_tracked(None if update_fields is None else set(update_fields))
+
+    def save_changed(self, **kwargs):
+        """
+        Chỉ ghi các trường theo dõi đã đổi (cùng các trường auto_now).
+        Dùng khi chỉ sửa trường trong tracked_fields; trường khác đã sửa sẽ không được ghi.
+        """
+        if self._state.adding:
+            return self.save(**kwargs)
+        changed = self.changed_fields
+        if not changed:
+            return
+        auto_now = [field.name for field in self._meta.concrete_fields if getattr(field, 'auto_now', False)]
+        self.save(update_fields=[*changed, *auto_now], **kwargs)
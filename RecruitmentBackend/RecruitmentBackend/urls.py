@@ -13,7 +13,7 @@ urlpatterns = [
     # path('api/profile/', include('ProfileApp.urls')),
     path('', include('ApplicationApp.urls')),
     # path('api/chat/', include('ChatApp.urls')),
-    # path('', include('NotificationApp.urls')),
+    path('', include('NotificationApp.urls')),
     path('', include('ReportApp.urls')),
 ]
 
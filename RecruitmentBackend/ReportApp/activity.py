@@ -0,0 +1,153 @@
+"""
+Ghi lịch sử hoạt động (ActivityLog) theo lô, ghi trễ (write-behind).
+
+Signals của các app gọi record(...) khi có thao tác với tin tuyển dụng, hồ sơ ứng tuyển,
+phỏng vấn và vai trò. Người thực hiện là người dùng của request hiện tại
+(ReportApp/middleware.py), không có thì là chủ sở hữu do nơi gọi truyền vào.
+Bản ghi được đưa vào bộ đệm trong bộ nhớ sau khi transaction commit, rồi ghi bằng
+bulk_create khi đủ FLUSH_THRESHOLD bản ghi hoặc sau FLUSH_INTERVAL giây.
+
+Cấu hình qua settings.ACTIVITY_LOG:
+- FLUSH_INTERVAL: số giây tối đa một bản ghi nằm trong bộ đệm (có thể lẻ, 0 = ghi ngay).
+- FLUSH_THRESHOLD: ghi ngay khi bộ đệm đạt số bản ghi này.
+- MAX_PENDING: số bản ghi tối đa giữ lại khi DB lỗi, quá thì bỏ bản ghi cũ nhất.
+- RETENTION_DAYS: số ngày giữ lịch sử (lệnh prune_activity_logs).
+"""
+import atexit
+import json
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from .middleware import get_current_user_id
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+INSERT_BATCH_SIZE = 500
+FIELD_LENGTH = 255
+
+
+class ActivityRecorder:
+    def __init__(self):
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+
+    @property
+    def _config(self):
+        return getattr(settings, 'ACTIVITY_LOG', {})
+
+    def add(self, entry):
+        with self._lock:
+            self._pending.append(entry)
+            total = len(self._pending)
+        interval = self._config.get('FLUSH_INTERVAL', 2)
+        if not interval or total >= self._config.get('FLUSH_THRESHOLD', 200):
+            try:
+                self.flush()
+            except Exception:
+                # Chạy trong on_commit của request đã commit: flush đã log lỗi và giữ lại bản ghi,
+                # không làm hỏng response; còn ghi trễ thì hẹn lần thử sau
+                if interval:
+                    self._schedule(interval)
+            return
+        self._schedule(interval)
+
+    def _schedule(self, interval):
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(interval, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            pass  # đã log trong flush, bản ghi được giữ lại cho lần sau
+        finally:
+            close_old_connections()
+
+    def flush(self):
+        """Ghi toàn bộ bộ đệm xuống DB. Trả về số bản ghi đã ghi."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                try:
+                    ActivityLog.objects.bulk_create(batch, batch_size=INSERT_BATCH_SIZE)
+                except IntegrityError:
+                    # Người dùng bị xóa trước khi lô được ghi: bỏ bản ghi của họ rồi ghi lại
+                    existing = set(get_user_model().objects.filter(
+                        pk__in={entry.user_id for entry in batch}).values_list('pk', flat=True))
+                    batch = [entry for entry in batch if entry.user_id in existing]
+                    ActivityLog.objects.bulk_create(batch, batch_size=INSERT_BATCH_SIZE)
+            except Exception:
+                logger.exception('Không ghi được %d bản ghi hoạt động, giữ lại trong bộ đệm', len(batch))
+                with self._lock:
+                    self._pending = (batch + self._pending)[-self._config.get('MAX_PENDING', 10000):]
+                raise
+            return len(batch)
+
+
+activity_recorder = ActivityRecorder()
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        activity_recorder.flush()
+    except Exception:
+        pass
+
+
+def _truncate(value):
+    value = '' if value is None else str(value)
+    return value[:FIELD_LENGTH]
+
+
+def record(action, target='', owner_id=None):
+    """
+    Ghi một hoạt động (sau khi transaction hiện tại commit).
+    owner_id: người được ghi nhận khi thao tác không đến từ request có người dùng (lệnh, tác vụ nền).
+    """
+    user_id = get_current_user_id() or owner_id
+    if user_id is None:
+        return
+    entry = ActivityLog(user_id=user_id, action=_truncate(action), target=_truncate(target),
+                        timestamp=timezone.now())
+    transaction.on_commit(lambda: activity_recorder.add(entry))
+
+
+def prune_activity_logs(days=None, chunk_size=5000, archive=None):
+    """
+    Xóa lịch sử cũ hơn days ngày theo từng lô khóa chính.
+    archive: file văn bản (đã mở) để ghi lại các dòng bị xóa dạng JSON lines trước khi xóa.
+    Trả về số dòng đã xóa.
+    """
+    days = days if days is not None else getattr(settings, 'ACTIVITY_LOG', {}).get('RETENTION_DAYS', 180)
+    cutoff = timezone.now() - timedelta(days=days)
+    old = ActivityLog.objects.filter(timestamp__lt=cutoff).order_by('timestamp')
+    deleted = 0
+    while True:
+        ids = list(old.values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        if archive is not None:
+            for row in ActivityLog.objects.filter(pk__in=ids).values('id', 'user_id', 'action', 'target', 'timestamp'):
+                archive.write(json.dumps(row, ensure_ascii=False, cls=DjangoJSONEncoder) + '\n')
+            archive.flush()
+        deleted += ActivityLog.objects.filter(pk__in=ids).delete()[0]
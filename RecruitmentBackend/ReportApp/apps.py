@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ReportappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ReportApp'
+
+    def ready(self):
+        import ReportApp.signals
@@ -0,0 +1,51 @@
+"""
+Kho file kết quả của báo cáo chạy nền, lưu trên hệ thống file.
+
+Cấu hình qua settings.REPORT_JOBS['ARTIFACT_ROOT'].
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+class FileSystemArtifactStore:
+    def __init__(self, root=None):
+        self._root = root
+
+    @property
+    def root(self):
+        return str(self._root or getattr(settings, 'REPORT_JOBS', {}).get(
+            'ARTIFACT_ROOT', os.path.join(settings.BASE_DIR, 'report_artifacts')))
+
+    def path(self, name):
+        # Tên file do hệ thống sinh (uuid.ext), chặn mọi đường dẫn con
+        return os.path.join(self.root, os.path.basename(name))
+
+    @contextmanager
+    def open_write(self, name):
+        """Ghi vào file tạm cùng thư mục rồi đổi tên, người đọc không thấy file ghi dở."""
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w+b') as file_obj:
+                yield file_obj
+            os.replace(tmp_path, self.path(name))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def open_read(self, name):
+        return open(self.path(name), 'rb')
+
+    def exists(self, name):
+        return bool(name) and os.path.exists(self.path(name))
+
+    def delete(self, name):
+        if name and os.path.exists(self.path(name)):
+            os.remove(self.path(name))
+
+
+artifact_store = FileSystemArtifactStore()
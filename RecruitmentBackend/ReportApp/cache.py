@@ -0,0 +1,117 @@
+"""
+Cache cho các báo cáo toàn hệ thống (tổng quan, xu hướng, thông báo, KPI).
+
+Mỗi bảng nguồn có một số phiên bản trong cache, tăng sau khi transaction ghi vào bảng đó
+commit (ReportApp/signals.py, và các chỗ ghi hàng loạt không qua signal gọi bump_table_version).
+Kết quả báo cáo được lưu kèm phiên bản các bảng nguồn và thời điểm tính:
+- phiên bản không đổi và chưa quá FRESH_FOR giây: trả ngay;
+- phiên bản đã đổi hoặc quá FRESH_FOR giây nhưng chưa quá MAX_STALE giây: trả kết quả cũ
+  và tính lại trong worker nền (mỗi khóa chỉ một lượt tính lại tại một thời điểm);
+- chưa có hoặc quá MAX_STALE giây: tính ngay trong request.
+Vậy dữ liệu báo cáo cũ hơn dữ liệu thật tối đa MAX_STALE giây.
+
+Cấu hình qua settings.REPORT_CACHE:
+- ALIAS: cache dùng để lưu (trong settings.CACHES, LocMem hoặc FileBased).
+- FRESH_FOR, MAX_STALE: số giây như trên.
+"""
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from RecruitmentBackend.background import submit
+
+
+def _config():
+    return getattr(settings, 'REPORT_CACHE', {})
+
+
+def _cache():
+    return caches[_config().get('ALIAS', 'default')]
+
+
+def _fresh_for():
+    return _config().get('FRESH_FOR', 60)
+
+
+def _max_stale():
+    return _config().get('MAX_STALE', 300)
+
+
+def _version_key(model):
+    return f'reportcache:version:{model._meta.label_lower}'
+
+
+def _new_version():
+    # Không lặp lại giá trị cũ kể cả khi khóa phiên bản bị cache loại bỏ
+    return time.time_ns()
+
+
+def get_table_versions(models):
+    cache = _cache()
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), None)
+            versions[key] = cache.get(key)
+    return tuple(versions[key] for key in keys)
+
+
+def _bump(model):
+    cache = _cache()
+    try:
+        cache.incr(_version_key(model))
+    except ValueError:
+        cache.set(_version_key(model), _new_version(), None)
+
+
+def bump_table_version(model):
+    """Dữ liệu của model đã đổi: báo cáo dùng bảng này sẽ được tính lại (sau khi commit)."""
+    transaction.on_commit(lambda: _bump(model))
+
+
+def _entry_key(name, args):
+    digest = hashlib.sha1(repr(args).encode()).hexdigest()
+    return f'reportcache:{name}:{digest}'
+
+
+def _compute(key, models, func, args):
+    # Đọc phiên bản trước khi tính: ghi xảy ra trong lúc tính sẽ làm kết quả này cũ ngay
+    versions = get_table_versions(models)
+    value = func(*args)
+    _cache().set(key, (time.time(), versions, value), _max_stale())
+    return value
+
+
+def _refresh(key, models, func, args):
+    try:
+        _compute(key, models, func, args)
+    finally:
+        _cache().delete(f'{key}:refresh')
+
+
+def cached_report(name, models):
+    """Cache kết quả hàm báo cáo theo tham số vị trí; models: các model mà báo cáo đọc."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            key = _entry_key(name, args)
+            entry = _cache().get(key)
+            if entry is None:
+                return _compute(key, models, func, args)
+            computed_at, versions, value = entry
+            age = time.time() - computed_at
+            if age >= _max_stale():
+                return _compute(key, models, func, args)
+            if age >= _fresh_for() or versions != get_table_versions(models):
+                if _cache().add(f'{key}:refresh', 1, _max_stale()):
+                    submit(_refresh, key, models, func, args)
+            return value
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
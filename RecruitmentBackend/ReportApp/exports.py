@@ -0,0 +1,290 @@
+"""
+Xuất báo cáo ra CSV/Excel theo luồng, bộ nhớ không tăng theo số dòng.
+
+- Dữ liệu lớn (report 'applications') được đọc theo lô keyset trên khóa chính,
+  không giữ toàn bộ kết quả trong bộ nhớ (kể cả với driver MySQL đệm cả kết quả).
+- CSV: StreamingHttpResponse sinh từng dòng.
+- Excel: xlsxwriter ở chế độ constant_memory ghi ra file tạm rồi trả bằng FileResponse.
+- PDF: ReportApp/pdf.py sinh từng trang, trả bằng StreamingHttpResponse.
+"""
+import csv
+import json
+import tempfile
+from datetime import date, datetime
+from uuid import UUID
+
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from ApplicationApp.models import Application
+
+from .pdf import render_pdf
+from .services import ReportParamsError, generate_custom_report, uuid_param
+
+EXPORT_CHUNK_SIZE = 2000
+
+CSV_CONTENT_TYPE = 'text/csv; charset=utf-8'
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+PDF_CONTENT_TYPE = 'application/pdf'
+
+
+class ExportSource:
+    """Nguồn dữ liệu xuất: tiêu đề cột, iterator các dòng (tuple), tên báo cáo và biểu đồ (nếu có)."""
+
+    def __init__(self, columns, rows, title='', chart=None):
+        self.columns = list(columns)
+        self.rows = rows
+        self.title = title
+        # list (nhãn, giá trị) cho biểu đồ cột trong PDF
+        self.chart = chart
+
+
+def source_from_dicts(data, title='', chart_columns=None):
+    """
+    Nguồn từ kết quả báo cáo có sẵn (list các dict hoặc một dict).
+    chart_columns: (cột nhãn, cột giá trị) của biểu đồ; cột nhãn None là cột đầu tiên.
+    """
+    if isinstance(data, dict):
+        data = [data]
+    data = list(data or [])
+    columns = list(data[0].keys()) if data else []
+    chart = None
+    if chart_columns and chart_columns[1] in columns:
+        label_column = chart_columns[0] or columns[0]
+        chart = [(_chart_label(item[label_column]), item[chart_columns[1]] or 0) for item in data]
+    return ExportSource(columns, (tuple(item.get(column) for column in columns) for item in data), title, chart)
+
+
+def iterate_in_chunks(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """values_list theo từng lô WHERE pk > last ORDER BY pk; trường đầu tiên phải là 'pk'."""
+    last_pk = None
+    while True:
+        chunk = queryset.order_by('pk')
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+        rows = list(chunk.values_list(*fields)[:chunk_size])
+        if not rows:
+            return
+        yield from rows
+        last_pk = rows[-1][0]
+        if len(rows) < chunk_size:
+            return
+
+
+APPLICATION_EXPORT_FIELDS = [
+    ('pk', 'Mã hồ sơ'),
+    ('job_posting__title', 'Tin tuyển dụng'),
+    ('job_posting__recruiter_profile__company_name', 'Công ty'),
+    ('job_seeker__username', 'Ứng viên'),
+    ('job_seeker__email', 'Email'),
+    ('status', 'Trạng thái'),
+    ('applied_at', 'Ngày nộp'),
+    ('updated_at', 'Cập nhật'),
+]
+
+
+def application_source(params):
+    """
+    Toàn bộ hồ sơ ứng tuyển, lọc theo date_from/date_to (ngày nộp), job_id, status.
+    Tham số được kiểm tra ngay (ReportParamsError), trước khi response bắt đầu ghi.
+    """
+    queryset = Application.objects.all()
+    date_from = _date_param(params, 'date_from')
+    date_to = _date_param(params, 'date_to')
+    if date_from:
+        queryset = queryset.filter(applied_at__date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(applied_at__date__lte=date_to)
+    job_id = uuid_param(params, 'job_id')
+    if job_id:
+        queryset = queryset.filter(job_posting_id=job_id)
+    if params.get('status'):
+        queryset = queryset.filter(status=params['status'])
+    fields = [field for field, _ in APPLICATION_EXPORT_FIELDS]
+    return ExportSource([label for _, label in APPLICATION_EXPORT_FIELDS], iterate_in_chunks(queryset, fields),
+                        REPORT_TITLES['applications'])
+
+
+def _date_param(params, name):
+    try:
+        return parse_date(params.get(name) or '')
+    except ValueError:
+        raise ReportParamsError(f'{name} không hợp lệ.')
+
+
+# Các báo cáo có nguồn xuất theo luồng riêng; loại khác đi qua generate_custom_report
+STREAMING_SOURCES = {
+    'applications': application_source,
+}
+
+REPORT_TITLES = {
+    'applications': 'Danh sách hồ sơ ứng tuyển',
+    'recruiter_stats': 'Thống kê hồ sơ theo tin tuyển dụng',
+    'recruiter_job_performance': 'Hiệu quả tin tuyển dụng',
+    'recruiter_applicant_status': 'Ứng viên theo trạng thái',
+    'jobseeker_resume_views': 'Lượt xem hồ sơ',
+    'jobseeker_response_rate': 'Tỉ lệ phản hồi từ nhà tuyển dụng',
+    'jobseeker_application_history': 'Lịch sử ứng tuyển',
+    'system_summary': 'Tổng quan hệ thống',
+    'system_trends': 'Xu hướng tuyển dụng',
+    'system_notifications': 'Thống kê thông báo',
+    'custom_metrics': 'Chỉ số KPI',
+}
+
+# (cột nhãn, cột giá trị) của biểu đồ cột trong PDF
+CHART_COLUMNS = {
+    'system_trends': (None, 'count'),
+    'recruiter_stats': ('job_title', 'total_applications'),
+    'recruiter_job_performance': ('job_title', 'views_count'),
+}
+
+
+def _cell(value, tz=None):
+    # tz: múi giờ hiện tại đã lấy sẵn một lần cho cả file (get_current_timezone tốn đáng kể mỗi ô)
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value, tz)
+        return value.replace(tzinfo=None)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return value
+
+
+class _Echo:
+    """File giả cho csv.writer: trả lại chuỗi vừa ghi thay vì lưu."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(source):
+    writer = csv.writer(_Echo())
+    tz = timezone.get_current_timezone()
+    # BOM để Excel nhận đúng UTF-8 (tiếng Việt)
+    yield '\ufeff' + writer.writerow(source.columns)
+    for row in source.rows:
+        yield writer.writerow([_csv_value(value, tz) for value in row])
+
+
+def _csv_value(value, tz=None):
+    value = _cell(value, tz)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat(sep=' ') if isinstance(value, datetime) else value.isoformat()
+    return value
+
+
+def write_csv(source, file_obj):
+    """Ghi nguồn dữ liệu ra file CSV (file nhị phân) theo từng dòng."""
+    for line in _csv_lines(source):
+        file_obj.write(line.encode('utf-8'))
+
+
+def csv_response(source, filename):
+    response = StreamingHttpResponse(_csv_lines(source), content_type=CSV_CONTENT_TYPE)
+    response['Content-Disposition'] = f'attachment; filename={filename}.csv'
+    return response
+
+
+def write_xlsx(source, file_obj):
+    """Ghi nguồn dữ liệu ra file Excel; constant_memory giải phóng từng dòng sau khi ghi."""
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(file_obj, {'constant_memory': True})
+    worksheet = workbook.add_worksheet()
+    header_format = workbook.add_format({'bold': True})
+    datetime_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm'})
+    date_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
+
+    tz = timezone.get_current_timezone()
+    worksheet.write_row(0, 0, source.columns, header_format)
+    for row_index, row in enumerate(source.rows, start=1):
+        for col_index, value in enumerate(row):
+            value = _cell(value, tz)
+            if isinstance(value, datetime):
+                worksheet.write_datetime(row_index, col_index, value, datetime_format)
+            elif isinstance(value, date):
+                worksheet.write_datetime(row_index, col_index, value, date_format)
+            elif value is not None:
+                worksheet.write(row_index, col_index, value)
+    workbook.close()
+
+
+def build_source(report_type, params):
+    """Nguồn dữ liệu cho report_type: nguồn đọc theo lô nếu có, không thì từ generate_custom_report."""
+    if report_type in STREAMING_SOURCES:
+        return STREAMING_SOURCES[report_type](params)
+    return source_from_dicts(
+        generate_custom_report({'report_type': report_type, **params}),
+        REPORT_TITLES.get(report_type, report_type),
+        CHART_COLUMNS.get(report_type),
+    )
+
+
+def validate_source_params(report_type, params):
+    """Kiểm tra tham số của nguồn đọc theo lô mà chưa đọc dữ liệu (khi nhận báo cáo chạy nền)."""
+    if report_type in STREAMING_SOURCES:
+        STREAMING_SOURCES[report_type](params)
+
+
+def _pdf_value(value, tz=None):
+    value = _cell(value, tz)
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float):
+        return f'{value:.2f}'
+    return '' if value is None else str(value)
+
+
+def _chart_label(value):
+    value = _cell(value)
+    return value.date().isoformat() if isinstance(value, datetime) else _pdf_value(value)
+
+
+def _pdf_chunks(source):
+    tz = timezone.get_current_timezone()
+    rows = ([_pdf_value(value, tz) for value in row] for row in source.rows)
+    return render_pdf(source.columns, rows, source.title, source.chart)
+
+
+def write_pdf(source, file_obj):
+    for chunk in _pdf_chunks(source):
+        file_obj.write(chunk)
+
+
+def pdf_response(source, filename):
+    response = StreamingHttpResponse(_pdf_chunks(source), content_type=PDF_CONTENT_TYPE)
+    response['Content-Disposition'] = f'attachment; filename={filename}.pdf'
+    return response
+
+
+def xlsx_response(source, filename):
+    # File tạm không tên, tự xóa khi FileResponse đóng file
+    file_obj = tempfile.TemporaryFile()
+    try:
+        write_xlsx(source, file_obj)
+    except Exception:
+        file_obj.close()
+        raise
+    file_obj.seek(0)
+    return FileResponse(file_obj, as_attachment=True, filename=f'{filename}.xlsx', content_type=XLSX_CONTENT_TYPE)
+
+
+EXPORT_FORMATS = {
+    'csv': csv_response,
+    'excel': xlsx_response,
+    'xlsx': xlsx_response,
+    'pdf': pdf_response,
+}
+
+# Ghi ra file: định dạng -> (hàm ghi, phần mở rộng, content type)
+FILE_WRITERS = {
+    'csv': (write_csv, 'csv', CSV_CONTENT_TYPE),
+    'excel': (write_xlsx, 'xlsx', XLSX_CONTENT_TYPE),
+    'xlsx': (write_xlsx, 'xlsx', XLSX_CONTENT_TYPE),
+    'pdf': (write_pdf, 'pdf', PDF_CONTENT_TYPE),
+}
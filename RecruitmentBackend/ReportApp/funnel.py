@@ -0,0 +1,182 @@
+"""
+Phễu tuyển dụng và cohort theo tuần cho nhà tuyển dụng.
+
+Không có lịch sử trạng thái nên mức phễu một hồ sơ đã đạt được suy ra từ trạng thái hiện tại
+và phỏng vấn: đã có phỏng vấn hoặc đang ở Interview Scheduled/Offered/Hired thì đã qua vòng
+phỏng vấn, kể cả khi sau đó bị từ chối hay rút hồ sơ.
+
+- Số lượng từng mức và cohort: một câu GROUP BY (đếm có điều kiện) trên Application.
+- Thời gian ở từng giai đoạn: SQL tính sẵn khoảng cách giữa các mốc (dạng số), lấy một lần
+  thành mảng NumPy rồi tính trung bình, trung vị, p90 trên mảng.
+  Mốc "quyết định" (Offered/Hired) là updated_at của hồ sơ.
+"""
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+import numpy as np
+from django.db import connection
+from django.db.models import (
+    BigIntegerField, Case, Count, DurationField, Exists, ExpressionWrapper, F, IntegerField, Min, OuterRef, Q,
+    Value, When,
+)
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from ApplicationApp.models import Application, ApplicationStatus, Interview
+
+STAGES = [
+    ApplicationStatus.APPLIED,
+    ApplicationStatus.INTERVIEW_SCHEDULED,
+    ApplicationStatus.OFFERED,
+    ApplicationStatus.HIRED,
+]
+DEFAULT_WEEKS = 12
+DURATION_CHUNK_SIZE = 10000
+MICROS_PER_DAY = 86400 * 10 ** 6
+STATUS_CODES = {status: code for code, status in enumerate(ApplicationStatus.values)}
+
+# Điều kiện "đã đạt mức" (annotation has_interview do _applications thêm vào)
+REACHED = {
+    ApplicationStatus.APPLIED: Q(),
+    ApplicationStatus.INTERVIEW_SCHEDULED: Q(has_interview=True) | Q(status__in=[
+        ApplicationStatus.INTERVIEW_SCHEDULED, ApplicationStatus.OFFERED, ApplicationStatus.HIRED]),
+    ApplicationStatus.OFFERED: Q(status__in=[ApplicationStatus.OFFERED, ApplicationStatus.HIRED]),
+    ApplicationStatus.HIRED: Q(status=ApplicationStatus.HIRED),
+}
+
+
+def _local_midnight(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _applications(user, date_from, date_to, job_id=None):
+    queryset = Application.objects.filter(
+        recruiter_profile__user=user,
+        applied_at__gte=_local_midnight(date_from),
+        applied_at__lt=_local_midnight(date_to + timedelta(days=1)),
+    )
+    if job_id:
+        queryset = queryset.filter(job_posting_id=job_id)
+    return queryset.annotate(has_interview=Exists(Interview.objects.filter(application=OuterRef('pk'))))
+
+
+def _alias(stage):
+    # Giá trị trạng thái có dấu cách, không dùng làm tên cột SQL được
+    return f'reached_{stage.name.lower()}'
+
+
+def _stage_counts():
+    return {_alias(stage): Count('pk', filter=REACHED[stage]) for stage in STAGES}
+
+
+def _rate(numerator, denominator):
+    return numerator / denominator if denominator else None
+
+
+def funnel_stages(queryset):
+    counts = queryset.aggregate(**_stage_counts())
+    applied = counts[_alias(ApplicationStatus.APPLIED)]
+    stages = []
+    previous = None
+    for stage in STAGES:
+        count = counts[_alias(stage)]
+        stages.append({
+            'stage': stage,
+            'count': count,
+            # Tỉ lệ chuyển từ mức ngay trước và từ lúc nộp hồ sơ
+            'conversion': _rate(count, previous) if previous is not None else None,
+            'from_applied': _rate(count, applied),
+        })
+        previous = count
+    return stages
+
+
+def weekly_cohorts(queryset):
+    rows = queryset.annotate(week=TruncWeek('applied_at')).values('week').annotate(
+        **_stage_counts()).order_by('week')
+    cohorts = []
+    for row in rows:
+        size = row[_alias(ApplicationStatus.APPLIED)]
+        cohorts.append({
+            'week': timezone.localtime(row['week']).date(),
+            'size': size,
+            'counts': {stage: row[_alias(stage)] for stage in STAGES[1:]},
+            'rates': {stage: _rate(row[_alias(stage)], size) for stage in STAGES[1:]},
+        })
+    return cohorts
+
+
+def _duration_stats(days):
+    days = days[~np.isnan(days)]
+    if not days.size:
+        return {'count': 0, 'mean_days': None, 'median_days': None, 'p90_days': None}
+    # Mốc ghi lệch vài giây (phỏng vấn tạo sau lần cập nhật cuối) không tạo thời gian âm
+    days = np.maximum(days, 0)
+    median, p90 = np.percentile(days, [50, 90])
+    return {
+        'count': int(days.size),
+        'mean_days': round(float(days.mean()), 2),
+        'median_days': round(float(median), 2),
+        'p90_days': round(float(p90), 2),
+    }
+
+
+def _elapsed(later, earlier):
+    # Hiệu hai mốc thời gian tính trong SQL: MySQL/SQLite trả số micro giây, PostgreSQL trả interval
+    if connection.features.has_native_duration_field:
+        return ExpressionWrapper(later - earlier, output_field=DurationField())
+    return ExpressionWrapper(later - earlier, output_field=BigIntegerField())
+
+
+def _to_micros(value):
+    return value / timedelta(microseconds=1) if isinstance(value, timedelta) else value
+
+
+def _fetch_array(queryset, width):
+    """Các dòng số của queryset thành mảng float (None -> nan), chuyển theo từng lô."""
+    rows = queryset.iterator(chunk_size=DURATION_CHUNK_SIZE)
+    native = connection.features.has_native_duration_field
+    parts = []
+    while True:
+        chunk = list(islice(rows, DURATION_CHUNK_SIZE))
+        if not chunk:
+            break
+        if native:
+            chunk = [[_to_micros(value) for value in row] for row in chunk]
+        parts.append(np.array(chunk, dtype=float))
+    return np.concatenate(parts) if parts else np.empty((0, width))
+
+
+def stage_durations(queryset):
+    """Thời gian (ngày): nộp → phỏng vấn đầu tiên, phỏng vấn → quyết định, nộp → nhận việc."""
+    first_interview = Min('interviews__created_at')
+    rows = queryset.filter(REACHED[ApplicationStatus.INTERVIEW_SCHEDULED]).annotate(
+        status_code=Case(*(When(status=status, then=Value(code)) for status, code in STATUS_CODES.items()),
+                         output_field=IntegerField()),
+        to_interview=_elapsed(first_interview, F('applied_at')),
+        to_decision=_elapsed(F('updated_at'), first_interview),
+        to_hire=_elapsed(F('updated_at'), F('applied_at')),
+    ).values_list('status_code', 'to_interview', 'to_decision', 'to_hire').order_by()
+    status, to_interview, to_decision, to_hire = (_fetch_array(rows, 4) / [1, *[MICROS_PER_DAY] * 3]).T
+
+    decided = np.isin(status, [STATUS_CODES[ApplicationStatus.OFFERED], STATUS_CODES[ApplicationStatus.HIRED]])
+    hired = status == STATUS_CODES[ApplicationStatus.HIRED]
+    return {
+        ApplicationStatus.APPLIED: _duration_stats(to_interview),
+        ApplicationStatus.INTERVIEW_SCHEDULED: _duration_stats(np.where(decided, to_decision, np.nan)),
+        'time_to_hire': _duration_stats(np.where(hired, to_hire, np.nan)),
+    }
+
+
+def get_recruiter_funnel(user, date_from=None, date_to=None, job_id=None):
+    """Phễu, thời gian từng giai đoạn và cohort theo tuần nộp hồ sơ (mặc định DEFAULT_WEEKS tuần gần nhất)."""
+    date_to = date_to or timezone.localdate()
+    date_from = date_from or date_to - timedelta(weeks=DEFAULT_WEEKS)
+    queryset = _applications(user, date_from, date_to, job_id)
+    return {
+        'from': date_from,
+        'to': date_to,
+        'stages': funnel_stages(queryset),
+        'time_in_stage': stage_durations(queryset),
+        'cohorts': weekly_cohorts(queryset),
+    }
@@ -0,0 +1,159 @@
+"""
+Báo cáo chạy nền: yêu cầu trả về ReportJob ngay, worker (RecruitmentBackend/background.py)
+tính báo cáo và ghi kết quả vào kho file (ReportApp/artifacts.py); client hỏi trạng thái
+rồi tải file khi xong.
+
+Yêu cầu trùng (cùng người, loại, định dạng, tham số) dùng lại job đang chờ/chạy hoặc
+kết quả còn hạn thay vì chạy lại.
+
+Cấu hình qua settings.REPORT_JOBS:
+- ARTIFACT_ROOT: thư mục lưu file kết quả.
+- TTL: số giây giữ file kết quả.
+- RUNNING_TIMEOUT: job chờ/chạy quá số giây này coi như đã chết (không dùng lại, bị đánh dấu lỗi khi dọn).
+"""
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from RecruitmentBackend.background import submit_on_commit
+
+from .artifacts import artifact_store
+from .exports import FILE_WRITERS, STREAMING_SOURCES, build_source
+from .models import ReportJob, ReportJobStatus
+from .services import generate_custom_report
+
+logger = logging.getLogger(__name__)
+
+JSON_FORMAT = 'json'
+REPORT_JOB_FORMATS = (JSON_FORMAT, *FILE_WRITERS)
+
+
+def _config():
+    return getattr(settings, 'REPORT_JOBS', {})
+
+
+def _ttl():
+    return timedelta(seconds=_config().get('TTL', 24 * 3600))
+
+
+def _running_timeout():
+    return timedelta(seconds=_config().get('RUNNING_TIMEOUT', 30 * 60))
+
+
+def compute_params_hash(user_id, report_type, file_format, params):
+    payload = json.dumps([str(user_id), report_type, file_format, params], sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def validate_report_request(report_type, file_format):
+    """Trả về thông báo lỗi, hoặc None nếu hợp lệ."""
+    if not report_type:
+        return 'Cần report_type.'
+    if file_format not in REPORT_JOB_FORMATS:
+        return f'Định dạng không hỗ trợ: {file_format}'
+    if file_format == JSON_FORMAT and report_type in STREAMING_SOURCES:
+        return f'Báo cáo {report_type} chỉ xuất được ra file (csv, excel, pdf).'
+    return None
+
+
+def reusable_jobs(params_hash):
+    now = timezone.now()
+    alive_since = now - _running_timeout()
+    return ReportJob.objects.filter(params_hash=params_hash).filter(
+        Q(status=ReportJobStatus.PENDING, created_at__gte=alive_since)
+        | Q(status=ReportJobStatus.RUNNING, started_at__gte=alive_since)
+        | Q(status=ReportJobStatus.DONE, expires_at__gt=now)
+    )
+
+
+def submit_report_job(user, report_type, file_format, params):
+    """
+    Tạo job (hoặc dùng lại job trùng). Trả về (job, created).
+    params_hash gồm id người yêu cầu nên khóa dòng người dùng là đủ để hai yêu cầu trùng
+    gửi đồng thời không cùng thấy "chưa có job" rồi cùng tạo.
+    """
+    params_hash = compute_params_hash(user.pk, report_type, file_format, params)
+    with transaction.atomic():
+        list(get_user_model().objects.select_for_update().filter(pk=user.pk).values_list('pk', flat=True))
+        existing = reusable_jobs(params_hash).order_by('-created_at').first()
+        if existing is not None:
+            return existing, False
+        job = ReportJob.objects.create(
+            requested_by_id=user.pk,
+            report_type=report_type,
+            file_format=file_format,
+            params=params,
+            params_hash=params_hash,
+        )
+    submit_on_commit(run_report_job, job.pk)
+    return job, True
+
+
+def artifact_info(job):
+    """(content type, tên file tải về) của kết quả."""
+    if job.file_format == JSON_FORMAT:
+        return 'application/json', f'report-{job.report_type}.json'
+    _, extension, content_type = FILE_WRITERS[job.file_format]
+    return content_type, f'report-{job.report_type}.{extension}'
+
+
+def _write_artifact(job, file_obj):
+    if job.file_format == JSON_FORMAT:
+        data = generate_custom_report({'report_type': job.report_type, **job.params})
+        file_obj.write(json.dumps(data, ensure_ascii=False, cls=DjangoJSONEncoder).encode('utf-8'))
+        return
+    write, _, _ = FILE_WRITERS[job.file_format]
+    write(build_source(job.report_type, job.params), file_obj)
+
+
+def run_report_job(job_id):
+    # Chỉ một worker nhận được job (UPDATE có điều kiện trên trạng thái)
+    if not ReportJob.objects.filter(pk=job_id, status=ReportJobStatus.PENDING).update(
+            status=ReportJobStatus.RUNNING, started_at=timezone.now()):
+        return
+    job = ReportJob.objects.get(pk=job_id)
+    _, filename = artifact_info(job)
+    artifact_name = f"{job.pk}.{filename.rsplit('.', 1)[-1]}"
+    try:
+        with artifact_store.open_write(artifact_name) as file_obj:
+            _write_artifact(job, file_obj)
+    except Exception as exc:
+        logger.exception('Báo cáo chạy nền %s thất bại', job.pk)
+        job.status = ReportJobStatus.FAILED
+        job.error = str(exc) or exc.__class__.__name__
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+        return
+
+    job.status = ReportJobStatus.DONE
+    job.artifact_name = artifact_name
+    job.finished_at = timezone.now()
+    job.expires_at = job.finished_at + _ttl()
+    job.save(update_fields=['status', 'artifact_name', 'finished_at', 'expires_at'])
+
+
+def purge_report_jobs():
+    """Xóa job hết hạn (kèm file kết quả) và đánh dấu lỗi các job treo."""
+    now = timezone.now()
+    alive_since = now - _running_timeout()
+    stale = ReportJob.objects.filter(
+        Q(status=ReportJobStatus.PENDING, created_at__lt=alive_since)
+        | Q(status=ReportJobStatus.RUNNING, started_at__lt=alive_since)
+    ).update(status=ReportJobStatus.FAILED, error='Quá thời gian chạy.', finished_at=now)
+
+    expired = ReportJob.objects.filter(
+        Q(expires_at__lte=now) | Q(status=ReportJobStatus.FAILED, finished_at__lt=now - _ttl())
+    )
+    rows = list(expired.values_list('pk', 'artifact_name'))
+    for _, artifact_name in rows:
+        artifact_store.delete(artifact_name)
+    ReportJob.objects.filter(pk__in=[job_id for job_id, _ in rows]).delete()
+    return {'stale': stale, 'purged': len(rows)}
@@ -0,0 +1,62 @@
+import os
+import tempfile
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ApplicationApp.models import Application, ApplicationStatus
+from AuthApp.models import Role
+from RecruitmentBackend.benchmarks import (
+    BenchmarkCommand, create_applications, create_jobs, create_recruiter, create_users, explicit_timestamps,
+)
+from ReportApp.exports import APPLICATION_EXPORT_FIELDS, FILE_WRITERS, build_source
+
+
+class Command(BenchmarkCommand):
+    help = 'Đo thời gian và bộ nhớ khi xuất báo cáo "applications" với N hồ sơ ứng tuyển ra file.'
+    default_repeat = 1
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--jobs', type=int, default=1000, help='Số tin mà các hồ sơ được chia đều vào.')
+        parser.add_argument('--format', action='append', dest='formats', choices=sorted(FILE_WRITERS),
+                            help='Định dạng cần đo (lặp lại để đo nhiều định dạng). Mặc định: csv, excel.')
+
+    def run(self, rows, jobs, formats, **options):
+        recruiter = self.seed('nhà tuyển dụng', create_recruiter, self.label)
+        job_ids = self.seed(f'{jobs} tin tuyển dụng', create_jobs, recruiter, jobs, self.label)
+        seeker_ids = self.seed(f'{-(-rows // jobs)} ứng viên', create_users, self.label, -(-rows // jobs),
+                               Role.JOB_SEEKER)
+        statuses = ApplicationStatus.values
+        start = timezone.now()
+
+        def fields(i):
+            applied_at = start - timedelta(minutes=i)
+            return {'status': statuses[i % len(statuses)], 'applied_at': applied_at, 'created_at': applied_at,
+                    'updated_at': applied_at, 'cover_letter': 'Thư giới thiệu'}
+
+        with explicit_timestamps(Application):
+            self.seed(f'{rows} hồ sơ ứng tuyển', create_applications, recruiter, job_ids, seeker_ids, rows, fields)
+        exported = Application.objects.count()
+        self.stdout.write(f'Bảng hồ sơ có {exported} dòng (report "applications" xuất toàn bộ)')
+
+        # Đọc hết vào bộ nhớ như trước khi xuất theo luồng (chưa tính DataFrame và file xlsx trong bộ nhớ)
+        columns = [field for field, _ in APPLICATION_EXPORT_FIELDS]
+        self.measure_memory('Đọc toàn bộ bằng values_list (cách cũ)',
+                            lambda: list(Application.objects.values_list(*columns)))
+
+        for file_format in formats or ['csv', 'excel']:
+            write, extension, _ = FILE_WRITERS[file_format]
+
+            def export():
+                if extension == 'csv':
+                    with open(os.devnull, 'wb') as sink:
+                        write(build_source('applications', {}), sink)
+                    return
+                with tempfile.TemporaryFile() as sink:
+                    write(build_source('applications', {}), sink)
+
+            seconds = self.measure(f'Xuất {extension}', export)
+            self.stdout.write(f'  {exported / seconds:,.0f} dòng/giây')
+            self.measure_memory(f'Xuất {extension}', export)
@@ -0,0 +1,75 @@
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from ApplicationApp.models import Application, ApplicationStatus, Interview, InterviewStatus
+from AuthApp.models import Role
+from RecruitmentBackend.benchmarks import (
+    BenchmarkCommand, bulk_insert, create_applications, create_jobs, create_recruiter, create_users,
+    explicit_timestamps,
+)
+from ReportApp.funnel import (
+    DEFAULT_WEEKS, _applications, funnel_stages, get_recruiter_funnel, stage_durations, weekly_cohorts,
+)
+
+# Trạng thái theo i % 10: một nửa chỉ nộp, 20% bị từ chối (một nửa số đó sau phỏng vấn)
+STATUS_CYCLE = [ApplicationStatus.APPLIED] * 5 + [
+    ApplicationStatus.REJECTED, ApplicationStatus.REJECTED, ApplicationStatus.INTERVIEW_SCHEDULED,
+    ApplicationStatus.OFFERED, ApplicationStatus.HIRED,
+]
+INTERVIEWED = {6, 7, 8, 9}
+
+
+class Command(BenchmarkCommand):
+    help = ('Đo phễu tuyển dụng (ReportApp/funnel.py) của một nhà tuyển dụng có N hồ sơ ứng tuyển '
+            'trong DEFAULT_WEEKS tuần gần nhất.')
+    default_repeat = 1
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--rows', type=int, default=5_000_000)
+        parser.add_argument('--jobs', type=int, default=1000, help='Số tin mà các hồ sơ được chia đều vào.')
+
+    def run(self, rows, jobs, **options):
+        recruiter = self.seed('nhà tuyển dụng', create_recruiter, self.label)
+        job_ids = self.seed(f'{jobs} tin tuyển dụng', create_jobs, recruiter, jobs, self.label)
+        seeker_ids = self.seed(f'{-(-rows // jobs)} ứng viên', create_users, self.label, -(-rows // jobs),
+                               Role.JOB_SEEKER)
+
+        # id suy ra từ i để tạo phỏng vấn mà không phải giữ hàng triệu id trong bộ nhớ
+        prefix = uuid.uuid4().int >> 40 << 40
+        now = timezone.now()
+        span = timedelta(weeks=DEFAULT_WEEKS).total_seconds()
+
+        def applied_at(i):
+            return now - timedelta(seconds=(i * 7919) % span)
+
+        def fields(i):
+            applied = applied_at(i)
+            decided = applied + timedelta(days=1 + i % 20)
+            return {'id': uuid.UUID(int=prefix | i), 'status': STATUS_CYCLE[i % 10], 'applied_at': applied,
+                    'created_at': applied, 'updated_at': min(decided, now)}
+
+        def interviews():
+            for i in range(rows):
+                if i % 10 in INTERVIEWED:
+                    at = min(applied_at(i) + timedelta(days=i % 7), now)
+                    yield Interview(application_id=uuid.UUID(int=prefix | i), scheduled_at=at,
+                                    status=InterviewStatus.COMPLETED, created_at=at, updated_at=at)
+
+        with explicit_timestamps(Application):
+            self.seed(f'{rows} hồ sơ ứng tuyển', create_applications, recruiter, job_ids, seeker_ids, rows, fields)
+        with explicit_timestamps(Interview):
+            count = self.seed('phỏng vấn', bulk_insert, Interview, interviews())
+        self.stdout.write(f'{count} phỏng vấn')
+
+        user = get_user_model().objects.get(pk=recruiter.user_id)
+        date_to = timezone.localdate()
+        queryset = _applications(user, date_to - timedelta(weeks=DEFAULT_WEEKS), date_to)
+        self.measure('Số lượng từng mức (funnel_stages)', lambda: funnel_stages(queryset))
+        self.measure('Thời gian từng giai đoạn (stage_durations)', lambda: stage_durations(queryset))
+        self.measure('Cohort theo tuần (weekly_cohorts)', lambda: weekly_cohorts(queryset))
+        self.measure('Toàn bộ get_recruiter_funnel', lambda: get_recruiter_funnel(user))
+        self.measure_memory('Toàn bộ get_recruiter_funnel', lambda: get_recruiter_funnel(user))
@@ -0,0 +1,49 @@
+import random
+from datetime import timedelta
+
+from django.utils import timezone
+
+from RecruitmentBackend.benchmarks import BenchmarkCommand
+from ReportApp.exports import APPLICATION_EXPORT_FIELDS
+from ReportApp.pdf import render_pdf
+
+TITLES = ['Lập trình viên Backend', 'Kế toán tổng hợp', 'Nhân viên kinh doanh', 'Kỹ sư kiểm thử phần mềm',
+          'Chuyên viên tuyển dụng', 'Thiết kế đồ họa']
+COMPANIES = ['Công ty Cổ phần Công nghệ Việt', 'Tập đoàn Đại Phát', 'Công ty TNHH Hưng Thịnh']
+STATUSES = ['Applied', 'Interview Scheduled', 'Offered', 'Rejected', 'Hired']
+
+
+class Command(BenchmarkCommand):
+    help = 'Đo tốc độ dựng PDF (trang/giây) và bộ nhớ cho một báo cáo N dòng, không cần dữ liệu trong DB.'
+    default_repeat = 3
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--rows', type=int, default=50_000)
+
+    def run(self, rows, **options):
+        rnd = random.Random(1)
+        start = timezone.localtime()
+        # Dòng đã định dạng thành chuỗi như _pdf_chunks đưa vào render_pdf, có chữ tiếng Việt cần bỏ dấu
+        data = [
+            (f'{i:08x}-0000-0000-0000-000000000000', rnd.choice(TITLES), rnd.choice(COMPANIES),
+             f'ung-vien-{i}', f'ung-vien-{i}@example.com', rnd.choice(STATUSES),
+             (start - timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M'),
+             (start - timedelta(minutes=i // 2)).strftime('%Y-%m-%d %H:%M'))
+            for i in range(rows)
+        ]
+        columns = [label for _, label in APPLICATION_EXPORT_FIELDS]
+        chart = [(f'2026-{month:02d}', rnd.randint(100, 5000)) for month in range(1, 13)]
+
+        for description, chart_points in [('không biểu đồ', None), ('có biểu đồ', chart)]:
+            def render():
+                size = pages = 0
+                for chunk in render_pdf(columns, iter(data), 'Danh sách hồ sơ ứng tuyển', chart_points):
+                    size += len(chunk)
+                    pages += chunk.count(b'/Type /Page ')
+                return size, pages
+
+            size, pages = render()
+            seconds = self.measure(f'PDF {rows} dòng, {description}', render)
+            self.stdout.write(f'  {pages} trang, {size / 2 ** 20:.1f} MB, {pages / seconds:,.0f} trang/giây')
+            self.measure_memory(f'PDF {rows} dòng, {description}', render)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from ReportApp.activity import prune_activity_logs
+
+
+class Command(BaseCommand):
+    help = 'Xóa lịch sử hoạt động cũ theo từng lô (có thể lưu trữ ra file JSON lines trước khi xóa).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Giữ lại số ngày gần nhất (mặc định ACTIVITY_LOG["RETENTION_DAYS"]).')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Số dòng xóa mỗi lô.')
+        parser.add_argument('--archive', default=None, help='File để nối thêm các dòng bị xóa (JSON lines).')
+
+    def handle(self, *args, **options):
+        if options['archive']:
+            with open(options['archive'], 'a', encoding='utf-8') as archive:
+                deleted = prune_activity_logs(options['days'], options['chunk_size'], archive)
+        else:
+            deleted = prune_activity_logs(options['days'], options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Đã xóa {deleted} bản ghi hoạt động.'))
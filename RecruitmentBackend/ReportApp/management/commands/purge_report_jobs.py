@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from ReportApp.jobs import purge_report_jobs
+
+
+class Command(BaseCommand):
+    help = 'Xóa báo cáo chạy nền đã hết hạn (kèm file kết quả) và đánh dấu lỗi các job bị treo.'
+
+    def handle(self, *args, **options):
+        stats = purge_report_jobs()
+        self.stdout.write(self.style.SUCCESS(
+            f"Đã xóa {stats['purged']} báo cáo, đánh dấu lỗi {stats['stale']} job bị treo."
+        ))
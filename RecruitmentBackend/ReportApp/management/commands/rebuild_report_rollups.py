@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from ReportApp.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Tính lại các bảng tổng hợp báo cáo (DailyFact, JobFact, RecruiterDailyFact) từ dữ liệu gốc.'
+
+    def handle(self, *args, **options):
+        stats = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f"Đã ghi {stats['daily']} ngày, {stats['jobs']} tin, {stats['recruiter_daily']} dòng nhà tuyển dụng."
+        ))
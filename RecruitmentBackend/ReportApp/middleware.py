@@ -0,0 +1,29 @@
+from contextvars import ContextVar
+
+_current_request = ContextVar('current_request', default=None)
+
+
+class CurrentRequestMiddleware:
+    """
+    Giữ request đang xử lý để signals biết ai thực hiện thao tác (ReportApp/activity.py).
+    DRF gán người dùng đã xác thực (JWT) lại vào request gốc nên đọc request.user lúc cần là đủ.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_request.reset(token)
+
+
+def get_current_user_id():
+    """Id người dùng của request hiện tại, None nếu ngoài request hoặc chưa đăng nhập."""
+    request = _current_request.get()
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return None
+    return user.pk
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApp', '0005_jobposting_jobposting_status_created_idx'),
+        ('ReportApp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyFact',
+            fields=[
+                ('date', models.DateField(primary_key=True, serialize=False)),
+                ('jobs_created', models.IntegerField(default=0)),
+                ('applications_created', models.IntegerField(default=0)),
+                ('jobs_first_application', models.IntegerField(default=0)),
+                ('hired', models.IntegerField(default=0)),
+                ('interviews_completed', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Số liệu theo ngày',
+                'verbose_name_plural': 'Số liệu theo ngày',
+                'ordering': ['date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobFact',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='report_fact', serialize=False, to='JobApp.jobposting')),
+                ('applications', models.IntegerField(default=0)),
+                ('hired', models.IntegerField(default=0)),
+                ('interviews_completed', models.IntegerField(default=0)),
+                ('first_application_on', models.DateField(blank=True, null=True)),
+                ('recruiter_profile', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='job_facts', to='JobApp.recruiterprofile')),
+            ],
+            options={
+                'verbose_name': 'Số liệu theo tin tuyển dụng',
+                'verbose_name_plural': 'Số liệu theo tin tuyển dụng',
+            },
+        ),
+        migrations.CreateModel(
+            name='RecruiterDailyFact',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('jobs_created', models.IntegerField(default=0)),
+                ('applications_received', models.IntegerField(default=0)),
+                ('hired', models.IntegerField(default=0)),
+                ('recruiter_profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_facts', to='JobApp.recruiterprofile')),
+            ],
+            options={
+                'verbose_name': 'Số liệu nhà tuyển dụng theo ngày',
+                'verbose_name_plural': 'Số liệu nhà tuyển dụng theo ngày',
+                'ordering': ['date'],
+                'unique_together': {('recruiter_profile', 'date')},
+            },
+        ),
+    ]
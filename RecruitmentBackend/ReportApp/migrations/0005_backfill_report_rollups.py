@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:40
+
+from django.db import migrations
+
+from ReportApp.rollups import rebuild_rollups
+
+
+def backfill_report_rollups(apps, schema_editor):
+    """Tính các bảng tổng hợp từ dữ liệu đã có (như lệnh rebuild_report_rollups)."""
+    rebuild_rollups(apps.get_model)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ApplicationApp', '0006_application_match_score'),
+        ('JobApp', '0008_backfill_job_skills'),
+        ('ReportApp', '0004_activitylog_batching'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_report_rollups, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 import uuid
 
 class ActivityLog(models.Model):
@@ -7,12 +8,108 @@ class ActivityLog(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='activity_logs')
     action = models.CharField(max_length=255)
     target = models.CharField(max_length=255, blank=True, null=True)  # có thể là tên job, user hoặc hành động
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Ghi theo lô (ReportApp/activity.py) nên lấy thời điểm xảy ra thay vì lúc INSERT
+    timestamp = models.DateTimeField(default=timezone.now)
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['user', 'timestamp'], name='activitylog_user_time_idx'),
+            # Dọn lịch sử cũ (prune_activity_logs)
+            models.Index(fields=['timestamp'], name='activitylog_time_idx'),
+        ]
         verbose_name = "Lịch sử hoạt động"
         verbose_name_plural = "Lịch sử hoạt động"
 
     def __str__(self):
         return f"{self.user.username} - {self.action} - {self.timestamp}"
+
+
+# Bảng tổng hợp (rollup) cho báo cáo, cập nhật dần qua ReportApp/rollups.py
+class DailyFact(models.Model):
+    date = models.DateField(primary_key=True)
+    jobs_created = models.IntegerField(default=0)
+    applications_created = models.IntegerField(default=0)
+    # Số tin nhận hồ sơ đầu tiên trong ngày (tổng = số tin đã có hồ sơ)
+    jobs_first_application = models.IntegerField(default=0)
+    # Biến động số hồ sơ ở trạng thái Hired / phỏng vấn Completed trong ngày (có thể âm)
+    hired = models.IntegerField(default=0)
+    interviews_completed = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['date']
+        verbose_name = "Số liệu theo ngày"
+        verbose_name_plural = "Số liệu theo ngày"
+
+    def __str__(self):
+        return str(self.date)
+
+
+class JobFact(models.Model):
+    job = models.OneToOneField('JobApp.JobPosting', on_delete=models.CASCADE, primary_key=True,
+                               related_name='report_fact')
+    recruiter_profile = models.ForeignKey('JobApp.RecruiterProfile', on_delete=models.CASCADE, null=True,
+                                          blank=True, related_name='job_facts')
+    applications = models.IntegerField(default=0)
+    hired = models.IntegerField(default=0)
+    interviews_completed = models.IntegerField(default=0)
+    first_application_on = models.DateField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Số liệu theo tin tuyển dụng"
+        verbose_name_plural = "Số liệu theo tin tuyển dụng"
+
+    def __str__(self):
+        return f"{self.job_id}"
+
+
+class RecruiterDailyFact(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    recruiter_profile = models.ForeignKey('JobApp.RecruiterProfile', on_delete=models.CASCADE,
+                                          related_name='daily_facts')
+    date = models.DateField()
+    jobs_created = models.IntegerField(default=0)
+    applications_received = models.IntegerField(default=0)
+    hired = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('recruiter_profile', 'date')
+        ordering = ['date']
+        verbose_name = "Số liệu nhà tuyển dụng theo ngày"
+        verbose_name_plural = "Số liệu nhà tuyển dụng theo ngày"
+
+    def __str__(self):
+        return f"{self.recruiter_profile_id} - {self.date}"
+
+
+class ReportJobStatus(models.TextChoices):
+    PENDING = 'Pending', 'Đang chờ'
+    RUNNING = 'Running', 'Đang chạy'
+    DONE = 'Done', 'Hoàn thành'
+    FAILED = 'Failed', 'Thất bại'
+
+
+# Báo cáo chạy nền, kết quả lưu thành file (ReportApp/jobs.py)
+class ReportJob(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='report_jobs')
+    report_type = models.CharField(max_length=50)
+    file_format = models.CharField(max_length=10)
+    params = models.JSONField(default=dict, blank=True)
+    # Băm (người yêu cầu, loại, định dạng, tham số) để gộp các yêu cầu trùng
+    params_hash = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=20, choices=ReportJobStatus.choices, default=ReportJobStatus.PENDING)
+    artifact_name = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Báo cáo chạy nền"
+        verbose_name_plural = "Các báo cáo chạy nền"
+
+    def __str__(self):
+        return f"{self.report_type} ({self.file_format}) - {self.status}"
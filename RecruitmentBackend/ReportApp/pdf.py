@@ -0,0 +1,241 @@
+"""
+Dựng file PDF cho báo cáo (bảng + biểu đồ cột), không dùng thư viện ngoài.
+
+Trang được sinh và trả về lần lượt: mỗi trang ghi xong là gửi đi, chỉ giữ lại vị trí
+byte của các object cho bảng xref cuối file, nên bộ nhớ không tăng theo số dòng.
+Tiêu đề, hàng tiêu đề bảng và biểu đồ là Form XObject dùng chung cho mọi trang;
+nội dung đã nén của chúng được cache theo phiên bản (băm dữ liệu đầu vào).
+Font chuẩn Helvetica không có chữ tiếng Việt nên văn bản được bỏ dấu trước khi ghi.
+"""
+import hashlib
+import itertools
+import unicodedata
+import zlib
+
+from django.core.cache import cache
+from django.utils import timezone
+
+PAGE_WIDTH, PAGE_HEIGHT = 842, 595  # A4 ngang
+MARGIN = 36
+TITLE_SIZE = 14
+FONT_SIZE = 8
+ROW_HEIGHT = 14
+TITLE_HEIGHT = 30
+FOOTER_HEIGHT = 20
+CHART_HEIGHT = 170
+CHART_MAX_BARS = 60
+# Độ rộng trung bình một ký tự Helvetica, tính theo cỡ chữ
+CHAR_WIDTH = 0.5
+# Số dòng đầu dùng để ước lượng độ rộng cột
+WIDTH_SAMPLE_ROWS = 200
+MIN_COLUMN_CHARS, MAX_COLUMN_CHARS = 4, 40
+FRAGMENT_CACHE_TTL = 3600
+
+CATALOG, PAGES, FONT_REGULAR, FONT_BOLD = 1, 2, 3, 4
+FONT_RESOURCES = b'/Font << /F1 %d 0 R /F2 %d 0 R >>' % (FONT_REGULAR, FONT_BOLD)
+
+
+def fold_pdf_text(value):
+    """Bỏ dấu tiếng Việt và chỉ giữ ký tự ASCII in được (font chuẩn WinAnsi)."""
+    text = '' if value is None else str(value)
+    if text.isascii() and text.isprintable():
+        return text
+    text = text.replace('đ', 'd').replace('Đ', 'D')
+    text = ''.join(ch for ch in unicodedata.normalize('NFD', text) if not unicodedata.combining(ch))
+    return ''.join(ch if ' ' <= ch <= '~' else ' ' if ch.isspace() else '?' for ch in text)
+
+
+def pdf_text(value, width, size=FONT_SIZE):
+    """Chuỗi cho toán tử Tj: bỏ dấu, cắt vừa độ rộng width (pt), escape ngoặc."""
+    text = fold_pdf_text(value)
+    max_chars = max(int(width / (size * CHAR_WIDTH)) - 1, 1)
+    if len(text) > max_chars:
+        text = text[:max(max_chars - 3, 1)] + '...'
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _text_op(x, y, text, font='F1', size=FONT_SIZE):
+    return f'BT /{font} {size} Tf 1 0 0 1 {x:.2f} {y:.2f} Tm ({text}) Tj ET\n'
+
+
+class PdfWriter:
+    """Ghi object PDF tuần tự và ghi nhớ vị trí byte để dựng bảng xref."""
+
+    def __init__(self):
+        self.offset = 0
+        self.offsets = {}
+        self.next_number = FONT_BOLD + 1
+
+    def reserve(self):
+        number = self.next_number
+        self.next_number += 1
+        return number
+
+    def _emit(self, data):
+        self.offset += len(data)
+        return data
+
+    def header(self):
+        return self._emit(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    def object(self, number, body):
+        self.offsets[number] = self.offset
+        return self._emit(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+
+    def stream(self, number, compressed, entries=b''):
+        body = b'<< %s /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream' % (
+            entries, len(compressed), compressed)
+        return self.object(number, body)
+
+    def trailer(self):
+        size = self.next_number
+        lines = [b'xref\n0 %d\n' % size, b'0000000000 65535 f \n']
+        lines += [b'%010d 00000 n \n' % self.offsets[number] for number in range(1, size)]
+        xref_offset = self.offset
+        lines.append(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+            size, CATALOG, xref_offset))
+        return self._emit(b''.join(lines))
+
+
+def _fragment(kind, inputs, build):
+    """Nội dung đã nén của một phần dùng chung, cache theo băm của dữ liệu đầu vào."""
+    version = hashlib.sha1(repr(inputs).encode()).hexdigest()
+    key = f'reportpdf:{kind}:{version}'
+    data = cache.get(key)
+    if data is None:
+        data = zlib.compress(build().encode('latin-1'))
+        cache.set(key, data, FRAGMENT_CACHE_TTL)
+    return data
+
+
+def _title_content(title):
+    text = pdf_text(title, PAGE_WIDTH - 2 * MARGIN, TITLE_SIZE)
+    return _text_op(MARGIN, PAGE_HEIGHT - MARGIN - TITLE_SIZE, text, 'F2', TITLE_SIZE)
+
+
+def _columns_content(columns, widths):
+    # Hàng tiêu đề bảng vẽ từ y = 0, trang đặt vị trí bằng toán tử cm
+    parts = [f'0.9 g {MARGIN} 0 {sum(widths):.2f} {ROW_HEIGHT} re f 0 g\n']
+    x = MARGIN
+    for column, width in zip(columns, widths):
+        parts.append(_text_op(x + 2, 4, pdf_text(column, width), 'F2'))
+        x += width
+    return ''.join(parts)
+
+
+def _chart_content(points):
+    """Biểu đồ cột trong khung (0, 0)-(chart_width, CHART_HEIGHT)."""
+    chart_width = PAGE_WIDTH - 2 * MARGIN
+    plot_bottom, plot_height = 24, CHART_HEIGHT - 40
+    parts = [f'0.5 G 0.5 w 0 {plot_bottom} m {chart_width} {plot_bottom} l S\n']
+    if not points:
+        return ''.join(parts)
+    top = max(value for _, value in points) or 1
+    slot = chart_width / len(points)
+    label_every = max(1, int(len(points) / (chart_width / 60)))
+    parts.append('0.25 0.45 0.75 rg\n')
+    for index, (_, value) in enumerate(points):
+        height = plot_height * max(value, 0) / top
+        parts.append(f'{index * slot + slot * 0.15:.2f} {plot_bottom} {slot * 0.7:.2f} {height:.2f} re f\n')
+    parts.append('0 g\n')
+    for index, (label, value) in enumerate(points):
+        x = index * slot + 2
+        if len(points) <= 30:
+            height = plot_height * max(value, 0) / top
+            parts.append(_text_op(x, plot_bottom + height + 3, pdf_text(value, slot, 7), 'F1', 7))
+        if index % label_every == 0:
+            parts.append(_text_op(x, plot_bottom - 12, pdf_text(label, slot * label_every, 7), 'F1', 7))
+    return ''.join(parts)
+
+
+def _form_xobject(writer, number, compressed, width, height):
+    entries = b'/Type /XObject /Subtype /Form /BBox [0 0 %d %d] /Resources << %s >>' % (
+        width, height, FONT_RESOURCES)
+    return writer.stream(number, compressed, entries)
+
+
+def _column_widths(columns, sample):
+    chars = [len(fold_pdf_text(column)) for column in columns]
+    for row in sample:
+        for index, value in enumerate(row[:len(columns)]):
+            chars[index] = max(chars[index], len(value))
+    chars = [min(max(count, MIN_COLUMN_CHARS), MAX_COLUMN_CHARS) for count in chars]
+    scale = (PAGE_WIDTH - 2 * MARGIN) / (sum(chars) or 1)
+    return [count * scale for count in chars]
+
+
+def render_pdf(columns, rows, title, chart=None):
+    """
+    Sinh file PDF theo từng phần bytes.
+    rows: iterator các dòng đã định dạng thành chuỗi; chart: list (nhãn, giá trị) hoặc None.
+    """
+    columns = list(columns)
+    rows = iter(rows)
+    sample = list(itertools.islice(rows, WIDTH_SAMPLE_ROWS))
+    rows = itertools.chain(sample, rows)
+    widths = _column_widths(columns, sample)
+    chart = list(chart or [])[:CHART_MAX_BARS]
+
+    writer = PdfWriter()
+    yield writer.header()
+    yield writer.object(FONT_REGULAR, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica '
+                                      b'/Encoding /WinAnsiEncoding >>')
+    yield writer.object(FONT_BOLD, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold '
+                                   b'/Encoding /WinAnsiEncoding >>')
+
+    title_ref, columns_ref = writer.reserve(), writer.reserve()
+    yield _form_xobject(writer, title_ref, _fragment('title', title, lambda: _title_content(title)),
+                        PAGE_WIDTH, PAGE_HEIGHT)
+    yield _form_xobject(writer, columns_ref, _fragment(
+        'columns', (columns, widths), lambda: _columns_content(columns, widths)), PAGE_WIDTH, ROW_HEIGHT)
+    xobjects = b'/Title %d 0 R /Cols %d 0 R' % (title_ref, columns_ref)
+    chart_ref = None
+    if chart:
+        chart_ref = writer.reserve()
+        yield _form_xobject(writer, chart_ref, _fragment('chart', chart, lambda: _chart_content(chart)),
+                            PAGE_WIDTH - 2 * MARGIN, CHART_HEIGHT)
+        xobjects += b' /Chart %d 0 R' % chart_ref
+    resources = b'<< %s /XObject << %s >> >>' % (FONT_RESOURCES, xobjects)
+
+    generated = timezone.localtime().strftime('%Y-%m-%d %H:%M')
+    page_refs = []
+    bottom = MARGIN + FOOTER_HEIGHT
+    # Luôn đọc trước một dòng để biết trang hiện tại có phải trang cuối không
+    pending = next(rows, None)
+    exhausted = False
+    while not exhausted:
+        parts = ['q /Title Do Q\n']
+        table_top = PAGE_HEIGHT - MARGIN - TITLE_HEIGHT
+        if chart_ref and not page_refs:
+            table_top -= CHART_HEIGHT + 10
+            parts.append(f'q 1 0 0 1 {MARGIN} {table_top + 10} cm /Chart Do Q\n')
+        parts.append(f'q 1 0 0 1 0 {table_top - ROW_HEIGHT} cm /Cols Do Q\n')
+
+        y = table_top - ROW_HEIGHT
+        per_page = int((y - bottom) // ROW_HEIGHT)
+        page_rows = []
+        while pending is not None and len(page_rows) < per_page:
+            page_rows.append(pending)
+            pending = next(rows, None)
+        for row in page_rows:
+            y -= ROW_HEIGHT
+            x = MARGIN
+            for value, width in zip(row, widths):
+                if value:
+                    parts.append(_text_op(x + 2, y + 4, pdf_text(value, width)))
+                x += width
+        exhausted = pending is None
+        page_number = len(page_refs) + 1
+        parts.append(_text_op(MARGIN, MARGIN, f'Trang {page_number} - {generated}', 'F1', 7))
+
+        content_ref, page_ref = writer.reserve(), writer.reserve()
+        yield writer.stream(content_ref, zlib.compress(''.join(parts).encode('latin-1')))
+        yield writer.object(page_ref, b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] '
+                                      b'/Resources %s /Contents %d 0 R >>' % (
+                                          PAGES, PAGE_WIDTH, PAGE_HEIGHT, resources, content_ref))
+        page_refs.append(page_ref)
+
+    kids = b' '.join(b'%d 0 R' % ref for ref in page_refs)
+    yield writer.object(PAGES, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_refs)))
+    yield writer.object(CATALOG, b'<< /Type /Catalog /Pages %d 0 R >>' % PAGES)
+    yield writer.trailer()
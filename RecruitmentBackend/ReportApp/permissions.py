@@ -1,13 +1,44 @@
 from rest_framework.permissions import BasePermission
+from AuthApp.roles import active_role_name
+
+from .services import report_user
 
 class IsRecruiter(BasePermission):
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.active_role and request.user.active_role.name == 'Recruiter'
+        return request.user.is_authenticated and active_role_name(request.user) == 'Recruiter'
 
 class IsJobSeeker(BasePermission):
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.active_role and request.user.active_role.name == 'JobSeeker'
+        return request.user.is_authenticated and active_role_name(request.user) == 'JobSeeker'
 
 class IsAdminUser(BasePermission):
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.active_role and request.user.active_role.name == 'Admin'
+        return request.user.is_authenticated and active_role_name(request.user) == 'Admin'
+
+
+# Vai trò được xem từng loại báo cáo tùy chỉnh (GenerateCustomReportView, báo cáo chạy nền).
+# Loại không có trong bảng chỉ dành cho quản trị viên.
+REPORT_ROLES = {
+    'recruiter_stats': 'Recruiter',
+    'recruiter_job_performance': 'Recruiter',
+    'recruiter_applicant_status': 'Recruiter',
+    'jobseeker_resume_views': 'JobSeeker',
+    'jobseeker_response_rate': 'JobSeeker',
+    'jobseeker_application_history': 'JobSeeker',
+}
+
+def report_params(request, report_type, params):
+    """
+    params để tính report_type cho request, hoặc None nếu vai trò hiện tại không được xem.
+    Báo cáo cá nhân luôn tính cho chính người gọi; chỉ quản trị viên được chọn user_id
+    (user_id thiếu hoặc không tồn tại: ReportParamsError).
+    """
+    role = active_role_name(request.user)
+    required = REPORT_ROLES.get(report_type, 'Admin')
+    if role == 'Admin':
+        if required != 'Admin':
+            report_user(params)
+        return params
+    if role != required:
+        return None
+    return {**params, 'user_id': str(request.user.pk)}
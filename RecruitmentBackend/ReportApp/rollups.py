@@ -0,0 +1,241 @@
+"""
+Bảng tổng hợp cho báo cáo: DailyFact (theo ngày), JobFact (theo tin), RecruiterDailyFact
+(theo nhà tuyển dụng và ngày).
+
+Các bảng được cập nhật dần bằng UPDATE ... = cột + n từ signals của ApplicationApp và JobApp,
+trong cùng transaction với thay đổi gốc. Lệnh rebuild_report_rollups tính lại toàn bộ từ dữ liệu gốc.
+Số hồ sơ Hired / phỏng vấn Completed được ghi theo ngày đổi trạng thái nên tổng các ngày
+bằng số hiện tại.
+"""
+from collections import defaultdict
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Min, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ApplicationApp.models import Application, ApplicationStatus, Interview, InterviewStatus
+from JobApp.models import JobPosting
+
+from .cache import bump_table_version
+from .models import DailyFact, JobFact, RecruiterDailyFact
+
+BULK_BATCH_SIZE = 1000
+
+
+def _day(value=None):
+    return timezone.localdate(value) if value else timezone.localdate()
+
+
+def _bump(model, keys, deltas, defaults=None, create=True):
+    """Cộng deltas vào dòng có khóa keys, tạo dòng nếu chưa có (create=True)."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if model is DailyFact:
+        bump_table_version(DailyFact)
+    if model.objects.filter(**keys).update(**updates) or not create:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**keys, **(defaults or {}), **deltas)
+    except IntegrityError:
+        # Request khác vừa tạo dòng này
+        model.objects.filter(**keys).update(**updates)
+
+
+def _bump_recruiter(recruiter_profile_id, day, deltas, create=True):
+    if recruiter_profile_id:
+        _bump(RecruiterDailyFact, {'recruiter_profile_id': recruiter_profile_id, 'date': day}, deltas,
+              create=create)
+
+
+def _job_recruiter_id(application):
+    if Application.job_posting.is_cached(application):
+        return application.job_posting.recruiter_profile_id
+    return JobPosting.objects.filter(pk=application.job_posting_id).values_list(
+        'recruiter_profile_id', flat=True).first()
+
+
+def _is_hired(status):
+    return 1 if status == ApplicationStatus.HIRED else 0
+
+
+# --- Tin tuyển dụng ---
+
+def job_created(job):
+    day = _day(job.created_at)
+    _bump(DailyFact, {'date': day}, {'jobs_created': 1})
+    _bump_recruiter(job.recruiter_profile_id, day, {'jobs_created': 1})
+    JobFact.objects.get_or_create(job_id=job.pk, defaults={'recruiter_profile_id': job.recruiter_profile_id})
+
+
+def job_deleting(job):
+    """Gọi trước khi xóa tin (pre_delete): JobFact còn tồn tại để gỡ mốc hồ sơ đầu tiên."""
+    first_day = JobFact.objects.filter(job_id=job.pk).values_list('first_application_on', flat=True).first()
+    if first_day:
+        JobFact.objects.filter(job_id=job.pk).update(first_application_on=None)
+        _bump(DailyFact, {'date': first_day}, {'jobs_first_application': -1}, create=False)
+
+
+def job_deleted(job):
+    day = _day(job.created_at)
+    _bump(DailyFact, {'date': day}, {'jobs_created': -1}, create=False)
+    _bump_recruiter(job.recruiter_profile_id, day, {'jobs_created': -1}, create=False)
+
+
+# --- Hồ sơ ứng tuyển ---
+
+def application_created(application):
+    day = _day(application.applied_at)
+    hired = _is_hired(application.status)
+    recruiter_id = _job_recruiter_id(application)
+    _bump(DailyFact, {'date': day}, {'applications_created': 1, 'hired': hired})
+    _bump_recruiter(recruiter_id, day, {'applications_received': 1, 'hired': hired})
+    _bump(JobFact, {'job_id': application.job_posting_id}, {'applications': 1, 'hired': hired},
+          defaults={'recruiter_profile_id': recruiter_id})
+    # Chỉ một request đặt được mốc hồ sơ đầu tiên của tin
+    if JobFact.objects.filter(job_id=application.job_posting_id, first_application_on__isnull=True).update(
+            first_application_on=day):
+        _bump(DailyFact, {'date': day}, {'jobs_first_application': 1})
+
+
+def application_status_changed(application, old_status, new_status):
+    delta = _is_hired(new_status) - _is_hired(old_status)
+    if not delta:
+        return
+    day = _day()
+    _bump(DailyFact, {'date': day}, {'hired': delta})
+    _bump_recruiter(_job_recruiter_id(application), day, {'hired': delta})
+    _bump(JobFact, {'job_id': application.job_posting_id}, {'hired': delta}, create=False)
+
+
+def application_deleted(application):
+    day = _day(application.applied_at)
+    hired = _is_hired(application.status)
+    recruiter_id = _job_recruiter_id(application)
+    _bump(DailyFact, {'date': day}, {'applications_created': -1}, create=False)
+    _bump_recruiter(recruiter_id, day, {'applications_received': -1}, create=False)
+    if hired:
+        _bump(DailyFact, {'date': _day()}, {'hired': -1})
+        _bump_recruiter(recruiter_id, _day(), {'hired': -1})
+    _bump(JobFact, {'job_id': application.job_posting_id}, {'applications': -1, 'hired': -hired}, create=False)
+
+    # Tin không còn hồ sơ nào: gỡ mốc hồ sơ đầu tiên
+    first_day = JobFact.objects.filter(
+        job_id=application.job_posting_id, applications__lte=0, first_application_on__isnull=False
+    ).values_list('first_application_on', flat=True).first()
+    if first_day and JobFact.objects.filter(
+            job_id=application.job_posting_id, first_application_on=first_day).update(first_application_on=None):
+        _bump(DailyFact, {'date': first_day}, {'jobs_first_application': -1}, create=False)
+
+
+# --- Phỏng vấn ---
+
+def _bump_interviews(interview, delta):
+    if not delta:
+        return
+    _bump(DailyFact, {'date': _day()}, {'interviews_completed': delta})
+    job_id = Application.objects.filter(pk=interview.application_id).values_list('job_posting_id', flat=True).first()
+    if job_id:
+        _bump(JobFact, {'job_id': job_id}, {'interviews_completed': delta}, create=False)
+
+
+def _is_completed(status):
+    return 1 if status == InterviewStatus.COMPLETED else 0
+
+
+def interview_created(interview):
+    _bump_interviews(interview, _is_completed(interview.status))
+
+
+def interview_status_changed(interview, old_status, new_status):
+    _bump_interviews(interview, _is_completed(new_status) - _is_completed(old_status))
+
+
+def interview_deleted(interview):
+    _bump_interviews(interview, -_is_completed(interview.status))
+
+
+# --- Tính lại toàn bộ ---
+
+def _count_by_day(queryset, date_field, **filters):
+    rows = queryset.filter(**filters).annotate(day=TruncDate(date_field)).values('day').annotate(
+        count=Count('pk')).order_by()
+    return {row['day']: row['count'] for row in rows}
+
+
+def _count_by_recruiter_day(queryset, recruiter_field, date_field, **filters):
+    rows = queryset.filter(**filters).exclude(**{f'{recruiter_field}__isnull': True}).annotate(
+        day=TruncDate(date_field)).values(recruiter_field, 'day').annotate(count=Count('pk')).order_by()
+    return {(row[recruiter_field], row['day']): row['count'] for row in rows}
+
+
+@transaction.atomic
+def rebuild_rollups(get_model=apps.get_model):
+    """
+    Tính lại cả ba bảng tổng hợp từ dữ liệu gốc. Trả về số dòng đã ghi mỗi bảng.
+    Migration truyền apps.get_model của mình để chạy trên model lịch sử.
+    """
+    JobPosting = get_model('JobApp', 'JobPosting')
+    Application = get_model('ApplicationApp', 'Application')
+    Interview = get_model('ApplicationApp', 'Interview')
+    DailyFact = get_model('ReportApp', 'DailyFact')
+    JobFact = get_model('ReportApp', 'JobFact')
+    RecruiterDailyFact = get_model('ReportApp', 'RecruiterDailyFact')
+    hired = {'status': ApplicationStatus.HIRED}
+
+    daily = defaultdict(dict)
+    for field, counts in (
+        ('jobs_created', _count_by_day(JobPosting.objects, 'created_at')),
+        ('applications_created', _count_by_day(Application.objects, 'applied_at')),
+        ('hired', _count_by_day(Application.objects, 'updated_at', **hired)),
+        ('interviews_completed', _count_by_day(Interview.objects, 'updated_at', status=InterviewStatus.COMPLETED)),
+    ):
+        for day, count in counts.items():
+            daily[day][field] = count
+
+    jobs = JobPosting.objects.annotate(
+        fact_applications=Count('applications', distinct=True),
+        fact_hired=Count('applications', filter=Q(applications__status=ApplicationStatus.HIRED), distinct=True),
+        fact_interviews=Count('applications__interviews',
+                              filter=Q(applications__interviews__status=InterviewStatus.COMPLETED), distinct=True),
+        fact_first_application=Min('applications__applied_at'),
+    ).values_list('pk', 'recruiter_profile_id', 'fact_applications', 'fact_hired', 'fact_interviews',
+                  'fact_first_application').order_by()
+    job_facts = []
+    for job_id, recruiter_id, applications, hired_count, interviews, first_application in jobs.iterator():
+        first_day = _day(first_application) if first_application else None
+        if first_day:
+            daily[first_day]['jobs_first_application'] = daily[first_day].get('jobs_first_application', 0) + 1
+        job_facts.append(JobFact(
+            job_id=job_id, recruiter_profile_id=recruiter_id, applications=applications, hired=hired_count,
+            interviews_completed=interviews, first_application_on=first_day,
+        ))
+
+    recruiter_daily = defaultdict(dict)
+    for field, counts in (
+        ('jobs_created', _count_by_recruiter_day(JobPosting.objects, 'recruiter_profile_id', 'created_at')),
+        ('applications_received', _count_by_recruiter_day(
+            Application.objects, 'job_posting__recruiter_profile_id', 'applied_at')),
+        ('hired', _count_by_recruiter_day(
+            Application.objects, 'job_posting__recruiter_profile_id', 'updated_at', **hired)),
+    ):
+        for key, count in counts.items():
+            recruiter_daily[key][field] = count
+
+    DailyFact.objects.all().delete()
+    JobFact.objects.all().delete()
+    RecruiterDailyFact.objects.all().delete()
+    DailyFact.objects.bulk_create(
+        [DailyFact(date=day, **fields) for day, fields in daily.items()], batch_size=BULK_BATCH_SIZE)
+    JobFact.objects.bulk_create(job_facts, batch_size=BULK_BATCH_SIZE)
+    RecruiterDailyFact.objects.bulk_create(
+        [RecruiterDailyFact(recruiter_profile_id=recruiter_id, date=day, **fields)
+         for (recruiter_id, day), fields in recruiter_daily.items()],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    bump_table_version(DailyFact)
+    return {'daily': len(daily), 'jobs': len(job_facts), 'recruiter_daily': len(recruiter_daily)}
@@ -1,5 +1,7 @@
 from rest_framework import serializers
+from django.urls import reverse
 from uuid import UUID
+from .models import ReportJob, ReportJobStatus
 
 # 1,2,3 - Báo cáo Nhà tuyển dụng
 class RecruiterJobBasicStatSerializer(serializers.Serializer):
@@ -93,3 +95,20 @@ class CustomReportSerializer(serializers.Serializer):
 class CustomMetricsSerializer(serializers.Serializer):
     average_applications_per_job = serializers.FloatField(allow_null=True)
     overall_hired_ratio = serializers.FloatField()
+
+# 15 - Báo cáo chạy nền
+class ReportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = ('id', 'report_type', 'file_format', 'params', 'status', 'error',
+                  'created_at', 'started_at', 'finished_at', 'expires_at', 'download_url')
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != ReportJobStatus.DONE:
+            return None
+        url = reverse('report-job-download', kwargs={'pk': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
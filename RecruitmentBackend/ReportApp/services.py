@@ -1,68 +1,91 @@
-from django.db.models import Count, Q, Avg, F
-from ApplicationApp.models import Application, ApplicationStatus, Interview
+from django.db.models import Count, Q, Avg, F, Sum
+from django.db.models.functions import Coalesce
+from ApplicationApp.models import Application, ApplicationStatus, Interview, InterviewStatus
 from JobApp.models import JobPosting
 from ResumeApp.models import Resume, JobSeekerProfile
 from django.contrib.auth import get_user_model
-from django.utils.timezone import now
-from datetime import timedelta
+from django.utils.timezone import make_aware, now
+from datetime import datetime, time, timedelta
+from uuid import UUID
+from NotificationApp.models import Notification
+from .cache import cached_report
+from .models import DailyFact
 
 User = get_user_model()
 
+def _recruiter_jobs(user):
+    # Truy vấn GROUP BY bỏ qua Meta.ordering nên ghi rõ thứ tự
+    return JobPosting.objects.filter(recruiter_profile__user=user).order_by('-created_at')
+
 # 1. Thống kê hồ sơ ứng tuyển, tỉ lệ tuyển thành công, phỏng vấn hoàn thành
 def get_recruiter_stats(user):
-    recruiter_profile = user.recruiter_profile
-    jobs = JobPosting.objects.filter(recruiter_profile=recruiter_profile)
+    # Một câu GROUP BY cho mọi tin; JOIN interviews nhân bản dòng nên đếm distinct
+    jobs = _recruiter_jobs(user).values('id', 'title').annotate(
+        total_applications=Count('applications', distinct=True),
+        hired_count=Count('applications', filter=Q(applications__status=ApplicationStatus.HIRED), distinct=True),
+        interview_completed=Count(
+            'applications__interviews',
+            filter=Q(applications__interviews__status=InterviewStatus.COMPLETED),
+            distinct=True,
+        ),
+    )
 
     data = []
     for job in jobs:
-        total_apps = job.applications.count()
-        hired = job.applications.filter(status=ApplicationStatus.HIRED).count()
-        interviewed = Interview.objects.filter(application__job_posting=job, status='Completed').count()
+        total_apps = job['total_applications']
+        hired = job['hired_count']
         data.append({
-            'job_id': job.id,
-            'job_title': job.title,
+            'job_id': job['id'],
+            'job_title': job['title'],
             'total_applications': total_apps,
             'hired_count': hired,
-            'interview_completed': interviewed,
+            'interview_completed': job['interview_completed'],
             'hired_ratio': hired / total_apps if total_apps else 0,
         })
     return data
 
 # 2. Báo cáo hiệu quả từng tin tuyển dụng: lượt xem, lượt ứng tuyển, thời gian trung bình tuyển được
 def get_recruiter_job_performance(user):
-    recruiter_profile = user.recruiter_profile
-    jobs = JobPosting.objects.filter(recruiter_profile=recruiter_profile)
+    jobs = _recruiter_jobs(user).values('id', 'title', 'views_count').annotate(
+        total_applications=Count('applications'),
+        avg_time_to_hire=Avg(
+            F('applications__updated_at') - F('applications__applied_at'),
+            filter=Q(applications__status=ApplicationStatus.HIRED),
+        ),
+    )
 
     data = []
     for job in jobs:
-        total_apps = job.applications.count()
-        avg_time_to_hire = job.applications.filter(status=ApplicationStatus.HIRED).aggregate(
-            avg_days=Avg(F('updated_at') - F('applied_at'))
-        )['avg_days']
+        avg_time_to_hire = job['avg_time_to_hire']
         data.append({
-            'job_id': job.id,
-            'job_title': job.title,
-            'views_count': job.views_count,
-            'total_applications': total_apps,
+            'job_id': job['id'],
+            'job_title': job['title'],
+            'views_count': job['views_count'],
+            'total_applications': job['total_applications'],
             'avg_time_to_hire_days': avg_time_to_hire.days if avg_time_to_hire else None,
         })
     return data
 
 # 3. Tỉ lệ ứng viên theo trạng thái ứng tuyển
 def get_recruiter_applicant_status(user):
-    recruiter_profile = user.recruiter_profile
-    jobs = JobPosting.objects.filter(recruiter_profile=recruiter_profile)
+    jobs = _recruiter_jobs(user).values_list('id', 'title')
 
     statuses = [choice[0] for choice in ApplicationStatus.choices]
+    # Đếm theo (tin, trạng thái) trong một câu GROUP BY cho cả recruiter
+    counts = {}
+    grouped = Application.objects.filter(recruiter_profile__user=user).values(
+        'job_posting', 'status'
+    ).annotate(count=Count('id')).order_by()
+    for item in grouped:
+        counts.setdefault(item['job_posting'], {})[item['status']] = item['count']
+
     data = []
-    for job in jobs:
-        counts = job.applications.values('status').annotate(count=Count('id'))
+    for job_id, title in jobs:
         count_dict = {status: 0 for status in statuses}
-        for item in counts:
-            count_dict[item['status']] = item['count']
+        count_dict.update(counts.get(job_id, {}))
         data.append({
-            'job_id': job.id,
-            'job_title': job.title,
+            'job_id': job_id,
+            'job_title': title,
             'status_counts': count_dict
         })
     return data
@@ -81,9 +104,13 @@ def get_jobseeker_resume_views(user):
     resumes = Resume.objects.filter(job_seeker=profile)
     total_resume_views = resumes.count()  # nếu có lượt xem riêng hồ sơ, bạn nên lưu trường view count trong Resume
 
-    applications = Application.objects.filter(job_seeker=user)
-    total_applications = applications.count()
-    total_job_views = sum(app.job_posting.views_count for app in applications)
+    # Đếm và cộng lượt xem tin trong một câu, không nạp từng tin tuyển dụng
+    totals = Application.objects.filter(job_seeker=user).aggregate(
+        total_applications=Count('id'),
+        total_job_views=Coalesce(Sum('job_posting__views_count'), 0),
+    )
+    total_applications = totals['total_applications']
+    total_job_views = totals['total_job_views']
 
     return {
         'user': user.username,
@@ -107,15 +134,17 @@ def get_jobseeker_response_rate(user):
 
 # 7. Lịch sử ứng tuyển chi tiết
 def get_jobseeker_application_history(user):
-    applications = Application.objects.filter(job_seeker=user).order_by('-applied_at')
+    applications = Application.objects.filter(job_seeker=user).order_by('-applied_at').values(
+        'job_posting__title', 'status', 'applied_at', 'updated_at', 'cover_letter'
+    )
     history = []
     for app in applications:
         history.append({
-            'job_title': app.job_posting.title,
-            'status': app.status,
-            'applied_at': app.applied_at,
-            'updated_at': app.updated_at,
-            'cover_letter': app.cover_letter,
+            'job_title': app['job_posting__title'],
+            'status': app['status'],
+            'applied_at': app['applied_at'],
+            'updated_at': app['updated_at'],
+            'cover_letter': app['cover_letter'],
         })
     return history
 
@@ -139,44 +168,54 @@ def get_jobseeker_job_suggestions(user):
     return suggestions
 
 # 9. Tổng quan hệ thống: số lượng user theo vai trò, tin tuyển dụng, ứng tuyển
+@cached_report('system_summary', (User, DailyFact))
 def get_system_summary():
     user_counts = User.objects.values('active_role__name').annotate(count=Count('id'))
-    total_jobs = JobPosting.objects.count()
-    total_applications = Application.objects.count()
+    # Tổng tin/hồ sơ đọc từ bảng tổng hợp theo ngày (ReportApp/rollups.py)
+    totals = DailyFact.objects.aggregate(
+        total_jobs=Coalesce(Sum('jobs_created'), 0),
+        total_applications=Coalesce(Sum('applications_created'), 0),
+    )
     return {
         'user_counts': list(user_counts),
-        'total_jobs': total_jobs,
-        'total_applications': total_applications,
+        'total_jobs': totals['total_jobs'],
+        'total_applications': totals['total_applications'],
     }
 
 # 10. Xu hướng tuyển dụng theo thời gian (tuần, tháng)
+@cached_report('system_trends', (DailyFact,))
 def get_system_trends(period='month'):
-    # Ví dụ đếm số tin tuyển dụng theo tháng
+    # Đếm số tin tuyển dụng theo tháng/tuần từ bảng tổng hợp theo ngày
     from django.db.models.functions import TruncMonth, TruncWeek
     if period == 'month':
-        jobs_trends = JobPosting.objects.annotate(month=TruncMonth('created_at')).values('month').annotate(count=Count('id')).order_by('month')
+        trunc = TruncMonth('date')
     elif period == 'week':
-        jobs_trends = JobPosting.objects.annotate(week=TruncWeek('created_at')).values('week').annotate(count=Count('id')).order_by('week')
+        trunc = TruncWeek('date')
     else:
-        jobs_trends = []
-    return list(jobs_trends)
+        return []
+    rows = DailyFact.objects.filter(jobs_created__gt=0).annotate(**{period: trunc}).values(period).annotate(
+        count=Sum('jobs_created')).order_by(period)
+    # Giữ kiểu datetime như khi đếm trực tiếp trên JobPosting.created_at
+    return [
+        {period: make_aware(datetime.combine(row[period], time.min)), 'count': row['count']}
+        for row in rows
+    ]
 
 # 11. Thống kê hiệu quả các thông báo (giả định bạn có model Notification với trạng thái)
+@cached_report('system_notifications', (Notification,))
 def get_system_notifications_report():
-    from NotificationApp.models import Notification
-
-    total_notifications = Notification.objects.count()
-    read_notifications = Notification.objects.filter(is_read=True).count()
-    unread_notifications = Notification.objects.filter(is_read=False).count()
+    totals = Notification.objects.aggregate(
+        total_notifications=Count('id'),
+        read_notifications=Count('id', filter=Q(is_read=True)),
+    )
 
     # Thống kê theo loại thông báo
-    type_counts = Notification.objects.values('notification_type').annotate(count=Count('id'))
-
+    type_counts = Notification.objects.values('notification_type').annotate(count=Count('id')).order_by()
 
     return {
-        'total_notifications': total_notifications,
-        'read_notifications': read_notifications,
-        'unread_notifications': unread_notifications,
+        'total_notifications': totals['total_notifications'],
+        'read_notifications': totals['read_notifications'],
+        'unread_notifications': totals['total_notifications'] - totals['read_notifications'],
         'counts_by_type': list(type_counts),
     }
 
@@ -185,34 +224,64 @@ def get_system_notifications_report():
 def generate_custom_report(params):
     # Ví dụ params có thể gồm 'user_id', 'job_id', 'date_from', 'date_to', 'report_type'
     # Viết logic tùy theo report_type để gọi hàm phù hợp và lọc dữ liệu theo ngày, user, job
-    report_type = params.get('report_type')
-    if report_type == 'recruiter_stats':
-        user = User.objects.get(id=params.get('user_id'))
-        return get_recruiter_stats(user)
-    # mở rộng các loại báo cáo khác
-    return {}
-
-# 13. Xuất báo cáo ra file (PDF, Excel)
-def export_report_to_file(report_data, file_format='excel'):
-    import io
-    if file_format == 'excel':
-        import pandas as pd
-        df = pd.DataFrame(report_data)
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            df.to_excel(writer, index=False)
-        return output.getvalue()  # trả về bytes file
-    elif file_format == 'pdf':
-        # Có thể dùng reportlab hoặc thư viện tương tự để tạo pdf
-        pass
-    return None
+    report = CUSTOM_REPORTS.get(params.get('report_type'))
+    if report is None:
+        # mở rộng các loại báo cáo khác trong CUSTOM_REPORTS
+        return {}
+    return report(params)
+
+# 13. Xuất báo cáo ra file (CSV, Excel): xem ReportApp/exports.py
 
 # 14. Lấy các chỉ số KPI tùy chỉnh
+@cached_report('custom_metrics', (DailyFact,))
 def get_custom_metrics():
     # Ví dụ trả về số lượng tuyển dụng trung bình theo ngành, tỉ lệ duyệt hồ sơ,...
-    avg_app_per_job = Application.objects.values('job_posting').annotate(count=Count('id')).aggregate(avg=Avg('count'))['avg']
-    hired_ratio = Application.objects.filter(status=ApplicationStatus.HIRED).count() / Application.objects.count() if Application.objects.count() else 0
+    totals = DailyFact.objects.aggregate(
+        applications=Coalesce(Sum('applications_created'), 0),
+        jobs_with_applications=Coalesce(Sum('jobs_first_application'), 0),
+        hired=Coalesce(Sum('hired'), 0),
+    )
+    applications = totals['applications']
+    jobs_with_applications = totals['jobs_with_applications']
     return {
-        'average_applications_per_job': avg_app_per_job,
-        'overall_hired_ratio': hired_ratio,
+        'average_applications_per_job': applications / jobs_with_applications if jobs_with_applications else None,
+        'overall_hired_ratio': totals['hired'] / applications if applications else 0,
     }
+
+
+class ReportParamsError(ValueError):
+    """Tham số báo cáo không hợp lệ; view trả về 400 trước khi tính hoặc ghi báo cáo."""
+
+
+def uuid_param(params, name):
+    """params[name] dạng UUID, None nếu không truyền."""
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return UUID(str(value))
+    except ValueError:
+        raise ReportParamsError(f'{name} không hợp lệ.')
+
+
+# Các loại báo cáo dùng được qua generate_custom_report (xuất file, báo cáo chạy nền)
+def report_user(params):
+    """Người dùng params['user_id'] mà báo cáo cá nhân được tính cho."""
+    user_id = uuid_param(params, 'user_id')
+    user = User.objects.filter(id=user_id).first() if user_id else None
+    if user is None:
+        raise ReportParamsError('Không tìm thấy người dùng user_id.')
+    return user
+
+CUSTOM_REPORTS = {
+    'recruiter_stats': lambda params: get_recruiter_stats(report_user(params)),
+    'recruiter_job_performance': lambda params: get_recruiter_job_performance(report_user(params)),
+    'recruiter_applicant_status': lambda params: get_recruiter_applicant_status(report_user(params)),
+    'jobseeker_resume_views': lambda params: get_jobseeker_resume_views(report_user(params)),
+    'jobseeker_response_rate': lambda params: get_jobseeker_response_rate(report_user(params)),
+    'jobseeker_application_history': lambda params: get_jobseeker_application_history(report_user(params)),
+    'system_summary': lambda params: get_system_summary(),
+    'system_trends': lambda params: get_system_trends(params.get('period', 'month')),
+    'system_notifications': lambda params: get_system_notifications_report(),
+    'custom_metrics': lambda params: get_custom_metrics(),
+}
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.apps import apps
+
+from .cache import bump_table_version
+
+MyUser = apps.get_model('AuthApp', 'MyUser')
+Notification = apps.get_model('NotificationApp', 'Notification')
+
+# Báo cáo hệ thống đọc trực tiếp các bảng này (bảng tổng hợp được bump trong ReportApp/rollups.py)
+@receiver(post_delete, sender=MyUser)
+@receiver([post_save, post_delete], sender=Notification)
+def report_table_changed(sender, **kwargs):
+    bump_table_version(sender)
+
+@receiver(post_save, sender=MyUser)
+def report_user_saved(sender, instance, created, **kwargs):
+    # Báo cáo chỉ đếm người dùng theo active_role: bỏ qua đăng nhập (last_login), sửa hồ sơ...
+    if created or instance.has_changed('active_role'):
+        bump_table_version(sender)
@@ -1,3 +1,222 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from AuthApp.models import Role, UserRole
+from ApplicationApp.models import Application, ApplicationStatus, Interview, InterviewStatus
+from JobApp.models import JobPosting, JobStatus, RecruiterProfile
+from ResumeApp.models import JobSeekerProfile
+from . import services
+from .activity import ActivityRecorder
+from .cache import get_table_versions
+from .models import ActivityLog, ReportJob
+
+User = get_user_model()
+
+
+class GroupedReportQueryCountTests(TestCase):
+    """Số query của các báo cáo theo tin/hồ sơ không phụ thuộc số tin tuyển dụng."""
+
+    def setUp(self):
+        cache.clear()
+        self.recruiter = RecruiterProfile.objects.create(
+            user=User.objects.create_user(username='recruiter', email='recruiter@example.com'),
+            company_name='Công ty A',
+        )
+        self.seekers = [User.objects.create_user(username=f'seeker{i}', email=f'seeker{i}@example.com')
+                        for i in range(3)]
+        for seeker in self.seekers:
+            JobSeekerProfile.objects.create(user=seeker)
+        self.job_count = 0
+        self.add_jobs(2)
+
+    def add_jobs(self, count):
+        statuses = [ApplicationStatus.APPLIED, ApplicationStatus.OFFERED, ApplicationStatus.HIRED]
+        for _ in range(count):
+            self.job_count += 1
+            job = JobPosting.objects.create(recruiter_profile=self.recruiter, title=f'Job {self.job_count}',
+                                            description='Mô tả', location='Hà Nội', status=JobStatus.APPROVED)
+            for seeker, status in zip(self.seekers, statuses):
+                application = Application.objects.create(job_seeker=seeker, job_posting=job, status=status)
+                Interview.objects.create(application=application, scheduled_at=application.applied_at,
+                                         status=InterviewStatus.COMPLETED)
+
+    def assertConstantQueries(self, num, report, user, rows=None):
+        with self.assertNumQueries(num):
+            before = report(user)
+        self.add_jobs(5)
+        with self.assertNumQueries(num):
+            after = report(user)
+        if rows is not None:
+            self.assertEqual((len(before), len(after)), (rows, rows + 5))
+        return after
+
+    def test_recruiter_stats(self):
+        data = self.assertConstantQueries(1, services.get_recruiter_stats, self.recruiter.user, rows=2)
+        self.assertEqual(data[0]['total_applications'], 3)
+        self.assertEqual(data[0]['hired_count'], 1)
+        self.assertEqual(data[0]['interview_completed'], 3)
+
+    def test_recruiter_job_performance(self):
+        data = self.assertConstantQueries(1, services.get_recruiter_job_performance, self.recruiter.user, rows=2)
+        self.assertEqual(data[0]['total_applications'], 3)
+
+    def test_recruiter_applicant_status(self):
+        data = self.assertConstantQueries(2, services.get_recruiter_applicant_status, self.recruiter.user, rows=2)
+        self.assertEqual(data[0]['status_counts'][ApplicationStatus.OFFERED], 1)
+        self.assertEqual(data[0]['status_counts'][ApplicationStatus.REJECTED], 0)
+
+    def test_jobseeker_resume_views(self):
+        data = self.assertConstantQueries(2, services.get_jobseeker_resume_views, self.seekers[0])
+        self.assertEqual(data['total_applications'], 7)
+
+    def test_jobseeker_application_history(self):
+        data = self.assertConstantQueries(1, services.get_jobseeker_application_history, self.seekers[0], rows=2)
+        self.assertEqual(data[0]['job_title'], 'Job 7')
+
+
+def create_user(username, role_name):
+    user = User.objects.create_user(username=username, email=f'{username}@example.com')
+    role, _ = Role.objects.get_or_create(name=role_name)
+    UserRole.objects.create(user=user, role=role, is_approved=True)
+    user.active_role = role
+    user.save()
+    return user
+
+
+class ReportParamsTests(TestCase):
+    """Tham số sai trả về 400 trước khi bắt đầu ghi file hay nhận báo cáo chạy nền."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(create_user('admin', Role.ADMIN))
+
+    def test_export_rejects_invalid_job_id(self):
+        for params in [{'job_id': 'abc'}, {'date_from': '2024-02-30'}]:
+            response = self.client.get('/export/', {'type': 'applications', 'format': 'csv', **params})
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('error', response.json())
+
+    def test_export_streams_with_valid_job_id(self):
+        response = self.client.get('/export/', {'type': 'applications', 'format': 'csv',
+                                                'job_id': '00000000-0000-0000-0000-000000000000'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(b''.join(response.streaming_content).decode('utf-8-sig').splitlines()), 1)
+
+    def test_report_job_rejects_invalid_job_id(self):
+        response = self.client.post('/report-jobs/', {'report_type': 'applications', 'format': 'csv',
+                                                      'params': {'job_id': 'abc'}}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ReportJob.objects.exists())
+
+
+class CustomReportPermissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.recruiters = [create_user(f'recruiter{i}', Role.RECRUITER) for i in range(2)]
+        for i, user in enumerate(self.recruiters):
+            profile = RecruiterProfile.objects.create(user=user, company_name=f'Công ty {i}')
+            JobPosting.objects.create(recruiter_profile=profile, title=f'Job {i}', description='Mô tả',
+                                      location='Hà Nội', status=JobStatus.APPROVED)
+
+    def report(self, user, **params):
+        self.client.force_authenticate(user)
+        return self.client.post('/generate/', params, format='json')
+
+    def test_personal_report_uses_caller(self):
+        response = self.report(self.recruiters[0], report_type='recruiter_stats', user_id=str(self.recruiters[1].pk))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['job_title'] for row in response.json()['data']], ['Job 0'])
+
+    def test_other_roles_are_forbidden(self):
+        seeker = create_user('seeker', Role.JOB_SEEKER)
+        for report_type in ['recruiter_stats', 'system_summary', 'custom_metrics', 'unknown']:
+            self.assertEqual(self.report(seeker, report_type=report_type).status_code, 403, report_type)
+        self.assertEqual(self.report(self.recruiters[0], report_type='system_summary').status_code, 403)
+
+    def test_admin_chooses_user(self):
+        admin = create_user('admin', Role.ADMIN)
+        response = self.report(admin, report_type='recruiter_stats', user_id=str(self.recruiters[1].pk))
+        self.assertEqual([row['job_title'] for row in response.json()['data']], ['Job 1'])
+        for user_id in [None, 'abc', '00000000-0000-0000-0000-000000000000']:
+            params = {'user_id': user_id} if user_id else {}
+            response = self.report(admin, report_type='recruiter_stats', **params)
+            self.assertEqual(response.status_code, 400, user_id)
+        self.assertEqual(self.report(admin, report_type='system_summary').status_code, 200)
+
+
+class ReportJobPermissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.seeker = create_user('seeker', Role.JOB_SEEKER)
+        JobSeekerProfile.objects.create(user=self.seeker)
+        self.client.force_authenticate(self.seeker)
+
+    def submit(self, report_type, **params):
+        return self.client.post('/report-jobs/', {'report_type': report_type, 'params': params}, format='json')
+
+    def test_report_job_uses_report_permissions(self):
+        for report_type in ['system_summary', 'recruiter_stats', 'custom_metrics']:
+            self.assertEqual(self.submit(report_type).status_code, 403, report_type)
+        self.assertFalse(ReportJob.objects.exists())
+
+    def test_personal_report_job_is_for_caller(self):
+        other = create_user('other', Role.JOB_SEEKER)
+        response = self.submit('jobseeker_resume_views', user_id=str(other.pk))
+        self.assertEqual(response.status_code, 202)
+        job = ReportJob.objects.get()
+        self.assertEqual(job.params['user_id'], str(self.seeker.pk))
+        # Yêu cầu trùng dùng lại job đang chờ
+        response = self.submit('jobseeker_resume_views')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ReportJob.objects.count(), 1)
+
+
+class UserTableVersionTests(TestCase):
+    """Chỉ thay đổi ảnh hưởng báo cáo (tạo, xóa, đổi active_role) mới làm mất cache báo cáo hệ thống."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user('seeker', Role.JOB_SEEKER)
+
+    def assertBumped(self, bumped, func):
+        before = get_table_versions([User])
+        with self.captureOnCommitCallbacks(execute=True):
+            func()
+        self.assertEqual(get_table_versions([User]) != before, bumped)
+
+    def test_login_and_profile_edits_keep_version(self):
+        self.assertBumped(False, lambda: update_last_login(None, self.user))
+        self.user.first_name = 'An'
+        self.assertBumped(False, self.user.save)
+
+    def test_role_change_create_and_delete_bump_version(self):
+        self.user.active_role, _ = Role.objects.get_or_create(name=Role.RECRUITER)
+        self.assertBumped(True, self.user.save)
+        self.assertBumped(True, lambda: create_user('other', Role.JOB_SEEKER))
+        self.assertBumped(True, self.user.delete)
+
+
+class ActivityRecorderTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com')
+        self.recorder = ActivityRecorder()
+
+    def entry(self):
+        return ActivityLog(user=self.user, action='Đăng tin', target='Backend Developer')
+
+    @override_settings(ACTIVITY_LOG={'FLUSH_INTERVAL': 0})
+    def test_failed_inline_flush_keeps_entries_buffered(self):
+        with mock.patch('ReportApp.activity.ActivityLog.objects.bulk_create', side_effect=DatabaseError), \
+                self.assertLogs('ReportApp.activity', 'ERROR'):
+            self.recorder.add(self.entry())
+        self.recorder.add(self.entry())
+        self.assertEqual(ActivityLog.objects.filter(user=self.user).count(), 2)
@@ -0,0 +1,201 @@
+"""
+Chuỗi thời gian cho báo cáo: nhiều chỉ số, độ chia hour/day/week/month, khoảng from-to
+và lọc theo job_type, location, recruiter.
+
+- Độ chia từ ngày trở lên, không lọc hoặc chỉ lọc recruiter: đọc bảng tổng hợp
+  (DailyFact / RecruiterDailyFact), tối đa một dòng mỗi ngày trong khoảng.
+- Còn lại (theo giờ, lọc job_type/location): GROUP BY trên bảng gốc, giới hạn bằng
+  điều kiện khoảng thời gian trên cột đã đánh index.
+Mọi mốc trong khoảng đều có mặt (mốc không có dữ liệu = 0); kết quả dạng cột:
+danh sách mốc và mỗi chỉ số một mảng giá trị cùng độ dài.
+"""
+import uuid
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+
+from django.db.models import Count
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from ApplicationApp.models import Application, ApplicationStatus, Interview, InterviewStatus
+from JobApp.models import JobPosting, JobType
+
+from .models import DailyFact, RecruiterDailyFact
+
+GRANULARITIES = ('hour', 'day', 'week', 'month')
+DIMENSIONS = ('job_type', 'location', 'recruiter')
+MAX_BUCKETS = 5000
+# Khoảng mặc định (tính ngược từ hôm nay) khi không truyền from
+DEFAULT_SPAN_DAYS = {'hour': 1, 'day': 30, 'week': 26 * 7, 'month': 365}
+
+# rollup: cột trong DailyFact; recruiter_rollup: cột trong RecruiterDailyFact (None = không có);
+# raw: (model, cột thời gian, điều kiện, tiền tố tới JobPosting)
+Metric = namedtuple('Metric', 'rollup recruiter_rollup model date_field filters job_prefix')
+
+METRICS = {
+    'jobs': Metric('jobs_created', 'jobs_created', JobPosting, 'created_at', {}, ''),
+    'applications': Metric('applications_created', 'applications_received', Application, 'applied_at', {},
+                           'job_posting__'),
+    # Theo bảng gốc, hồ sơ Hired được tính vào ngày cập nhật cuối (như rebuild_rollups)
+    'hired': Metric('hired', 'hired', Application, 'updated_at', {'status': ApplicationStatus.HIRED},
+                    'job_posting__'),
+    'interviews_completed': Metric('interviews_completed', None, Interview, 'updated_at',
+                                   {'status': InterviewStatus.COMPLETED}, 'application__job_posting__'),
+}
+
+
+class TimeSeriesError(ValueError):
+    pass
+
+
+def _month_start(day):
+    return day.replace(day=1)
+
+
+def _next_month(day):
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _bucket_of(day, granularity):
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return _month_start(day)
+    return day
+
+
+def _local_midnight(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def build_buckets(granularity, date_from, date_to):
+    """Các mốc từ date_from tới date_to (gồm cả hai ngày): date, hoặc datetime theo giờ."""
+    buckets = []
+    if granularity == 'hour':
+        current, end = datetime.combine(date_from, time.min), datetime.combine(date_to + timedelta(days=1), time.min)
+        while current < end and len(buckets) <= MAX_BUCKETS:
+            buckets.append(timezone.make_aware(current))
+            current += timedelta(hours=1)
+    else:
+        current = _bucket_of(date_from, granularity)
+        while current <= date_to and len(buckets) <= MAX_BUCKETS:
+            buckets.append(current)
+            if granularity == 'month':
+                current = _next_month(current)
+            else:
+                current += timedelta(days=7 if granularity == 'week' else 1)
+    if len(buckets) > MAX_BUCKETS:
+        raise TimeSeriesError(f'Khoảng thời gian quá dài: tối đa {MAX_BUCKETS} mốc.')
+    return buckets
+
+
+def _rollup_counts(metric, granularity, date_from, date_to, dimensions):
+    if 'recruiter' in dimensions:
+        rows = RecruiterDailyFact.objects.filter(recruiter_profile_id=dimensions['recruiter'])
+        field = metric.recruiter_rollup
+    else:
+        rows = DailyFact.objects.all()
+        field = metric.rollup
+    rows = rows.filter(date__range=(date_from, date_to)).values_list('date', field).order_by()
+    counts = {}
+    for day, value in rows:
+        bucket = _bucket_of(day, granularity)
+        counts[bucket] = counts.get(bucket, 0) + value
+    return counts
+
+
+def _raw_counts(metric, granularity, date_from, date_to, dimensions):
+    prefix = metric.job_prefix
+    filters = {
+        **metric.filters,
+        f'{metric.date_field}__gte': _local_midnight(date_from),
+        f'{metric.date_field}__lt': _local_midnight(date_to + timedelta(days=1)),
+    }
+    if 'job_type' in dimensions:
+        filters[f'{prefix}job_type'] = dimensions['job_type']
+    if 'location' in dimensions:
+        filters[f'{prefix}location__icontains'] = dimensions['location']
+    if 'recruiter' in dimensions:
+        filters[f'{prefix}recruiter_profile_id'] = dimensions['recruiter']
+    # Cắt theo ngày/giờ trong DB (múi giờ hiện tại), gộp tuần/tháng ở đây để khớp với build_buckets
+    kind = 'hour' if granularity == 'hour' else 'day'
+    rows = metric.model.objects.filter(**filters).annotate(
+        bucket=Trunc(metric.date_field, kind)).values('bucket').annotate(count=Count('pk')).values_list(
+        'bucket', 'count').order_by()
+    counts = {}
+    for moment, value in rows:
+        moment = timezone.localtime(moment)
+        bucket = moment if granularity == 'hour' else _bucket_of(moment.date(), granularity)
+        counts[bucket] = counts.get(bucket, 0) + value
+    return counts
+
+
+def _uses_rollup(metric, granularity, dimensions):
+    if granularity == 'hour' or set(dimensions) - {'recruiter'}:
+        return False
+    return 'recruiter' not in dimensions or metric.recruiter_rollup is not None
+
+
+def get_time_series(metrics, granularity='day', date_from=None, date_to=None, dimensions=None):
+    """
+    metrics: danh sách tên chỉ số trong METRICS; dimensions: dict lọc (job_type, location, recruiter).
+    Trả về {'granularity', 'from', 'to', 'buckets', 'series': {chỉ số: [giá trị]}, 'sources': {chỉ số: nguồn}}.
+    """
+    dimensions = {key: value for key, value in (dimensions or {}).items() if value}
+    unknown = [name for name in metrics if name not in METRICS]
+    if not metrics or unknown:
+        raise TimeSeriesError(f'Chỉ số không hợp lệ: {", ".join(unknown) or "(trống)"}. '
+                              f'Hỗ trợ: {", ".join(METRICS)}.')
+    if granularity not in GRANULARITIES:
+        raise TimeSeriesError(f'Độ chia không hợp lệ: {granularity}. Hỗ trợ: {", ".join(GRANULARITIES)}.')
+    if 'job_type' in dimensions and dimensions['job_type'] not in JobType.values:
+        raise TimeSeriesError(f'job_type không hợp lệ: {dimensions["job_type"]}.')
+    if 'recruiter' in dimensions:
+        try:
+            dimensions['recruiter'] = uuid.UUID(str(dimensions['recruiter']))
+        except ValueError:
+            raise TimeSeriesError('recruiter phải là mã hồ sơ nhà tuyển dụng (UUID).')
+    date_to = date_to or timezone.localdate()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_SPAN_DAYS[granularity] - 1)
+    if date_from > date_to:
+        raise TimeSeriesError('from phải trước hoặc bằng to.')
+
+    buckets = build_buckets(granularity, date_from, date_to)
+    series, sources = {}, {}
+    for name in dict.fromkeys(metrics):
+        metric = METRICS[name]
+        if _uses_rollup(metric, granularity, dimensions):
+            counts, sources[name] = _rollup_counts(metric, granularity, date_from, date_to, dimensions), 'rollup'
+        else:
+            counts, sources[name] = _raw_counts(metric, granularity, date_from, date_to, dimensions), 'raw'
+        series[name] = [counts.get(bucket, 0) for bucket in buckets]
+    return {
+        'granularity': granularity,
+        'from': date_from,
+        'to': date_to,
+        'buckets': buckets,
+        'series': series,
+        'sources': sources,
+    }
+
+
+def time_series_from_params(params):
+    """Đọc tham số query (metric=a,b&granularity=&from=&to=&job_type=&location=&recruiter=)."""
+    dates = {}
+    for key in ('from', 'to'):
+        value = params.get(key)
+        try:
+            dates[key] = parse_date(value) if value else None
+        except ValueError:
+            dates[key] = None
+        if value and dates[key] is None:
+            raise TimeSeriesError(f'{key} phải có dạng YYYY-MM-DD.')
+    metrics = [name.strip() for name in (params.get('metric') or 'jobs').split(',') if name.strip()]
+    return get_time_series(
+        metrics,
+        params.get('granularity', 'day'),
+        dates['from'],
+        dates['to'],
+        {key: params.get(key) for key in DIMENSIONS},
+    )
@@ -4,16 +4,21 @@ from .views import (
     RecruiterJobPerformanceView,
     RecruiterApplicantStatusView,
     RecruiterActivityLogView,
+    RecruiterFunnelView,
     JobSeekerResumeViewsView,
     JobSeekerResponseRateView,
     JobSeekerApplicationHistoryView,
     JobSeekerJobSuggestionsView,
     SystemSummaryView,
     SystemTrendsView,
+    SystemTimeSeriesView,
     SystemNotificationsReportView,
     GenerateCustomReportView,
     ExportReportView,
     CustomMetricsView,
+    ReportJobSubmitView,
+    ReportJobDetailView,
+    ReportJobDownloadView,
 )
 
 urlpatterns = [
@@ -22,6 +27,7 @@ urlpatterns = [
     path('recruiter/job-performance/', RecruiterJobPerformanceView.as_view(), name='recruiter-job-performance'),
     path('recruiter/applicant-status/', RecruiterApplicantStatusView.as_view(), name='recruiter-applicant-status'),
     path('recruiter/activity-log/', RecruiterActivityLogView.as_view(), name='recruiter-activity-log'),
+    path('recruiter/funnel/', RecruiterFunnelView.as_view(), name='recruiter-funnel'),
 
     # Người tìm việc
     path('jobseeker/resume-views/', JobSeekerResumeViewsView.as_view(), name='jobseeker-resume-views'),
@@ -32,10 +38,16 @@ urlpatterns = [
     # Hệ thống/Admin
     path('system/summary/', SystemSummaryView.as_view(), name='system-summary'),
     path('system/trends/', SystemTrendsView.as_view(), name='system-trends'),
+    path('system/timeseries/', SystemTimeSeriesView.as_view(), name='system-timeseries'),
     path('system/notifications/', SystemNotificationsReportView.as_view(), name='system-notifications'),
 
     # Kỹ thuật / hỗ trợ
     path('generate/', GenerateCustomReportView.as_view(), name='generate-custom-report'),
     path('export/', ExportReportView.as_view(), name='export-report'),
     path('metrics/', CustomMetricsView.as_view(), name='custom-metrics'),
+
+    # Báo cáo chạy nền
+    path('report-jobs/', ReportJobSubmitView.as_view(), name='report-job-submit'),
+    path('report-jobs/<uuid:pk>/', ReportJobDetailView.as_view(), name='report-job-detail'),
+    path('report-jobs/<uuid:pk>/download/', ReportJobDownloadView.as_view(), name='report-job-download'),
 ]
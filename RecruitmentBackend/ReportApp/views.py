@@ -1,3 +1,5 @@
+import uuid
+
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -14,10 +16,10 @@ from .services import (
     get_system_trends,
     get_system_notifications_report,
     generate_custom_report,
-    export_report_to_file,
     get_custom_metrics,
+    ReportParamsError,
 )
-from .permissions import IsRecruiter, IsJobSeeker, IsAdminUser
+from .permissions import IsRecruiter, IsJobSeeker, IsAdminUser, report_params
 from .serializers import (
     RecruiterJobBasicStatSerializer,
     RecruiterJobPerformanceSerializer,
@@ -32,8 +34,18 @@ from .serializers import (
     SystemNotificationReportSerializer,
     CustomReportSerializer,
     CustomMetricsSerializer,
+    ReportJobSerializer,
 )
-from django.http import HttpResponse
+from .exports import EXPORT_FORMATS, build_source, validate_source_params
+from .artifacts import artifact_store
+from .jobs import JSON_FORMAT, artifact_info, submit_report_job, validate_report_request
+from .models import ReportJob, ReportJobStatus
+from .timeseries import TimeSeriesError, time_series_from_params
+from .funnel import get_recruiter_funnel
+from django.utils.dateparse import parse_date
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
 
 class RecruiterStatsView(APIView):
@@ -63,6 +75,32 @@ class RecruiterApplicantStatusView(APIView):
         return Response(serializer.data)
 
 
+class RecruiterFunnelView(APIView):
+    """Phễu tuyển dụng, thời gian từng giai đoạn và cohort theo tuần: ?from=&to=&job_id="""
+    permission_classes = [IsAuthenticated, IsRecruiter]
+
+    def get(self, request):
+        dates = {}
+        for key in ('from', 'to'):
+            value = request.query_params.get(key)
+            try:
+                dates[key] = parse_date(value) if value else None
+            except ValueError:
+                dates[key] = None
+            if value and dates[key] is None:
+                return Response({'error': f'{key} phải có dạng YYYY-MM-DD.'}, status=400)
+        if dates['from'] and dates['to'] and dates['from'] > dates['to']:
+            return Response({'error': 'from phải trước hoặc bằng to.'}, status=400)
+        job_id = request.query_params.get('job_id')
+        if job_id:
+            try:
+                job_id = uuid.UUID(job_id)
+            except ValueError:
+                return Response({'error': 'job_id không hợp lệ.'}, status=400)
+        data = get_recruiter_funnel(request.user, dates['from'], dates['to'], job_id)
+        return Response(data)
+
+
 class RecruiterActivityLogView(APIView):
     permission_classes = [IsAuthenticated, IsRecruiter]
 
@@ -128,6 +166,18 @@ class SystemTrendsView(APIView):
         return Response(serializer.data)
 
 
+class SystemTimeSeriesView(APIView):
+    """Chuỗi thời gian dạng cột: ?metric=applications,hired&granularity=day&from=&to=&job_type=&location=&recruiter="""
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        try:
+            data = time_series_from_params(request.query_params)
+        except TimeSeriesError as exc:
+            return Response({'error': str(exc)}, status=400)
+        return Response(data)
+
+
 class SystemNotificationsReportView(APIView):
     permission_classes = [IsAuthenticated, IsAdminUser]
 
@@ -142,6 +192,12 @@ class GenerateCustomReportView(APIView):
 
     def post(self, request):
         params = request.data
+        try:
+            params = report_params(request, params.get('report_type'), params)
+        except ReportParamsError as exc:
+            return Response({'error': str(exc)}, status=400)
+        if params is None:
+            return Response({'error': 'Bạn không có quyền xem báo cáo này.'}, status=403)
         data = generate_custom_report(params)
         serializer = CustomReportSerializer({'data': data})
         return Response(serializer.data)
@@ -150,6 +206,10 @@ class GenerateCustomReportView(APIView):
 class ExportReportView(APIView):
     permission_classes = [IsAuthenticated, IsAdminUser]
 
+    def perform_content_negotiation(self, request, force=False):
+        # ?format= là định dạng file xuất, không phải renderer của DRF
+        return super().perform_content_negotiation(request, force=True)
+
     def get(self, request):
         report_type = request.query_params.get('type')
         file_format = request.query_params.get('format', 'excel').lower()
@@ -157,29 +217,18 @@ class ExportReportView(APIView):
         if not report_type:
             return Response({'error': 'Missing "type" query parameter.'}, status=400)
 
-        # Lấy dữ liệu báo cáo theo loại
-        data = generate_custom_report({'report_type': report_type, **request.query_params})
-
-        # Xuất file ra bytes
-        file_bytes = export_report_to_file(data, file_format=file_format)
-        if not file_bytes:
+        write_response = EXPORT_FORMATS.get(file_format)
+        if write_response is None:
             return Response({'error': f'Unsupported file format: {file_format}'}, status=400)
 
-        # Thiết lập content type theo định dạng file
-        if file_format == 'excel':
-            content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            file_ext = 'xlsx'
-        elif file_format == 'pdf':
-            content_type = 'application/pdf'
-            file_ext = 'pdf'
-        else:
-            return Response({'error': f'Unsupported file format: {file_format}'}, status=400)
+        # Báo cáo lớn đọc dữ liệu theo lô, các báo cáo khác lấy qua generate_custom_report
+        try:
+            source = build_source(report_type, request.query_params.dict())
+        except ReportParamsError as exc:
+            return Response({'error': str(exc)}, status=400)
 
-        # Trả file về client dưới dạng attachment
-        response = HttpResponse(file_bytes, content_type=content_type)
-        response['Content-Disposition'] = f'attachment; filename=report.{file_ext}'
-
-        return response
+        # Trả file về client dưới dạng attachment, ghi theo luồng
+        return write_response(source, f'report-{report_type}')
 
 
 class CustomMetricsView(APIView):
@@ -189,3 +238,58 @@ class CustomMetricsView(APIView):
         data = get_custom_metrics()
         serializer = CustomMetricsSerializer(data)
         return Response(serializer.data)
+
+
+class ReportJobSubmitView(APIView):
+    """Gửi yêu cầu báo cáo chạy nền, trả về job để hỏi trạng thái."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        report_type = request.data.get('report_type')
+        file_format = str(request.data.get('format', JSON_FORMAT)).lower()
+        params = request.data.get('params') or {}
+        if not isinstance(params, dict):
+            return Response({'error': 'params phải là object.'}, status=400)
+        error = validate_report_request(report_type, file_format)
+        if error:
+            return Response({'error': error}, status=400)
+        # Cùng quyền với GenerateCustomReportView; xuất file giữ nguyên quyền như ExportReportView
+        try:
+            params = report_params(request, report_type, params)
+        except ReportParamsError as exc:
+            return Response({'error': str(exc)}, status=400)
+        if params is None:
+            return Response({'error': 'Bạn không có quyền xem báo cáo này.'}, status=403)
+        if file_format != JSON_FORMAT and not IsAdminUser().has_permission(request, self):
+            return Response({'error': 'Chỉ quản trị viên được xuất báo cáo ra file.'}, status=403)
+        try:
+            validate_source_params(report_type, params)
+        except ReportParamsError as exc:
+            return Response({'error': str(exc)}, status=400)
+
+        job, created = submit_report_job(request.user, report_type, file_format, params)
+        serializer = ReportJobSerializer(job, context={'request': request})
+        return Response(serializer.data, status=202 if created else 200)
+
+
+class ReportJobDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        job = get_object_or_404(ReportJob, pk=pk, requested_by_id=request.user.pk)
+        serializer = ReportJobSerializer(job, context={'request': request})
+        return Response(serializer.data)
+
+
+class ReportJobDownloadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        job = get_object_or_404(ReportJob, pk=pk, requested_by_id=request.user.pk)
+        if job.status != ReportJobStatus.DONE:
+            return Response({'error': 'Báo cáo chưa sẵn sàng.', 'status': job.status}, status=409)
+        if job.expires_at <= timezone.now() or not artifact_store.exists(job.artifact_name):
+            return Response({'error': 'Báo cáo đã hết hạn, vui lòng tạo lại.'}, status=410)
+        content_type, filename = artifact_info(job)
+        return FileResponse(artifact_store.open_read(job.artifact_name), as_attachment=True,
+                            filename=filename, content_type=content_type)
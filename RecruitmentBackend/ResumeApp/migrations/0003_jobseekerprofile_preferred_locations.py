@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ResumeApp', '0002_rename_file_resume_file_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='preferred_locations',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
@@ -3,7 +3,9 @@ from django.db import models
 from django.conf import settings
 from cloudinary.models import CloudinaryField
 
-class BaseModel(models.Model):
+from RecruitmentBackend.tracking import TrackedFieldsMixin
+
+class BaseModel(TrackedFieldsMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -29,14 +31,22 @@ class JobSeekerProfile(BaseModel):
     experience = models.TextField(blank=True, null=True)
     education = models.TextField(blank=True, null=True)
     skills = models.ManyToManyField(Skill, blank=True, related_name='job_seekers')
+    # Các địa điểm muốn làm việc, phân cách bằng dấu phẩy (để trống = mọi địa điểm)
+    preferred_locations = models.CharField(max_length=255, blank=True, null=True)
     phone_number = models.CharField(max_length=15, blank=True, null=True)
     date_of_birth = models.DateField(blank=True, null=True)
     GENDER_CHOICES = [('M', 'Nam'), ('F', 'Nữ'), ('O', 'Khác')]
     gender = models.CharField(max_length=1, choices=GENDER_CHOICES, blank=True, null=True)
 
+    # Dùng khi tính điểm phù hợp với tin tuyển dụng (ApplicationApp/matching.py)
+    tracked_fields = ('summary', 'experience')
+
     def __str__(self):
         return f"Hồ sơ người tìm việc: {self.user.username}"
 
+    def get_preferred_locations(self):
+        return [loc.strip() for loc in (self.preferred_locations or '').split(',') if loc.strip()]
+
     class Meta:
         verbose_name = "Hồ sơ người tìm việc"
         verbose_name_plural = "Các hồ sơ người tìm việc"
@@ -49,6 +59,8 @@ class Resume(BaseModel):
     is_active = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    tracked_fields = ('is_active', 'title')
+
     def __str__(self):
         return f"{self.title or 'CV'} của {self.job_seeker.user.username}"
 
@@ -1,4 +1,5 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
+from AuthApp.roles import active_role_name
 
 class IsAuthenticated(BasePermission):
     """
@@ -15,8 +16,7 @@ class IsAdminUser(BasePermission):
         return (
             request.user
             and request.user.is_authenticated
-            and request.user.active_role
-            and request.user.active_role.name == 'Admin'
+            and active_role_name(request.user) == 'Admin'
         )
 
 class IsJobSeeker(BasePermission):
@@ -27,8 +27,7 @@ class IsJobSeeker(BasePermission):
         return (
             request.user
             and request.user.is_authenticated
-            and request.user.active_role
-            and request.user.active_role.name == 'JobSeeker'
+            and active_role_name(request.user) == 'JobSeeker'
         )
 
 class IsOwnerOrAdmin(BasePermission):
@@ -44,8 +43,8 @@ class IsOwnerOrAdmin(BasePermission):
             return True
 
         # admin được quyền thao tác tất cả
-        if request.user and request.user.is_authenticated and request.user.active_role:
-            if request.user.active_role.name == 'Admin':
+        if request.user and request.user.is_authenticated:
+            if active_role_name(request.user) == 'Admin':
                 return True
 
         # Kiểm tra chủ sở hữu tài nguyên
@@ -73,7 +72,7 @@ class IsJobSeekerAndOwner(BasePermission):
     def has_object_permission(self, request, view, obj):
         if not (request.user and request.user.is_authenticated):
             return False
-        if not request.user.active_role or request.user.active_role.name != 'JobSeeker':
+        if active_role_name(request.user) != 'JobSeeker':
             return False
 
         # Kiểm tra chủ sở hữu
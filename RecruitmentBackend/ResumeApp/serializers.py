@@ -23,7 +23,7 @@ class JobSeekerProfileSerializer(serializers.ModelSerializer):
         model = JobSeekerProfile
         fields = [
             'id', 'user', 'summary', 'experience', 'education',
-            'skills', 'skills_ids', 'phone_number', 'date_of_birth', 'gender'
+            'skills', 'skills_ids', 'preferred_locations', 'phone_number', 'date_of_birth', 'gender'
         ]
         read_only_fields = ['id', 'user']
 
@@ -1,16 +1,23 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.apps import apps
 from NotificationApp.services import create_notification_for_resume_created, create_notification_for_resume_activated
+from .skills import invalidate_skill_phrases
 
 Resume = apps.get_model('ResumeApp', 'Resume')
+Skill = apps.get_model('ResumeApp', 'Skill')
 
 @receiver(post_save, sender=Resume)
 def resume_post_save(sender, instance, created, **kwargs):
     if created:
         # Khi tạo resume mới
         create_notification_for_resume_created(instance)
-    else:
-        # Khi resume được cập nhật, kiểm tra nếu is_active mới là True thì tạo thông báo kích hoạt
-        if instance.is_active:
-            create_notification_for_resume_activated(instance)
+    elif instance.is_active and instance.has_changed('is_active'):
+        # Chỉ thông báo khi CV vừa được kích hoạt, không phải mỗi lần sửa CV đang hoạt động
+        create_notification_for_resume_activated(instance)
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def skill_changed(sender, instance, **kwargs):
+    # Danh sách kỹ năng thay đổi thì bảng so khớp kỹ năng phải dựng lại
+    invalidate_skill_phrases()
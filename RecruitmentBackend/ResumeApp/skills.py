@@ -0,0 +1,49 @@
+"""
+Nhận diện kỹ năng (Skill) xuất hiện trong văn bản tin tuyển dụng.
+"""
+from collections import Counter
+
+from django.core.cache import cache
+
+from JobApp.text import normalize_phrase, phrases, tokenize
+from .models import Skill
+
+SKILL_PHRASES_CACHE_KEY = 'skills:phrases'
+SKILL_PHRASES_TTL = 300
+
+
+def _build_skill_phrases():
+    phrase_map = {}
+    for skill_id, name in Skill.objects.values_list('id', 'name'):
+        key = normalize_phrase(name)
+        if key:
+            phrase_map[key] = skill_id
+    return phrase_map
+
+
+def get_skill_phrases():
+    """Bảng {cụm từ đã chuẩn hóa: skill_id}, cache lại và xóa khi Skill thay đổi."""
+    return cache.get_or_set(SKILL_PHRASES_CACHE_KEY, _build_skill_phrases, SKILL_PHRASES_TTL)
+
+
+def invalidate_skill_phrases():
+    cache.delete(SKILL_PHRASES_CACHE_KEY)
+
+
+def count_skills(text):
+    """Đếm số lần mỗi kỹ năng xuất hiện trong văn bản: Counter {skill_id: số lần}."""
+    phrase_map = get_skill_phrases()
+    if not phrase_map:
+        return Counter()
+    max_length = max(len(key.split(' ')) for key in phrase_map)
+    found = Counter()
+    for phrase in phrases(tokenize(text), max_length):
+        skill_id = phrase_map.get(phrase)
+        if skill_id:
+            found[skill_id] += 1
+    return found
+
+
+def extract_skill_ids(text):
+    """Tập skill_id xuất hiện trong văn bản."""
+    return set(count_skills(text))
@@ -1,3 +1,37 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from AuthApp.models import Role
+from JobApp.tests import create_user
+from NotificationApp.models import Notification
+from .models import JobSeekerProfile, Resume
+
+
+class ResumeActivateTests(TestCase):
+    def setUp(self):
+        self.user = create_user('seeker', Role.JOB_SEEKER)
+        profile = JobSeekerProfile.objects.create(user=self.user)
+        self.resumes = [Resume.objects.create(job_seeker=profile, title=f'CV {i}', file_path=f'resumes/cv{i}.pdf',
+                                              is_active=i == 0)
+                        for i in range(2)]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def activate(self, resume):
+        return self.client.post(f'/resumes/{resume.pk}/activate/')
+
+    def test_activate_writes_only_is_active(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.activate(self.resumes[1]).status_code, 200)
+        updates = [query['sql'] for query in queries if query['sql'].startswith(f'UPDATE "{Resume._meta.db_table}"')]
+        self.assertEqual(len(updates), 2)
+        self.assertNotIn('file_path', updates[1])
+        self.assertEqual(list(Resume.objects.filter(is_active=True)), [self.resumes[1]])
+
+    def test_activate_active_resume_keeps_it_active(self):
+        notifications = Notification.objects.count()
+        self.assertEqual(self.activate(self.resumes[0]).status_code, 200)
+        self.assertEqual(list(Resume.objects.filter(is_active=True)), [self.resumes[0]])
+        self.assertEqual(Notification.objects.count(), notifications)
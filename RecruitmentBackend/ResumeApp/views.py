@@ -6,6 +6,7 @@ from rest_framework.permissions import IsAuthenticated
 from .models import Skill, JobSeekerProfile, Resume
 from .serializers import SkillSerializer, JobSeekerProfileSerializer, ResumeSerializer
 from .permissions import IsAdminUser, IsJobSeekerAndOwner, IsOwnerOrAdmin
+from AuthApp.roles import active_role_name
 
 class SkillViewSet(viewsets.ModelViewSet):
     queryset = Skill.objects.all()
@@ -35,7 +36,7 @@ class JobSeekerProfileViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         # Admin lấy tất cả hồ sơ
-        if user.active_role and user.active_role.name == 'Admin':
+        if active_role_name(user) == 'Admin':
             return JobSeekerProfile.objects.all()
         # Người tìm việc chỉ lấy hồ sơ của chính mình
         return JobSeekerProfile.objects.filter(user=user)
@@ -67,7 +68,7 @@ class ResumeViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         # Admin xem tất cả CV
-        if user.active_role and user.active_role.name == 'Admin':
+        if active_role_name(user) == 'Admin':
             return Resume.objects.all()
         # Người tìm việc chỉ xem CV của chính mình
         return Resume.objects.filter(job_seeker__user=user)
@@ -83,7 +84,8 @@ class ResumeViewSet(viewsets.ModelViewSet):
         # Kiểm tra quyền sở hữu hoặc admin
         self.check_object_permissions(request, resume)
         # Hủy kích hoạt các CV khác cùng job_seeker
-        Resume.objects.filter(job_seeker=resume.job_seeker).update(is_active=False)
+        Resume.objects.filter(job_seeker=resume.job_seeker_id).exclude(pk=resume.pk).update(is_active=False)
         resume.is_active = True
-        resume.save()
+        # Chỉ ghi is_active (không ghi lại file_path, tiêu đề...); CV đã hoạt động thì không ghi gì
+        resume.save_changed()
         return Response({'status': 'resume activated'}, status=status.HTTP_200_OK)